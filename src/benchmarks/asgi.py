@@ -0,0 +1,101 @@
+"""
+Minimal in-process ASGI load driver shared by the benchmarks.
+
+Requests go straight into the ASGI app, so the numbers include routing, dependency injection,
+the anyio threadpool for sync handlers and the database round trips, but no socket overhead.
+"""
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Tuple
+from urllib.parse import urlencode
+
+
+async def call(
+    app,
+    method: str,
+    path: str,
+    params: dict | None = None,
+    json_body: Any = None,
+    headers: Iterable[Tuple[str, str]] = (),
+) -> Tuple[int, bytes]:
+    body = json.dumps(json_body).encode() if json_body is not None else b""
+    raw_headers = [(b"host", b"benchmark"), (b"content-length", str(len(body)).encode())]
+    if json_body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    raw_headers.extend((k.lower().encode(), v.encode()) for k, v in headers)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(params or {}, doseq=True).encode(),
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # the client never disconnects during a benchmark
+        await asyncio.Future()
+
+    status_code = 0
+    chunks: List[bytes] = []
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, b"".join(chunks)
+
+
+@dataclass
+class LoadResult:
+    requests: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed
+
+    @property
+    def p50_ms(self) -> float:
+        return statistics.median(self.latencies) * 1000
+
+    @property
+    def p99_ms(self) -> float:
+        return statistics.quantiles(self.latencies, n=100)[98] * 1000 if len(self.latencies) > 1 else self.p50_ms
+
+
+async def run_load(app, total: int, concurrency: int, method: str, path: str, **kwargs) -> LoadResult:
+    pending = iter(range(total))
+    result = LoadResult(requests=total, elapsed=0.0)
+
+    async def worker():
+        for _ in pending:
+            started = time.perf_counter()
+            status_code, _ = await call(app, method, path, **kwargs)
+            result.latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,84 @@
+"""
+Requests per second of the async REST stack against the previous sync stack.
+
+The sync baseline mounts the same `/display/rooms` query as a plain `def` route on a blocking session,
+which is how every route used to run: one anyio worker thread per in-flight request.
+Both stacks must see the same database, so use MySQL or a SQLite file rather than `sqlite://`.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.async_rest --concurrency 1 16 64
+"""
+import argparse
+import asyncio
+from typing import List
+
+from fastapi import Depends, FastAPI
+
+from benchmarks.asgi import run_load
+from display.domain.entity.room import Room
+from display.presentation.rest.request import GetRoomRequest
+from display.presentation.rest.response import RoomResponse, RoomSchema
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.connection import get_db_session, get_engine
+from shared_kernel.infra.database.orm import metadata, room_table
+from shared_kernel.infra.fastapi.main import app as async_app
+
+ROOM_NUMBER_PREFIX = "BENCH-"
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/display/rooms")
+def get_rooms(request: GetRoomRequest = Depends()) -> RoomResponse:
+    with get_db_session() as session:
+        rooms: List[Room] = list(session.query(Room).filter_by(status=request.status))
+    return RoomResponse(detail="ok", result=[RoomSchema.from_orm(room) for room in rooms])
+
+
+def seed_rooms(count: int) -> None:
+    engine = get_engine()
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+        conn.execute(
+            room_table.insert(),
+            [
+                {
+                    "number": f"{ROOM_NUMBER_PREFIX}{i}",
+                    "status": RoomStatus.AVAILABLE.value,
+                    "image_url": f"https://img.example.com/{i}.png",
+                }
+                for i in range(count)
+            ],
+        )
+
+
+def clean_up() -> None:
+    with get_engine().begin() as conn:
+        conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+
+
+async def main(args: argparse.Namespace) -> None:
+    params = {"status": RoomStatus.AVAILABLE.value}
+    print(f"{'stack':<6} {'concurrency':>11} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        for name, app in (("sync", sync_app), ("async", async_app)):
+            await run_load(app, min(args.requests, 50), concurrency, "GET", "/display/rooms", params=params)  # warm-up
+            result = await run_load(app, args.requests, concurrency, "GET", "/display/rooms", params=params)
+            print(
+                f"{name:<6} {concurrency:>11} {result.rps:>10.1f} "
+                f"{result.p50_ms:>9.2f} {result.p99_ms:>9.2f} {result.errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    args = parser.parse_args()
+
+    seed_rooms(args.rooms)
+    try:
+        asyncio.run(main(args))
+    finally:
+        clean_up()
@@ -0,0 +1,171 @@
+"""
+Latency of the "rooms available between two dates" search over a large reservation history.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.availability --reservations 1000000
+
+Seeds `--rooms` rooms with `--reservations` back-to-back stays spread across them (once; reruns reuse the data),
+then times over the same random windows:
+  sql         the anti-join in `RoomRDBRepository.get_available_rooms`
+  index       free room ids from the in-memory `AvailabilityIndex`
+  index+rows  the display use case path: index ids, then the room rows by primary key
+and compares each p99 with the budget.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from display.infra.availability import AvailabilityIndex
+from display.infra.repository import RoomRDBRepository
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.connection import create_db_engine, dispose_engines, get_async_session_factory
+from shared_kernel.infra.database.orm import init_orm_mappers, metadata, reservation_table, room_table
+from shared_kernel.infra.fastapi.config import settings
+
+ROOM_NUMBER_PREFIX = "AVAIL-"
+FIRST_DAY = datetime(2000, 1, 1)
+CHUNK_SIZE = 50_000
+
+
+def today(per_room: int) -> datetime:
+    # a stay averages 3.5 days including the gap, so most of each room's history lies in the past
+    return FIRST_DAY + timedelta(days=per_room * 3)
+
+
+def seed(rooms: int, reservations: int) -> None:
+    engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        seeded = conn.execute(
+            select(func.count()).select_from(room_table).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+        ).scalar_one()
+        if seeded == rooms:
+            return
+
+        room_ids = select(room_table.c.id).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+        conn.execute(reservation_table.delete().where(reservation_table.c.room_id.in_(room_ids)))
+        conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+        conn.execute(
+            room_table.insert(),
+            [
+                {"number": f"{ROOM_NUMBER_PREFIX}{i}", "status": RoomStatus.AVAILABLE.value, "image_url": "image_url"}
+                for i in range(rooms)
+            ],
+        )
+        room_ids = conn.execute(room_ids).scalars().all()
+
+    # every room gets a chain of 1-4 night stays with 0-2 night gaps; past stays are complete or cancelled
+    rng = random.Random(0)
+    per_room = reservations // len(room_ids)
+    now = today(per_room)
+    rows = []
+    with engine.begin() as conn:
+        for room_id in room_ids:
+            day = FIRST_DAY
+            for i in range(per_room):
+                day += timedelta(days=rng.randint(0, 2))
+                date_out = day + timedelta(days=rng.randint(1, 4))
+                rows.append(
+                    {
+                        "room_id": room_id,
+                        "number": f"{room_id}:{i}",
+                        "status": (
+                            ReservationStatus.IN_PROGRESS if date_out > now
+                            else ReservationStatus.CANCELLED if rng.random() < 0.1
+                            else ReservationStatus.COMPLETE
+                        ).value,
+                        "date_in": day,
+                        "date_out": date_out,
+                        "guest_mobile": "+82-10-1111-2222",
+                    }
+                )
+                day = date_out
+                if len(rows) == CHUNK_SIZE:
+                    conn.execute(reservation_table.insert(), rows)
+                    rows = []
+        if rows:
+            conn.execute(reservation_table.insert(), rows)
+    engine.dispose()
+
+
+def windows(queries: int, per_room: int) -> list[tuple[datetime, datetime]]:
+    rng = random.Random(1)
+    result = []
+    for _ in range(queries):
+        # upcoming windows, where rooms still have reservations in progress
+        date_in = today(per_room) + timedelta(days=rng.randint(0, 300))
+        result.append((date_in, date_in + timedelta(days=rng.randint(1, 7))))
+    return result
+
+
+async def build_index(per_room: int, nights: int) -> AvailabilityIndex:
+    start = today(per_room)
+    async with get_async_session_factory()() as session:
+        room_ids = await RoomRDBRepository.get_room_ids(session=session)
+        stays = await RoomRDBRepository.get_booked_stays(
+            session=session, date_in=start, date_out=start + timedelta(days=nights)
+        )
+    return AvailabilityIndex.build(start=start.date(), nights=nights, room_ids=room_ids, stays=stays)
+
+
+async def measure(search, queries: list[tuple[datetime, datetime]]) -> list[float]:
+    timings = []
+    for date_in, date_out in queries:
+        async with get_async_session_factory()() as session:
+            started = time.perf_counter()
+            await search(session, date_in, date_out)
+            timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_orm_mappers()
+    started = time.perf_counter()
+    seed(rooms=args.rooms, reservations=args.reservations)
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    per_room = args.reservations // args.rooms
+    try:
+        started = time.perf_counter()
+        index = await build_index(per_room=per_room, nights=365)
+        print(f"index of {len(index.room_ids)} rooms x {index.nights} nights built in {time.perf_counter() - started:.2f}s")
+
+        async def search_sql(session, date_in, date_out):
+            return await RoomRDBRepository.get_available_rooms(session=session, date_in=date_in, date_out=date_out)
+
+        async def search_index(session, date_in, date_out):
+            return index.free_room_ids(date_in=date_in, date_out=date_out)
+
+        async def search_index_rows(session, date_in, date_out):
+            return await RoomRDBRepository.get_rooms_by_ids(
+                session=session, room_ids=index.free_room_ids(date_in=date_in, date_out=date_out)
+            )
+
+        queries = windows(queries=args.queries, per_room=per_room)
+        results = {}
+        for name, search in (("sql", search_sql), ("index", search_index), ("index+rows", search_index_rows)):
+            await measure(search, queries[:3])  # warm up caches and the pool
+            results[name] = await measure(search, queries)
+    finally:
+        await dispose_engines()
+
+    print(f"{'path':<11} {'rooms':>6} {'reservations':>12} {'queries':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, timings in results.items():
+        p50 = statistics.median(timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        verdict = "ok" if p99 <= args.budget_ms else "EXCEEDED"
+        print(f"{name:<11} {args.rooms:>6} {args.reservations:>12} {args.queries:>7} {p50:>8.2f} {p99:>8.2f}  {verdict}")
+    print(f"budget: p99 <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--reservations", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    asyncio.run(main(parser.parse_args()))
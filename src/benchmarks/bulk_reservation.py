@@ -0,0 +1,100 @@
+"""
+N single `POST /reception/reservations` calls against one `POST /reception/reservations/batch`.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.bulk_reservation --reservations 1000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from benchmarks.asgi import call
+from reception.domain.value_object.reservation import ReservationNumber
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.connection import get_async_engine
+from shared_kernel.infra.database.orm import metadata, reservation_table, room_table
+from shared_kernel.infra.fastapi.main import app
+
+ROOM_NUMBER_PREFIX = "BULK-"
+BATCH_LIMIT = 1000
+
+
+def reservation_body(room_number: str) -> dict:
+    return {
+        "room_number": room_number,
+        "date_in": "2023-04-01T00:00:00",
+        "date_out": "2023-04-02T00:00:00",
+        "guest_mobile": "+82-10-1111-2222",
+        "guest_name": "Guido",
+    }
+
+
+async def clean_up() -> None:
+    async with get_async_engine().begin() as conn:
+        room_ids = select(room_table.c.id).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+        await conn.execute(reservation_table.delete().where(reservation_table.c.room_id.in_(room_ids)))
+        await conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+
+
+async def seed_rooms(room_numbers: list[str]) -> None:
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(metadata.create_all)
+    await clean_up()
+    async with get_async_engine().begin() as conn:
+        await conn.execute(
+            room_table.insert(),
+            [
+                {"number": number, "status": RoomStatus.AVAILABLE.value, "image_url": "image_url"}
+                for number in room_numbers
+            ],
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    ReservationNumber.configure(worker_id=0)  # the app's startup, which leases one, does not run here
+    single_rooms = [f"{ROOM_NUMBER_PREFIX}S{i}" for i in range(args.reservations)]
+    batch_rooms = [f"{ROOM_NUMBER_PREFIX}B{i}" for i in range(args.reservations)]
+    await seed_rooms(single_rooms + batch_rooms)
+
+    errors = 0
+    try:
+        pending = iter(single_rooms)
+
+        async def post_one_by_one():
+            nonlocal errors
+            for room_number in pending:
+                status_code, _ = await call(
+                    app, "POST", "/reception/reservations", json_body=reservation_body(room_number)
+                )
+                errors += status_code != 201
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post_one_by_one() for _ in range(args.concurrency)))
+        single_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for offset in range(0, len(batch_rooms), BATCH_LIMIT):
+            chunk = batch_rooms[offset:offset + BATCH_LIMIT]
+            status_code, _ = await call(
+                app,
+                "POST",
+                "/reception/reservations/batch",
+                json_body={"reservations": [reservation_body(room_number) for room_number in chunk]},
+            )
+            errors += status_code != 200
+        batch_elapsed = time.perf_counter() - started
+    finally:
+        await clean_up()
+
+    print(f"{'mode':<8} {'reservations':>12} {'seconds':>9} {'res/s':>10}")
+    print(f"{'single':<8} {args.reservations:>12} {single_elapsed:>9.3f} {args.reservations / single_elapsed:>10.1f}")
+    print(f"{'batch':<8} {args.reservations:>12} {batch_elapsed:>9.3f} {args.reservations / batch_elapsed:>10.1f}")
+    print(f"speed-up: {single_elapsed / batch_elapsed:.1f}x, errors: {errors}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reservations", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,138 @@
+"""
+Rows per second when `room_reservation` rows are loaded as Reservation entities through the ORM.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.hydration --reservations 100000
+
+Seeds `--reservations` reservations over `--rooms` rooms (once; reruns reuse the data), then loads them all
+`--repeat` times:
+  core  the same columns as plain rows, the floor set by the driver
+  orm   Reservation entities with their joined rooms and value object composites
+and times the composite factories the mapper calls for every row on their own.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import timeit
+
+from sqlalchemy import func, select
+
+from reception.domain.entity.reservation import Reservation
+from reception.domain.value_object.guest import Guest
+from reception.domain.value_object.reservation import ReservationNumber
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.connection import create_db_engine, dispose_engines, get_async_session_factory
+from shared_kernel.infra.database.orm import (
+    init_orm_mappers,
+    metadata,
+    reservation_table,
+    restore_value_object,
+    room_table,
+)
+from shared_kernel.infra.fastapi.config import settings
+
+ROOM_NUMBER_PREFIX = "HYDRATE-"
+CHUNK_SIZE = 50_000
+
+
+def seed(rooms: int, reservations: int) -> None:
+    engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+    metadata.create_all(engine)
+    room_ids = select(room_table.c.id).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+    with engine.begin() as conn:
+        seeded = conn.execute(
+            select(func.count()).select_from(reservation_table).where(reservation_table.c.room_id.in_(room_ids))
+        ).scalar_one()
+        if seeded == reservations:
+            return
+
+        conn.execute(reservation_table.delete().where(reservation_table.c.room_id.in_(room_ids)))
+        conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+        conn.execute(
+            room_table.insert(),
+            [
+                {"number": f"{ROOM_NUMBER_PREFIX}{i}", "status": RoomStatus.AVAILABLE.value, "image_url": "image_url"}
+                for i in range(rooms)
+            ],
+        )
+        ids = conn.execute(room_ids).scalars().all()
+        statuses = list(ReservationStatus)
+        for offset in range(0, reservations, CHUNK_SIZE):
+            conn.execute(
+                reservation_table.insert(),
+                [
+                    {
+                        "room_id": ids[i % len(ids)],
+                        "number": ReservationNumber.generate().value,
+                        "status": statuses[i % len(statuses)].value,
+                        "guest_mobile": "+82-10-1111-2222",
+                        "guest_name": "Guido",
+                    }
+                    for i in range(offset, min(offset + CHUNK_SIZE, reservations))
+                ],
+            )
+    engine.dispose()
+
+
+async def load(stage: str) -> int:
+    room_ids = select(room_table.c.id).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+    async with get_async_session_factory()() as session:
+        if stage == "core":
+            statement = select(reservation_table, room_table).join_from(
+                reservation_table, room_table, reservation_table.c.room_id == room_table.c.id
+            )
+            result = await session.execute(statement.where(reservation_table.c.room_id.in_(room_ids)))
+            return len(result.all())
+        result = await session.execute(select(Reservation).where(Reservation.room_id.in_(room_ids)))
+        return len(result.scalars().all())
+
+
+def factory_timings() -> dict[str, float]:
+    restore_number, restore_guest = restore_value_object(ReservationNumber), restore_value_object(Guest)
+    factories = {
+        "RoomStatus.from_value": lambda: RoomStatus.from_value("OCCUPIED"),
+        "ReservationStatus.from_value": lambda: ReservationStatus.from_value("COMPLETE"),
+        "ReservationNumber.__init__": lambda: ReservationNumber("0ABCDEFGHJKMN"),
+        "restore ReservationNumber": lambda: restore_number("0ABCDEFGHJKMN"),
+        "Guest.__init__": lambda: Guest("+82-10-1111-2222", "Guido"),
+        "restore Guest": lambda: restore_guest("+82-10-1111-2222", "Guido"),
+    }
+    number = 200_000
+    return {
+        name: min(timeit.repeat(factory, number=number, repeat=3)) / number * 1e9 for name, factory in factories.items()
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_orm_mappers()
+    ReservationNumber.configure(worker_id=0)
+    seed(rooms=args.rooms, reservations=args.reservations)
+
+    results = {}
+    try:
+        for stage in ("core", "orm"):
+            await load(stage)  # warm up caches and the pool
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rows = await load(stage)
+                timings.append(time.perf_counter() - started)
+            results[stage] = rows, statistics.median(timings)
+    finally:
+        await dispose_engines()
+
+    print(f"{'stage':<6} {'rows':>8} {'p50 s':>8} {'rows/s':>10}")
+    for stage, (rows, seconds) in results.items():
+        print(f"{stage:<6} {rows:>8} {seconds:>8.2f} {rows / seconds:>10.0f}")
+    print()
+    print(f"{'factory':<30} {'ns/call':>8}")
+    for name, nanoseconds in factory_timings().items():
+        print(f"{name:<30} {nanoseconds:>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--reservations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
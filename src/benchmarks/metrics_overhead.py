@@ -0,0 +1,119 @@
+"""
+What the request and query metrics cost, per request and per statement.
+
+    $ python -m benchmarks.metrics_overhead --repeat 20000
+
+No server and no database file:
+  request  a minimal ASGI app called directly, bare and behind MetricsMiddleware (route resolved from the
+           scope the way the router leaves it)
+  query    `SELECT 1` on an open in-memory SQLite connection: bare, with no-op cursor listeners (the
+           dispatch SQLAlchemy adds for any listener), and with instrument_engine's listeners, inside and
+           outside a labels_db_queries operation
+and the difference is the overhead an instrumented request or statement pays.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import create_engine, event, text
+from starlette.routing import Route, Router
+
+from shared_kernel.infra.database.connection import instrument_engine
+from shared_kernel.infra.fastapi.middleware import MetricsMiddleware
+from shared_kernel.infra.metrics import labels_db_queries
+
+
+async def endpoint(request):  # pragma: no cover - only its identity is used
+    raise NotImplementedError
+
+
+ROUTER = Router(routes=[Route("/reception/reservations/{reservation_number}", endpoint)])
+
+
+async def app(scope, receive, send) -> None:
+    # what the router leaves in the scope, then a response
+    scope["router"] = ROUTER
+    scope["endpoint"] = endpoint
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message) -> None:
+    pass
+
+
+def scope() -> dict:
+    return {"type": "http", "method": "GET", "path": "/reception/reservations/0ABCDEFGHJKMN", "headers": []}
+
+
+async def measure_async(call: Callable[[], Awaitable[None]], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+async def request_timings(repeat: int) -> dict[str, List[float]]:
+    instrumented = MetricsMiddleware(app)
+    return {
+        "bare": await measure_async(lambda: app(scope(), receive, send), repeat),
+        "metrics": await measure_async(lambda: instrumented(scope(), receive, send), repeat),
+    }
+
+
+async def query_timings(repeat: int) -> dict[str, List[float]]:
+    bare, noop, instrumented = create_engine("sqlite://"), create_engine("sqlite://"), create_engine("sqlite://")
+    # listeners that do nothing: what SQLAlchemy's event dispatch costs on its own
+    event.listen(noop, "before_cursor_execute", lambda *args: None)
+    event.listen(noop, "after_cursor_execute", lambda *args: None)
+    instrument_engine(instrumented, slow_query_threshold=0.5)
+    statement = text("SELECT 1")
+    connections = {engine: engine.connect() for engine in (bare, noop, instrumented)}
+
+    def run(engine):
+        async def call():
+            connections[engine].execute(statement)
+
+        return call
+
+    try:
+        return {
+            "bare": await measure_async(run(bare), repeat),
+            "no-op listeners": await measure_async(run(noop), repeat),
+            "metrics": await measure_async(run(instrumented), repeat),
+            "metrics, labelled": await measure_async(
+                labels_db_queries("Benchmark.select_one")(run(instrumented)), repeat
+            ),
+        }
+    finally:
+        for engine, conn in connections.items():
+            conn.close()
+            engine.dispose()
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {
+        "request": await request_timings(repeat=args.repeat),
+        "query": await query_timings(repeat=args.repeat),
+    }
+    print(f"{'case':<8} {'path':<18} {'p50 us':>8} {'p99 us':>8} {'overhead us':>12}")
+    for case, timings_by_path in results.items():
+        baseline = statistics.median(timings_by_path["bare"])
+        for path, timings in timings_by_path.items():
+            timings.sort()
+            p50, p99 = statistics.median(timings), timings[int(len(timings) * 0.99)]
+            print(f"{case:<8} {path:<18} {p50:>8.2f} {p99:>8.2f} {p50 - baseline:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20_000)
+    asyncio.run(main(parser.parse_args()))
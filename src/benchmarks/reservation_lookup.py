@@ -0,0 +1,112 @@
+"""
+Latency of `get_reservation_by_reservation_number` as `room_reservation` grows.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.reservation_lookup --sizes 10000,100000,1000000
+
+Grows the table to each of `--sizes` reservations in turn (reruns reuse the data), timing lookups of random
+existing numbers after each step. With the unique index on `number` p99 should stay flat: the check fails
+when the largest size is more than `--max-growth` times slower than the smallest.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.repository import ReservationRDBRepository
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.connection import create_db_engine, dispose_engines, get_async_session_factory
+from shared_kernel.infra.database.orm import init_orm_mappers, metadata, reservation_table, room_table
+from shared_kernel.infra.fastapi.config import settings
+
+ROOM_NUMBER = "LOOKUP-1"
+CHUNK_SIZE = 50_000
+
+
+def grow(size: int) -> list[str]:
+    """
+    Inserts reservations until the benchmark room has `size` of them; returns all of their numbers.
+    """
+    engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        room_id = conn.execute(select(room_table.c.id).filter_by(number=ROOM_NUMBER)).scalar()
+        if room_id is None:
+            room_id = conn.execute(
+                room_table.insert().values(number=ROOM_NUMBER, status=RoomStatus.AVAILABLE.value, image_url="image_url")
+            ).inserted_primary_key[0]
+        seeded = conn.execute(select(func.count()).select_from(reservation_table).filter_by(room_id=room_id)).scalar()
+
+    started = time.perf_counter()
+    missing = max(size - seeded, 0)
+    with engine.begin() as conn:
+        for offset in range(0, missing, CHUNK_SIZE):
+            conn.execute(
+                reservation_table.insert(),
+                [
+                    {
+                        "room_id": room_id,
+                        "number": ReservationNumber.generate().value,
+                        "status": ReservationStatus.COMPLETE.value,
+                        "guest_mobile": "+82-10-1111-2222",
+                    }
+                    for _ in range(min(CHUNK_SIZE, missing - offset))
+                ],
+            )
+        numbers = conn.execute(select(reservation_table.c.number).filter_by(room_id=room_id)).scalars().all()
+    if missing:
+        print(f"inserted {missing} reservations in {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+    return numbers
+
+
+async def measure(numbers: list[str], queries: int) -> list[float]:
+    rng = random.Random(0)
+    timings = []
+    for number in rng.sample(numbers, min(queries, len(numbers))):
+        async with get_async_session_factory()() as session:
+            started = time.perf_counter()
+            reservation = await ReservationRDBRepository.get_reservation_by_reservation_number(
+                session=session, reservation_number=ReservationNumber.from_value(value=number)
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+            assert reservation is not None
+    return sorted(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_orm_mappers()
+    ReservationNumber.configure(worker_id=0)
+    started = time.perf_counter()
+    for _ in range(100_000):
+        ReservationNumber.generate()
+    print(f"generated 100000 reservation numbers in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    results = {}
+    try:
+        for size in sorted(int(size) for size in args.sizes.split(",")):
+            numbers = grow(size)
+            await measure(numbers, queries=10)  # warm up caches and the pool
+            results[size] = await measure(numbers, queries=args.queries)
+    finally:
+        await dispose_engines()
+
+    print(f"{'reservations':>12} {'queries':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    p99s = []
+    for size, timings in results.items():
+        p99s.append(timings[min(len(timings) - 1, int(len(timings) * 0.99))])
+        print(f"{size:>12} {len(timings):>7} {statistics.median(timings):>8.2f} {p99s[-1]:>8.2f}")
+    growth = p99s[-1] / p99s[0]
+    verdict = "ok" if growth <= args.max_growth else "EXCEEDED"
+    print(f"p99 growth: {growth:.1f}x (max {args.max_growth:.1f}x)  {verdict}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+`GET /display/rooms` work per request with mapped Room entities against the Core column projection.
+
+    $ SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.room_listing --rooms 10000
+
+Seeds `--rooms` available rooms (reruns reuse them), then times each path `--repeat` times:
+  fetch   the repository call alone
+  schema  fetch, then RoomSchema.from_orm for every room, as the route does
+  json    schema, then the response serialized to JSON
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from display.domain.entity.room import Room
+from display.infra.repository import RoomRDBRepository
+from display.presentation.rest.response import RoomResponse, RoomSchema
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.connection import create_db_engine, dispose_engines, get_async_session_factory
+from shared_kernel.infra.database.orm import init_orm_mappers, metadata, room_table
+from shared_kernel.infra.fastapi.config import settings
+
+ROOM_NUMBER_PREFIX = "LIST-"
+
+
+def seed(rooms: int) -> None:
+    engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        seeded = conn.execute(
+            select(func.count()).select_from(room_table).where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX))
+        ).scalar_one()
+        if seeded != rooms:
+            conn.execute(room_table.delete().where(room_table.c.number.startswith(ROOM_NUMBER_PREFIX)))
+            conn.execute(
+                room_table.insert(),
+                [
+                    {
+                        "number": f"{ROOM_NUMBER_PREFIX}{i}",
+                        "status": RoomStatus.AVAILABLE.value,
+                        "image_url": f"https://img.example.com/{i}.png",
+                        "description": "Double room with a garden view",
+                    }
+                    for i in range(rooms)
+                ],
+            )
+    engine.dispose()
+
+
+async def fetch_entities(session: AsyncSession) -> List[Room]:
+    # the listing as it was before the projection
+    result = await session.execute(select(Room).filter_by(status=RoomStatus.AVAILABLE))
+    return result.scalars().all()
+
+
+async def fetch_rows(session: AsyncSession):
+    return await RoomRDBRepository.get_rooms_by_status(session=session, room_status=RoomStatus.AVAILABLE)
+
+
+async def measure(fetch, stage: str, repeat: int) -> tuple[int, List[float]]:
+    timings = []
+    for _ in range(repeat):
+        async with get_async_session_factory()() as session:
+            started = time.perf_counter()
+            rooms = await fetch(session)
+            if stage != "fetch":
+                response = RoomResponse(detail="ok", result=[RoomSchema.from_orm(room) for room in rooms])
+                if stage == "json":
+                    response.json()
+            timings.append((time.perf_counter() - started) * 1000)
+    return len(rooms), sorted(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_orm_mappers()
+    seed(rooms=args.rooms)
+
+    results = {}
+    try:
+        for name, fetch in (("entity", fetch_entities), ("projection", fetch_rows)):
+            for stage in ("fetch", "schema", "json"):
+                await measure(fetch, stage, repeat=1)  # warm up caches and the pool
+                results[name, stage] = await measure(fetch, stage, repeat=args.repeat)
+    finally:
+        await dispose_engines()
+
+    print(f"{'path':<11} {'stage':<7} {'rooms':>6} {'p50 ms':>8} {'min ms':>8}")
+    for (name, stage), (rooms, timings) in results.items():
+        print(f"{name:<11} {stage:<7} {rooms:>6} {statistics.median(timings):>8.1f} {timings[0]:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Cost of turning a query result into response bytes, per response.
+
+    $ python -m benchmarks.serialization --repeat 200
+
+No database: the same reservation snapshot and room rows are rendered `--repeat` times by
+  validated  schemas built with validation, then jsonable_encoder and the standard json module,
+             as routes did when they returned the model
+  fast       schemas built with construct(), then ModelResponse (orjson), as routes do now
+and the two bodies are checked to be byte for byte the same.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from display.infra.repository import RoomRow
+from display.presentation.rest.response import RoomPageResponse, RoomSchema
+from reception.domain.value_object.guest import Guest
+from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.cache import ReservationSnapshot, RoomSnapshot
+from reception.presentation.rest.response import ReservationResponse, ReservationSchema
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.presentation.response import ModelResponse
+
+ReservationNumber.configure(worker_id=0)
+
+RESERVATION = ReservationSnapshot(
+    room=RoomSnapshot(number="ROOM-A", room_status=RoomStatus.AVAILABLE),
+    reservation_number=ReservationNumber.generate(),
+    reservation_status=ReservationStatus.IN_PROGRESS,
+    date_in=datetime(2023, 4, 1, 15),
+    date_out=datetime(2023, 4, 3, 11),
+    guest=Guest(mobile="+82-10-1111-2222", name="Guido"),
+    version=(1, 1),
+)
+
+
+def room_rows(count: int) -> List[RoomRow]:
+    return [
+        RoomRow(
+            id=i,
+            number=f"ROOM-{i}",
+            status=RoomStatus.AVAILABLE.value,
+            image_url=f"https://img.example.com/{i}.png",
+            description="Double room with a garden view",
+        )
+        for i in range(count)
+    ]
+
+
+def validated(response: BaseModel) -> bytes:
+    # validating the built model's dict costs what building it with validation did
+    model = type(response)(**response.dict())
+    return JSONResponse(content=jsonable_encoder(model)).body
+
+
+def fast(response: BaseModel) -> bytes:
+    return ModelResponse(response).body
+
+
+def measure(build: Callable[[], BaseModel], render: Callable[[BaseModel], bytes], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(build())
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return sorted(timings)
+
+
+def main(args: argparse.Namespace) -> None:
+    cases = {
+        "reservation": lambda: ReservationResponse.construct(
+            detail="ok", result=ReservationSchema.build(reservation=RESERVATION)
+        ),
+    }
+    for count in (100, 1000):
+        rows = room_rows(count)
+        cases[f"rooms x{count}"] = lambda rows=rows: RoomPageResponse.construct(
+            detail="ok", result=[RoomSchema.from_row(row) for row in rows], next_cursor=None
+        )
+
+    print(f"{'response':<12} {'path':<10} {'p50 us':>10} {'min us':>10} {'speedup':>8}")
+    for name, build in cases.items():
+        if validated(build()) != fast(build()):
+            raise AssertionError(f"{name}: the fast path renders a different body")
+        results = {
+            path: measure(build, render, repeat=args.repeat)
+            for path, render in (("validated", validated), ("fast", fast))
+        }
+        for path, timings in results.items():
+            speedup = statistics.median(results["validated"]) / statistics.median(timings)
+            print(f"{name:<12} {path:<10} {statistics.median(timings):>10.1f} {timings[0]:>10.1f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
@@ -1,20 +1,90 @@
-from typing import Callable, ContextManager, List
+from datetime import date, datetime
+from typing import AsyncContextManager, AsyncIterator, Callable, List, NamedTuple, Tuple
 
-from sqlalchemy.orm import Query, Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from display.domain.entity.room import Room
-from display.infra.repository import RoomRDBRepository
+from display.infra.availability import AvailabilityEngine, AvailabilityIndex
+from display.infra.cache import RoomListingCache
+from display.infra.repository import RoomRDBRepository, RoomRow
 from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.query_budget import query_budget
+
+
+class RoomPage(NamedTuple):
+    rooms: List[RoomRow]
+    next_cursor: int | None
 
 
 class DisplayQueryUseCase:
-    def __init__(self, room_repo: RoomRDBRepository, db_session: Callable[[], ContextManager[Session]]):
+    def __init__(
+        self,
+        room_repo: RoomRDBRepository,
+        db_session: Callable[[], AsyncContextManager[AsyncSession]],
+        availability_engine: AvailabilityEngine | None = None,
+        room_listing_cache: RoomListingCache | None = None,
+    ):
         self.room_repo = room_repo
         self.db_session = db_session
+        self.availability_engine = availability_engine
+        self.room_listing_cache = room_listing_cache
 
-    def get_rooms(self, room_status: RoomStatus) -> List[Room]:
-        with self.db_session() as session:
-            rooms: List[Room] = list(
-                self.room_repo.get_rooms_by_status(session=session, room_status=room_status)
+    @query_budget(1)
+    async def get_rooms(self, room_status: RoomStatus, limit: int, cursor: int | None = None) -> RoomPage:
+        cache: RoomListingCache | None = self.room_listing_cache
+        if cache is not None and cache.enabled:
+            if (page := cache.page(room_status=room_status, limit=limit, after_id=cursor)) is not None:
+                return RoomPage(*page)
+            generation: int = cache.generation
+
+        async with self.db_session() as session:
+            # one row past the page tells whether there is a next one
+            rooms: List[RoomRow] = await self.room_repo.get_rooms_by_status(
+                session=session, room_status=room_status, limit=limit + 1, after_id=cursor
             )
+        if cache is not None and cache.enabled:
+            cache.store_page(room_status=room_status, rooms=rooms, limit=limit, after_id=cursor, generation=generation)
+        if len(rooms) > limit:
+            return RoomPage(rooms=rooms[:limit], next_cursor=rooms[limit - 1].id)
+        return RoomPage(rooms=rooms, next_cursor=None)
+
+    @query_budget(1)
+    async def stream_rooms(self, room_status: RoomStatus, batch_size: int) -> AsyncIterator[List[RoomRow]]:
+        async with self.db_session() as session:
+            async for rooms in self.room_repo.stream_rooms_by_status(
+                session=session, room_status=room_status, batch_size=batch_size
+            ):
+                yield rooms
+
+    def _get_availability_index(self, date_in: datetime, date_out: datetime) -> AvailabilityIndex | None:
+        if self.availability_engine is None:
+            return None
+        return self.availability_engine.get_index(date_in=date_in, date_out=date_out)
+
+    @query_budget(1)
+    async def get_available_rooms(self, date_in: datetime, date_out: datetime) -> List[RoomRow]:
+        # the in-memory index answers whole-night searches inside its window; SQL answers the rest exactly
+        index: AvailabilityIndex | None = self._get_availability_index(date_in=date_in, date_out=date_out)
+        async with self.db_session() as session:
+            if index is not None:
+                rooms: List[RoomRow] = await self.room_repo.get_rooms_by_ids(
+                    session=session, room_ids=index.free_room_ids(date_in=date_in, date_out=date_out)
+                )
+            else:
+                rooms = await self.room_repo.get_available_rooms(session=session, date_in=date_in, date_out=date_out)
         return rooms
+
+    @query_budget(2)  # none with the availability index, room ids and stays without it
+    async def get_available_room_counts(self, date_in: datetime, date_out: datetime) -> List[Tuple[date, int]]:
+        index: AvailabilityIndex | None = self._get_availability_index(date_in=date_in, date_out=date_out)
+        if index is None:
+            # a throwaway index over just the requested nights
+            async with self.db_session() as session:
+                room_ids: List[int] = await self.room_repo.get_room_ids(session=session)
+                stays = await self.room_repo.get_booked_stays(session=session, date_in=date_in, date_out=date_out)
+            index = AvailabilityIndex.build(
+                start=date_in.date(),
+                nights=max((date_out.date() - date_in.date()).days, 1),
+                room_ids=room_ids,
+                stays=stays,
+            )
+        return index.free_room_counts(date_in=date_in, date_out=date_out)
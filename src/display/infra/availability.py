@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import AsyncContextManager, Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from display.infra.repository import RoomRDBRepository
+from shared_kernel.infra.signal import ReservationChange
+
+logger = logging.getLogger(__name__)
+
+# (reservation_number, room_id, date_in, date_out)
+Stay = Tuple[str, int, datetime, datetime]
+
+
+class AvailabilityIndex:
+    """
+    Rooms × nights matrix of booked and checked-in stays, starting at `start`. A cell counts the stays covering
+    that night, so a room is free while its cells are 0 and releasing one of two stays sharing a night stays exact.
+
+    Nights are calendar dates, and a stay covers every night it takes part of: from the night of `date_in`
+    up to, not including, `date_out`, plus the night of `date_out` when it has a time of day.
+    """
+
+    def __init__(self, start: date, nights: int, room_ids: Sequence[int]):
+        self.start = start
+        self.nights = nights
+        self.room_ids = np.asarray(sorted(room_ids), dtype=np.int64)
+        self._rows: Dict[int, int] = {room_id: row for row, room_id in enumerate(self.room_ids.tolist())}
+        self._stays: Dict[str, Tuple[int, int, int]] = {}
+        self.booked = np.zeros((len(self.room_ids), nights), dtype=np.int16)
+
+    @classmethod
+    def build(cls, start: date, nights: int, room_ids: Sequence[int], stays: Iterable[Stay]) -> AvailabilityIndex:
+        index = cls(start=start, nights=nights, room_ids=room_ids)
+        rows, firsts, lasts = [], [], []
+        for reservation_number, room_id, date_in, date_out in stays:
+            if (span := index._span(room_id, date_in, date_out)) is None:
+                continue
+            index._stays[reservation_number] = span
+            rows.append(span[0])
+            firsts.append(span[1])
+            lasts.append(span[2])
+
+        # +1 where each stay starts and -1 where it ends, then a running sum along the nights
+        rows, firsts, lasts = (np.asarray(values, dtype=np.intp) for values in (rows, firsts, lasts))
+        delta = np.zeros((len(index.room_ids), nights + 1), dtype=np.int16)
+        np.add.at(delta, (rows, firsts), 1)
+        np.add.at(delta, (rows, lasts), -1)
+        index.booked = np.cumsum(delta[:, :-1], axis=1, dtype=np.int16)
+        return index
+
+    def _nights(self, date_in: datetime, date_out: datetime) -> Tuple[int, int]:
+        first = (date_in.date() - self.start).days
+        last = (date_out.date() - self.start).days + (1 if date_out.time() != time.min else 0)
+        return first, max(last, first + 1)
+
+    def _span(self, room_id: int, date_in: datetime, date_out: datetime) -> Tuple[int, int, int] | None:
+        row = self._rows.get(room_id)
+        first, last = self._nights(date_in, date_out)
+        first, last = max(first, 0), min(last, self.nights)
+        if row is None or first >= last:
+            return None
+        return row, first, last
+
+    def covers(self, date_in: datetime, date_out: datetime) -> bool:
+        """
+        Whether the index answers the search exactly, as the SQL overlap test would: whole nights inside
+        the window. A search with a time of day may fit beside a stay that takes part of a night.
+        """
+        if date_in.time() != time.min or date_out.time() != time.min:
+            return False
+        first, last = self._nights(date_in, date_out)
+        return 0 <= first and last <= self.nights
+
+    def book(self, reservation_number: str, room_id: int, date_in: datetime, date_out: datetime) -> None:
+        if reservation_number in self._stays or (span := self._span(room_id, date_in, date_out)) is None:
+            return
+        self._stays[reservation_number] = span
+        row, first, last = span
+        self.booked[row, first:last] += 1
+
+    def release(self, reservation_number: str) -> None:
+        if (span := self._stays.pop(reservation_number, None)) is None:
+            return
+        row, first, last = span
+        self.booked[row, first:last] -= 1
+
+    def free_room_ids(self, date_in: datetime, date_out: datetime) -> List[int]:
+        first, last = self._nights(date_in, date_out)
+        return self.room_ids[~self.booked[:, first:last].any(axis=1)].tolist()
+
+    def free_room_counts(self, date_in: datetime, date_out: datetime) -> List[Tuple[date, int]]:
+        first, last = self._nights(date_in, date_out)
+        counts = (self.booked[:, first:last] == 0).sum(axis=0)
+        return [(self.start + timedelta(days=first + night), int(count)) for night, count in enumerate(counts)]
+
+
+class AvailabilityEngine:
+    """
+    Owns the process-wide AvailabilityIndex: rebuilt from `room_reservation` on a schedule, and updated
+    in between from reception's `reservation_changed` signal. Changes that arrive while a rebuild is loading
+    are replayed onto the new index; book/release are idempotent per reservation, so a change the snapshot
+    already contains is not counted twice.
+    """
+
+    def __init__(
+        self,
+        room_repo: RoomRDBRepository,
+        db_session: Callable[[], AsyncContextManager[AsyncSession]],
+        nights: int,
+    ):
+        self.room_repo = room_repo
+        self.db_session = db_session
+        self.nights = nights
+        self.index: AvailabilityIndex | None = None
+        self._pending: List[ReservationChange] | None = None
+
+    async def rebuild(self) -> AvailabilityIndex:
+        start = datetime.utcnow().date()
+        end = datetime.combine(start + timedelta(days=self.nights), datetime.min.time())
+        self._pending = []
+        try:
+            async with self.db_session() as session:
+                room_ids: List[int] = await self.room_repo.get_room_ids(session=session)
+                stays: List[Stay] = await self.room_repo.get_booked_stays(
+                    session=session, date_in=datetime.combine(start, datetime.min.time()), date_out=end
+                )
+            index = AvailabilityIndex.build(start=start, nights=self.nights, room_ids=room_ids, stays=stays)
+            for change in self._pending:
+                self._apply(index, change)
+        finally:
+            self._pending = None
+        self.index = index
+        return index
+
+    def apply(self, changes: List[ReservationChange]) -> None:
+        for change in changes:
+            if self._pending is not None:
+                self._pending.append(change)
+            if self.index is not None:
+                self._apply(self.index, change)
+
+    @staticmethod
+    def _apply(index: AvailabilityIndex, change: ReservationChange) -> None:
+        if change.reservation_status.holds_room:
+            index.book(change.reservation_number, change.room_id, change.date_in, change.date_out)
+        else:
+            index.release(change.reservation_number)
+
+    def get_index(self, date_in: datetime, date_out: datetime) -> AvailabilityIndex | None:
+        if self.index is not None and self.index.covers(date_in, date_out):
+            return self.index
+        return None
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Availability index rebuild failed")
+            await asyncio.sleep(interval)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Tuple
+
+from display.infra.repository import RoomRow
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.cache import LRUCache
+from shared_kernel.infra.signal import ReservationChange
+
+
+@dataclass(frozen=True, slots=True)
+class RoomListing:
+    """
+    Rooms with one status in id order: all of them when `complete`, otherwise every one up to the last
+    listed, as far as clients have paged.
+    """
+
+    rooms: Tuple[RoomRow, ...]
+    complete: bool = True
+    ids: Tuple[int, ...] = field(init=False)
+    id_set: FrozenSet[int] = field(init=False)
+
+    def __post_init__(self):
+        ids = tuple(room.id for room in self.rooms)
+        object.__setattr__(self, "ids", ids)
+        object.__setattr__(self, "id_set", frozenset(ids))
+
+    def page(self, limit: int, after_id: int | None = None) -> Tuple[List[RoomRow], int | None] | None:
+        """
+        The same keyset page get_rooms_by_status would read, and the cursor of the next one;
+        None if the listing stops before it can tell.
+        """
+        start = 0 if after_id is None else bisect_right(self.ids, after_id)
+        if not self.complete and start + limit >= len(self.rooms):
+            return None
+        rooms = list(self.rooms[start:start + limit])
+        return rooms, rooms[-1].id if start + limit < len(self.rooms) else None
+
+
+class RoomListingCache(LRUCache[RoomListing]):
+    """
+    One RoomListing per RoomStatus, built from the keyset pages read on misses, so no request reads
+    a whole status. Reception's `reservation_changed` signal drops the listings as soon as
+    a room is seen in a new status; the TTL covers writes made outside this process.
+
+    A load that started before an invalidation is not stored, so it can't bring back the old listing:
+    callers take `generation` before reading and hand it to `store`.
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(max_size=len(RoomStatus), ttl=ttl)
+        self.generation = 0
+
+    def page(
+        self, room_status: RoomStatus, limit: int, after_id: int | None = None
+    ) -> Tuple[List[RoomRow], int | None] | None:
+        listing: RoomListing | None = self.peek(room_status)
+        page = listing.page(limit=limit, after_id=after_id) if listing is not None else None
+        if page is None:
+            self.misses += 1
+        else:
+            self.get(room_status)  # counts the hit and refreshes its recency
+        return page
+
+    def store_page(
+        self, room_status: RoomStatus, rooms: List[RoomRow], limit: int, after_id: int | None, generation: int
+    ) -> None:
+        """
+        Add a keyset page, read with one row past `limit`, to the listing it continues. The listing keeps
+        the expiry of its first page, so paging on does not stretch how stale its rows may get.
+        """
+        if generation != self.generation:
+            return
+        listing: RoomListing | None = self.peek(room_status)
+        if after_id is None:
+            kept, expires_at = (), None
+        elif listing is not None and listing.ids and after_id <= listing.ids[-1]:
+            kept, expires_at = listing.rooms[:bisect_right(listing.ids, after_id)], self.expires_at(room_status)
+        else:
+            return  # a page past the end of the listing would leave a gap in it
+        self.set(room_status, RoomListing(rooms=(*kept, *rooms), complete=len(rooms) <= limit), expires_at)
+
+    def apply(self, changes: List[ReservationChange]) -> None:
+        for change in changes:
+            listing: RoomListing | None = self.peek(change.room_status)
+            if listing is not None and change.room_id in listing.id_set:
+                continue  # most changes (reserve, cancel) leave the room where it is listed already
+            listed_elsewhere = any(
+                (other := self.peek(room_status)) is not None and change.room_id in other.id_set
+                for room_status in RoomStatus
+                if room_status != change.room_status
+            )
+            if listing is not None or listed_elsewhere:
+                self.generation += 1
+                self.clear()
+                return
@@ -1,15 +1,29 @@
 from dependency_injector import containers, providers
 
 from display.application.use_case.query import DisplayQueryUseCase
+from display.infra.availability import AvailabilityEngine
+from display.infra.cache import RoomListingCache
 from display.infra.repository import RoomRDBRepository
-from shared_kernel.infra.database.connection import get_db_session
+from shared_kernel.infra.database.connection import get_async_replica_db_session
+from shared_kernel.infra.fastapi.config import settings
 
 
 class DisplayContainer(containers.DeclarativeContainer):
     room_repo = providers.Factory(RoomRDBRepository)
 
+    availability_engine = providers.Singleton(
+        AvailabilityEngine,
+        room_repo=room_repo,
+        db_session=get_async_replica_db_session,
+        nights=settings.AVAILABILITY_INDEX_NIGHTS,
+    )
+
+    room_listing_cache = providers.Singleton(RoomListingCache, ttl=settings.ROOM_LISTING_CACHE_TTL)
+
     query = providers.Factory(
         DisplayQueryUseCase,
         room_repo=room_repo,
-        db_session=get_db_session,
+        db_session=get_async_replica_db_session,
+        availability_engine=availability_engine,
+        room_listing_cache=room_listing_cache,
     )
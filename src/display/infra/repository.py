@@ -1,11 +1,112 @@
-from sqlalchemy.orm import Query, Session
+from datetime import datetime
+from typing import AsyncIterator, List, NamedTuple, Tuple
 
-from display.domain.entity.room import Room
-from shared_kernel.domain.value_object import RoomStatus
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared_kernel.domain.value_object import HOLDING_STATUSES, RoomStatus
+from shared_kernel.infra.database.orm import reservation_table, room_table
 from shared_kernel.infra.database.repository import RDBReadRepository
 
 
+class RoomRow(NamedTuple):
+    """
+    A room as listed by display, read straight from `hotel_room` columns. Listings never change rooms,
+    so they skip the mapped entity, its composites and the session identity map.
+    """
+
+    id: int
+    number: str
+    status: str
+    image_url: str
+    description: str | None
+
+
+ROOM_COLUMNS = (
+    room_table.c.id,
+    room_table.c.number,
+    room_table.c.status,
+    room_table.c.image_url,
+    room_table.c.description,
+)
+
+
 class RoomRDBRepository(RDBReadRepository):
     @staticmethod
-    def get_rooms_by_status(session: Session, room_status: RoomStatus) -> Query:
-        return session.query(Room).filter_by(status=room_status)
+    async def get_rooms_by_status(
+        session: AsyncSession, room_status: RoomStatus, limit: int | None = None, after_id: int | None = None
+    ) -> List[RoomRow]:
+        """
+        Rooms in id order, starting after `after_id`. Seeking by id through ix_hotel_room_status_id costs
+        the same for every page, where an OFFSET would re-read all the pages before it.
+        """
+        query = select(*ROOM_COLUMNS).where(room_table.c.status == room_status.value)
+        if after_id is not None:
+            query = query.where(room_table.c.id > after_id)
+        result = await session.execute(query.order_by(room_table.c.id).limit(limit))
+        return [RoomRow._make(row) for row in result]
+
+    @staticmethod
+    async def stream_rooms_by_status(
+        session: AsyncSession, room_status: RoomStatus, batch_size: int
+    ) -> AsyncIterator[List[RoomRow]]:
+        """
+        Every room with the status in id order, `batch_size` rows at a time from a server-side cursor,
+        so memory use does not depend on the inventory size.
+        """
+        result = await session.stream(
+            select(*ROOM_COLUMNS)
+            .where(room_table.c.status == room_status.value)
+            .order_by(room_table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield [RoomRow._make(row) for row in rows]
+
+    @staticmethod
+    async def get_available_rooms(session: AsyncSession, date_in: datetime, date_out: datetime) -> List[RoomRow]:
+        """
+        Rooms without a reservation holding them over [date_in, date_out).
+        The anti-join probes ix_room_reservation_room_id_stay once per room.
+        """
+        booked = select(reservation_table.c.id).where(
+            reservation_table.c.room_id == room_table.c.id,
+            reservation_table.c.status.in_([status.value for status in HOLDING_STATUSES]),
+            reservation_table.c.date_in < date_out,
+            reservation_table.c.date_out > date_in,
+        )
+        result = await session.execute(select(*ROOM_COLUMNS).where(~booked.exists()).order_by(room_table.c.id))
+        return [RoomRow._make(row) for row in result]
+
+    @staticmethod
+    async def get_rooms_by_ids(session: AsyncSession, room_ids: List[int]) -> List[RoomRow]:
+        result = await session.execute(
+            select(*ROOM_COLUMNS).where(room_table.c.id.in_(room_ids)).order_by(room_table.c.id)
+        )
+        return [RoomRow._make(row) for row in result]
+
+    @staticmethod
+    async def get_room_ids(session: AsyncSession) -> List[int]:
+        result = await session.execute(select(room_table.c.id))
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_booked_stays(
+        session: AsyncSession, date_in: datetime, date_out: datetime
+    ) -> List[Tuple[str, int, datetime, datetime]]:
+        """
+        (number, room_id, date_in, date_out) of every booked or checked-in stay overlapping [date_in, date_out).
+        """
+        result = await session.execute(
+            select(
+                reservation_table.c.number,
+                reservation_table.c.room_id,
+                reservation_table.c.date_in,
+                reservation_table.c.date_out,
+            ).where(
+                reservation_table.c.status.in_([status.value for status in HOLDING_STATUSES]),
+                reservation_table.c.date_in < date_out,
+                reservation_table.c.date_out > date_in,
+            )
+        )
+        return [tuple(row) for row in result]
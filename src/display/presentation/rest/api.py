@@ -1,25 +1,117 @@
-from typing import List
+from typing import AsyncIterator, List
 
+import orjson
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette import status
+from starlette.responses import StreamingResponse
 
-from display.presentation.rest.request import GetRoomRequest
-from display.presentation.rest.response import RoomSchema, RoomResponse
-from display.application.use_case.query import DisplayQueryUseCase
-from display.domain.entity.room import Room
+from display.presentation.rest.request import GetAvailableRoomRequest, GetRoomPageRequest, GetRoomRequest
+from display.presentation.rest.response import (
+    AvailabilityResponse,
+    AvailabilitySchema,
+    RoomPageResponse,
+    RoomResponse,
+    RoomSchema,
+)
+from display.application.use_case.query import DisplayQueryUseCase, RoomPage
+from display.infra.repository import RoomRow
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.presentation.etag import content_etag, is_not_modified, not_modified
+from shared_kernel.presentation.response import ModelResponse, model_fields
 
 router = APIRouter(prefix="/display")
 
 
-@router.get("/rooms")
+EXPORT_BATCH_SIZE = 1000
+ROOM_LISTING_CACHE_CONTROL = f"public, max-age={settings.ROOM_LISTING_MAX_AGE}"
+
+
+@router.get(
+    "/rooms",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+)
 @inject
-def get_rooms(
+async def get_rooms(
+    request: GetRoomPageRequest = Depends(),
+    if_none_match: str | None = Header(default=None),
+    display_query: DisplayQueryUseCase = Depends(Provide[AppContainer.display.query]),
+) -> RoomPageResponse:
+    """
+    Rooms by their state right now: AVAILABLE or OCCUPIED. A booking does not change a room's status;
+    rooms free for a stay are at /display/rooms/available.
+    """
+    page: RoomPage = await display_query.get_rooms(
+        room_status=request.status, limit=request.limit, cursor=request.cursor
+    )
+    # hashing the rows is much cheaper than serializing them, and gives every worker the same ETag
+    etag: str = content_etag(page.rooms, page.next_cursor)
+    if is_not_modified(if_none_match=if_none_match, etag=etag):
+        return not_modified(etag=etag, cache_control=ROOM_LISTING_CACHE_CONTROL)
+
+    return ModelResponse(
+        RoomPageResponse.construct(
+            detail="ok",
+            result=[RoomSchema.from_row(room) for room in page.rooms],
+            next_cursor=page.next_cursor,
+        ),
+        headers={"ETag": etag, "Cache-Control": ROOM_LISTING_CACHE_CONTROL},
+    )
+
+
+@router.get(
+    "/rooms/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}}},
+)
+@inject
+async def export_rooms(
     request: GetRoomRequest = Depends(),
     display_query: DisplayQueryUseCase = Depends(Provide[AppContainer.display.query]),
+) -> StreamingResponse:
+    """
+    Every room with the status as newline-delimited JSON, one RoomSchema per line, streamed as it is read.
+    """
+    async def lines() -> AsyncIterator[bytes]:
+        async for rooms in display_query.stream_rooms(room_status=request.status, batch_size=EXPORT_BATCH_SIZE):
+            yield b"".join(orjson.dumps(RoomSchema.from_row(room), default=model_fields) + b"\n" for room in rooms)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def check_date_range(request: GetAvailableRoomRequest) -> None:
+    if request.date_out <= request.date_in:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="date_out must be later than date_in.",
+        )
+
+
+@router.get("/rooms/available")
+@inject
+async def get_available_rooms(
+    request: GetAvailableRoomRequest = Depends(),
+    display_query: DisplayQueryUseCase = Depends(Provide[AppContainer.display.query]),
 ) -> RoomResponse:
-    rooms: List[Room] = display_query.get_rooms(room_status=request.status)
-    return RoomResponse(
-        detail="ok",
-        result=[RoomSchema.from_orm(room) for room in rooms]
+    check_date_range(request=request)
+    rooms: List[RoomRow] = await display_query.get_available_rooms(date_in=request.date_in, date_out=request.date_out)
+    return ModelResponse(
+        RoomResponse.construct(detail="ok", result=[RoomSchema.from_row(room) for room in rooms])
+    )
+
+
+@router.get("/availability")
+@inject
+async def get_availability(
+    request: GetAvailableRoomRequest = Depends(),
+    display_query: DisplayQueryUseCase = Depends(Provide[AppContainer.display.query]),
+) -> AvailabilityResponse:
+    check_date_range(request=request)
+    counts = await display_query.get_available_room_counts(date_in=request.date_in, date_out=request.date_out)
+    return ModelResponse(
+        AvailabilityResponse.construct(
+            detail="ok",
+            result=[AvailabilitySchema.construct(date=night, available=available) for night, available in counts],
+        )
     )
@@ -1,7 +1,19 @@
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, conint
 
 from shared_kernel.domain.value_object import RoomStatus
 
 
 class GetRoomRequest(BaseModel):
     status: RoomStatus
+
+
+class GetRoomPageRequest(GetRoomRequest):
+    limit: conint(ge=1, le=1000) = 100
+    cursor: conint(ge=0) | None = None  # `next_cursor` of the previous page
+
+
+class GetAvailableRoomRequest(BaseModel):
+    date_in: datetime
+    date_out: datetime
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
+from datetime import date
 from typing import List
 
 from pydantic import BaseModel
 
+from display.infra.repository import RoomRow
 from shared_kernel.presentation.response import BaseResponse
 from shared_kernel.domain.value_object import RoomStatus
 
@@ -16,6 +20,30 @@ class RoomSchema(BaseModel):
     class Config:
         orm_mode = True
 
+    @classmethod
+    def from_row(cls, row: RoomRow) -> RoomSchema:
+        # rows come from our own table, so from_orm's validation would only repeat the column constraints
+        return cls.construct(
+            id=row.id,
+            number=row.number,
+            status=RoomStatus(row.status),
+            image_url=row.image_url,
+            description=row.description,
+        )
+
 
 class RoomResponse(BaseResponse):
     result: List[RoomSchema]
+
+
+class RoomPageResponse(RoomResponse):
+    next_cursor: int | None = None  # None on the last page
+
+
+class AvailabilitySchema(BaseModel):
+    date: date
+    available: int
+
+
+class AvailabilityResponse(BaseResponse):
+    result: List[AvailabilitySchema]
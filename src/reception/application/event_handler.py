@@ -0,0 +1,23 @@
+import logging
+
+from reception.domain.event.reservation import GuestCheckedIn, GuestCheckedOut, ReservationCancelled, ReservationMade
+from shared_kernel.infra.outbox import OutboxDispatcher, OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_EVENTS = (ReservationMade, ReservationCancelled, GuestCheckedIn, GuestCheckedOut)
+
+
+async def log_reservation_event(message: OutboxMessage) -> None:
+    # not the payload: it carries the guest's details
+    logger.info(
+        "%s %s (outbox event %s)", message.event_type, message.payload["reservation_number"], message.id
+    )
+
+
+def register_handlers(dispatcher: OutboxDispatcher) -> None:
+    """
+    Side effects of reception's domain events; they run in the outbox dispatcher, off the request path.
+    """
+    for event in RESERVATION_EVENTS:
+        dispatcher.register(event.__name__, log_reservation_event)
@@ -1,76 +1,255 @@
-from typing import Callable, ContextManager
+from typing import Callable, Dict, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from reception.presentation.rest.request import CreateReservationRequest, UpdateGuestRequest
-from reception.application.use_case.query import ReservationQueryUseCase
+from reception.presentation.rest.request import (
+    CreateReservationRequest,
+    CreateRoomBlockRequest,
+    UpdateGuestRequest,
+)
 from reception.domain.entity.reservation import Reservation
 from reception.domain.entity.room import Room
+from reception.domain.exception.reservation import ReservationNotFoundException
+from reception.domain.exception.room import (
+    RoomBlockUnavailableException,
+    RoomNotFoundException,
+    RoomStatusException,
+)
 from reception.domain.service.check_in import CheckInService
 from reception.domain.value_object.guest import Guest, mobile_type
+from reception.domain.value_object.reservation import ReservationNumber, StayPeriod
+from reception.infra.cache import ReservationCache
 from reception.infra.repository import ReservationRDBRepository
+from shared_kernel.domain.exception import BaseMsgException
+from shared_kernel.infra.database.query_budget import query_budget
+from shared_kernel.infra.database.uow import RDBUnitOfWork, retry_on_conflict
+from shared_kernel.infra.metrics import reservation_events
+from shared_kernel.infra.signal import ReservationChange, reservation_changed
+
+
+def publish_changes(reservations: List[Reservation]) -> None:
+    """
+    Tell other bounded contexts about committed reservations, without them depending on reception.
+    """
+    reservation_changed.send(
+        changes=[
+            ReservationChange(
+                reservation_number=reservation.reservation_number.value,
+                reservation_status=reservation.reservation_status,
+                room_id=reservation.room.id,
+                room_status=reservation.room.room_status,
+                date_in=reservation.date_in,
+                date_out=reservation.date_out,
+            )
+            for reservation in reservations
+        ]
+    )
 
 
 class ReservationCommandUseCase:
     def __init__(
         self,
         reservation_repo: ReservationRDBRepository,
-        reservation_query: ReservationQueryUseCase,
         check_in_service: CheckInService,
-        db_session: Callable[[], ContextManager[Session]],
+        unit_of_work: Callable[[], RDBUnitOfWork],
+        lock_rows: bool = True,
+        conflict_retries: int = 0,
+        reservation_cache: ReservationCache | None = None,
     ):
         self.reservation_repo = reservation_repo
-        self.reservation_query = reservation_query
         self.check_in_service = check_in_service
-        self.db_session = db_session
-
-    def make_reservation(self, request: CreateReservationRequest) -> Reservation:
-        room: Room = self.reservation_query.get_room(room_number=request.room_number)
-        reservation = Reservation.make(
-            room=room,
-            date_in=request.date_in,
-            date_out=request.date_out,
-            guest=Guest(mobile=request.guest_mobile, name=request.guest_name)
+        self.unit_of_work = unit_of_work
+        # without row locks, concurrent commands are caught by the version columns at commit instead
+        self.lock_rows = lock_rows
+        self.conflict_retries = conflict_retries
+        self.reservation_cache = reservation_cache
+
+    def _committed(self, reservations: List[Reservation], event: str) -> None:
+        if reservations:
+            reservation_events.inc(event, amount=len(reservations))
+        if self.reservation_cache is not None:
+            for reservation in reservations:
+                self.reservation_cache.put(reservation)
+        publish_changes(reservations)
+
+    async def _commit(self, uow: RDBUnitOfWork, reservations: List[Reservation]) -> None:
+        # flush first, so the read model is written with the versions the rows were just given
+        await uow.flush()
+        await self.reservation_repo.update_reservation_views(session=uow.session, reservations=reservations)
+        await uow.commit()
+
+    async def _get_room(self, session: AsyncSession, room_number: str) -> Room:
+        room: Room | None = await self.reservation_repo.get_room_by_room_number(
+            session=session, room_number=room_number, for_update=self.lock_rows
+        )
+        if not room:
+            raise RoomNotFoundException
+        return room
+
+    async def _get_reservation(self, session: AsyncSession, reservation_number: str) -> Reservation:
+        reservation: Reservation | None = await self.reservation_repo.get_reservation_by_reservation_number(
+            session=session,
+            reservation_number=ReservationNumber.from_value(value=reservation_number),
+            for_update=self.lock_rows,
         )
-        with self.db_session() as session:
-            self.reservation_repo.add(session=session, instance=reservation)
-            self.reservation_repo.commit(session=session)
+        if not reservation:
+            raise ReservationNotFoundException
         return reservation
 
-    def update_guest_info(self, reservation_number: str, request: UpdateGuestRequest) -> Reservation:
-        reservation: Reservation = self.reservation_query.get_reservation(reservation_number=reservation_number)
+    @retry_on_conflict
+    @query_budget(7)  # the room, its booked stays, then bulk_add's five writes
+    async def make_reservation(self, request: CreateReservationRequest) -> Reservation:
+        async with self.unit_of_work() as uow:
+            room: Room = await self._get_room(session=uow.session, room_number=request.room_number)
+            booked_stays: Dict[int, List[StayPeriod]] = await self.reservation_repo.get_booked_stays(
+                session=uow.session,
+                room_ids=[room.id],
+                stay=StayPeriod(date_in=request.date_in, date_out=request.date_out),
+            )
+            reservation = Reservation.make(
+                room=room,
+                date_in=request.date_in,
+                date_out=request.date_out,
+                guest=Guest(mobile=request.guest_mobile, name=request.guest_name),
+                booked_stays=booked_stays[room.id],
+            )
+            await self.reservation_repo.bulk_add(session=uow.session, reservations=[reservation])
+            await uow.commit()
+        self._committed([reservation], event="made")
+        return reservation
 
-        guest: Guest = Guest(mobile=request.guest_mobile, name=request.guest_name)
-        reservation.change_guest(guest=guest)
+    @retry_on_conflict
+    @query_budget(7)  # the same as one reservation: every statement covers the whole batch
+    async def make_reservations(
+        self, requests: List[CreateReservationRequest]
+    ) -> List[Reservation | BaseMsgException]:
+        """
+        Make many reservations in one transaction. Each item gets its reservation or the domain error
+        that rejected it, so one bad item does not abort the rest.
+        """
+        results: List[Reservation | BaseMsgException] = []
+        async with self.unit_of_work() as uow:
+            rooms: Dict[str, Room] = await self.reservation_repo.get_rooms_by_room_numbers(
+                session=uow.session,
+                room_numbers=[request.room_number for request in requests],
+                for_update=self.lock_rows,
+            )
+            # one query covering every requested stay; items booked earlier in the batch are added as we go
+            booked_stays: Dict[int, List[StayPeriod]] = await self.reservation_repo.get_booked_stays(
+                session=uow.session,
+                room_ids=[room.id for room in rooms.values()],
+                stay=StayPeriod(
+                    date_in=min(request.date_in for request in requests),
+                    date_out=max(request.date_out for request in requests),
+                ),
+            )
+            for request in requests:
+                if not (room := rooms.get(request.room_number)):
+                    results.append(RoomNotFoundException())
+                    continue
+                try:
+                    reservation = Reservation.make(
+                        room=room,
+                        date_in=request.date_in,
+                        date_out=request.date_out,
+                        guest=Guest(mobile=request.guest_mobile, name=request.guest_name),
+                        booked_stays=booked_stays[room.id],
+                    )
+                except RoomStatusException as e:
+                    results.append(e)
+                    continue
+                booked_stays[room.id].append(reservation.stay)
+                results.append(reservation)
 
-        with self.db_session() as session:
-            self.reservation_repo.add(session=session, instance=reservation)
-            self.reservation_repo.commit(session=session)
-        return reservation
+            reservations: List[Reservation] = [result for result in results if isinstance(result, Reservation)]
+            if reservations:
+                await self.reservation_repo.bulk_add(session=uow.session, reservations=reservations)
+                await uow.commit()
+        self._committed(reservations, event="made")
+        return results
 
-    def check_in(self, reservation_number: str, mobile: mobile_type) -> Reservation:
-        reservation: Reservation = self.reservation_query.get_reservation(reservation_number=reservation_number)
-        self.check_in_service.check_in(reservation=reservation, mobile=mobile)
+    @retry_on_conflict
+    @query_budget(7)  # the rooms, their booked stays, then bulk_add's five writes
+    async def allocate_room_block(self, request: CreateRoomBlockRequest) -> List[Reservation]:
+        """
+        Reserve any `room_count` rooms free for the requested dates for one guest, all or nothing.
+        Rooms are always row-locked here (SKIP LOCKED), whatever `lock_rows` says.
+        On SQLite, which cannot skip locks, the unit of work's write lock serializes allocations instead.
+        """
+        async with self.unit_of_work() as uow:
+            stay = StayPeriod(date_in=request.date_in, date_out=request.date_out)
+            rooms: List[Room] = await self.reservation_repo.get_available_rooms_for_update(
+                session=uow.session, stay=stay, limit=request.room_count
+            )
+            if len(rooms) < request.room_count:
+                raise RoomBlockUnavailableException
 
-        with self.db_session() as session:
-            self.reservation_repo.add(session=session, instance=reservation)
-            self.reservation_repo.commit(session=session)
-        return reservation
+            # a stay committed between the candidates' snapshot and their locks shows up here, and Room.reserve
+            # rejects the room
+            booked_stays: Dict[int, List[StayPeriod]] = await self.reservation_repo.get_booked_stays(
+                session=uow.session, room_ids=[room.id for room in rooms], stay=stay, for_share=True
+            )
+            guest = Guest(mobile=request.guest_mobile, name=request.guest_name)
+            reservations: List[Reservation] = [
+                Reservation.make(
+                    room=room,
+                    date_in=request.date_in,
+                    date_out=request.date_out,
+                    guest=guest,
+                    booked_stays=booked_stays[room.id],
+                )
+                for room in rooms
+            ]
+            await self.reservation_repo.bulk_add(session=uow.session, reservations=reservations)
+            await uow.commit()
+        self._committed(reservations, event="made")
+        return reservations
 
-    def check_out(self, reservation_number: str) -> Reservation:
-        reservation: Reservation = self.reservation_query.get_reservation(reservation_number=reservation_number)
-        reservation.check_out()
+    @retry_on_conflict
+    @query_budget(4)
+    async def update_guest_info(self, reservation_number: str, request: UpdateGuestRequest) -> Reservation:
+        async with self.unit_of_work() as uow:
+            reservation: Reservation = await self._get_reservation(
+                session=uow.session, reservation_number=reservation_number
+            )
+            guest: Guest = Guest(mobile=request.guest_mobile, name=request.guest_name)
+            reservation.change_guest(guest=guest)
+            await self._commit(uow=uow, reservations=[reservation])
+        self._committed([reservation], event="guest_changed")
+        return reservation
 
-        with self.db_session() as session:
-            self.reservation_repo.add(session=session, instance=reservation)
-            self.reservation_repo.commit(session=session)
+    @retry_on_conflict
+    @query_budget(6)
+    async def check_in(self, reservation_number: str, mobile: mobile_type) -> Reservation:
+        async with self.unit_of_work() as uow:
+            reservation: Reservation = await self._get_reservation(
+                session=uow.session, reservation_number=reservation_number
+            )
+            self.check_in_service.check_in(reservation=reservation, mobile=mobile)
+            await self._commit(uow=uow, reservations=[reservation])
+        self._committed([reservation], event="checked_in")
         return reservation
 
-    def cancel(self, reservation_number: str) -> Reservation:
-        reservation: Reservation = self.reservation_query.get_reservation(reservation_number=reservation_number)
-        reservation.cancel()
+    @retry_on_conflict
+    @query_budget(6)
+    async def check_out(self, reservation_number: str) -> Reservation:
+        async with self.unit_of_work() as uow:
+            reservation: Reservation = await self._get_reservation(
+                session=uow.session, reservation_number=reservation_number
+            )
+            reservation.check_out()
+            await self._commit(uow=uow, reservations=[reservation])
+        self._committed([reservation], event="checked_out")
+        return reservation
 
-        with self.db_session() as session:
-            self.reservation_repo.add(session=session, instance=reservation)
-            self.reservation_repo.commit(session=session)
+    @retry_on_conflict
+    @query_budget(5)
+    async def cancel(self, reservation_number: str) -> Reservation:
+        async with self.unit_of_work() as uow:
+            reservation: Reservation = await self._get_reservation(
+                session=uow.session, reservation_number=reservation_number
+            )
+            reservation.cancel()
+            await self._commit(uow=uow, reservations=[reservation])
+        self._committed([reservation], event="cancelled")
         return reservation
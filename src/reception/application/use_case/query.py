@@ -1,43 +1,40 @@
-from typing import Callable, ContextManager
+from typing import AsyncContextManager, Callable
 
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from reception.domain.entity.room import Room
 from reception.domain.exception.reservation import ReservationNotFoundException
-from reception.domain.entity.reservation import Reservation
-from reception.domain.exception.room import RoomNotFoundException
-from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.cache import ReservationCache, ReservationSnapshot
 from reception.infra.repository import ReservationRDBRepository
+from shared_kernel.infra.database.query_budget import query_budget
 
 
 class ReservationQueryUseCase:
     def __init__(
         self,
         reservation_repo: ReservationRDBRepository,
-        db_session: Callable[[], ContextManager[Session]],
+        db_session: Callable[[], AsyncContextManager[AsyncSession]],
+        reservation_cache: ReservationCache | None = None,
     ):
         self.reservation_repo = reservation_repo
         self.db_session = db_session
-
-    def get_room(self, room_number: str) -> Room:
-        with self.db_session() as session:
-            room: Room | None = (
-                self.reservation_repo.get_room_by_room_number(session=session, room_number=room_number)
-            )
-        if not room:
-            raise RoomNotFoundException
-        return room
-
-    def get_reservation(self, reservation_number: str) -> Reservation:
-        reservation_number = ReservationNumber.from_value(value=reservation_number)
-
-        with self.db_session() as session:
-            reservation: Reservation | None = (
-                self.reservation_repo.get_reservation_by_reservation_number(
-                    session=session, reservation_number=reservation_number
-                )
+        self.reservation_cache = reservation_cache
+
+    @query_budget(1)
+    async def get_reservation(self, reservation_number: str) -> ReservationSnapshot:
+        if self.reservation_cache is not None:
+            if snapshot := self.reservation_cache.get(reservation_number):
+                return snapshot
+
+        # one primary key fetch from the read model, instead of the reservation joined with its room through the ORM
+        async with self.db_session() as session:
+            row: Row | None = await self.reservation_repo.get_reservation_view(
+                session=session, reservation_number=reservation_number
             )
 
-        if not reservation:
+        if not row:
             raise ReservationNotFoundException
-        return reservation
+        snapshot = ReservationSnapshot.from_view(row)
+        if self.reservation_cache is not None:
+            return self.reservation_cache.put(snapshot)
+        return snapshot
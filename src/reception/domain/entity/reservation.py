@@ -2,12 +2,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Iterable
 
+from reception.domain.event.reservation import (
+    GuestCheckedIn,
+    GuestCheckedOut,
+    ReservationCancelled,
+    ReservationMade,
+)
 from reception.domain.exception.reservation import ReservationStatusException
 from reception.domain.exception.room import RoomStatusException
 from reception.domain.entity.room import Room
 from reception.domain.value_object.guest import Guest
-from reception.domain.value_object.reservation import ReservationNumber
+from reception.domain.value_object.reservation import ReservationNumber, StayPeriod
 from shared_kernel.domain.entity import AggregateRoot
 from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
 
@@ -23,10 +30,10 @@ class Reservation(AggregateRoot):
 
     @classmethod
     def make(
-        cls, room: Room, date_in: datetime, date_out: datetime, guest: Guest
+        cls, room: Room, date_in: datetime, date_out: datetime, guest: Guest, booked_stays: Iterable[StayPeriod] = ()
     ) -> Reservation:
-        room.reserve()
-        return cls(
+        room.reserve(stay=StayPeriod(date_in=date_in, date_out=date_out), booked_stays=booked_stays)
+        reservation = cls(
             room=room,
             date_in=date_in,
             date_out=date_out,
@@ -34,32 +41,57 @@ class Reservation(AggregateRoot):
             reservation_number=ReservationNumber.generate(),
             reservation_status=ReservationStatus.IN_PROGRESS,
         )
+        reservation.record_event(
+            ReservationMade(
+                reservation_number=reservation.reservation_number.value,
+                room_number=room.number,
+                date_in=date_in,
+                date_out=date_out,
+                guest_mobile=guest.mobile,
+            )
+        )
+        return reservation
+
+    @property
+    def stay(self) -> StayPeriod:
+        return StayPeriod(date_in=self.date_in, date_out=self.date_out)
 
     def cancel(self):
+        # a checked-in guest checks out instead, which frees the room
         if not self.reservation_status.in_progress:
             raise ReservationStatusException
 
         self.reservation_status = ReservationStatus.CANCELLED
-        self.room.room_status = RoomStatus.AVAILABLE
+        self.record_event(
+            ReservationCancelled(reservation_number=self.reservation_number.value, room_number=self.room.number)
+        )
 
     def check_in(self):
-        if not self.room.room_status.is_reserved:
+        if self.room.room_status.is_occupied:
             raise RoomStatusException
 
         if not self.reservation_status.in_progress:
             raise ReservationStatusException
 
+        self.reservation_status = ReservationStatus.CHECKED_IN
         self.room.room_status = RoomStatus.OCCUPIED
+        self.record_event(
+            GuestCheckedIn(reservation_number=self.reservation_number.value, room_number=self.room.number)
+        )
 
     def check_out(self):
         if not self.room.room_status.is_occupied:
             raise RoomStatusException
 
-        if not self.reservation_status.in_progress:
+        # the room's status is shared by all of its reservations; only the one checked in may check out
+        if not self.reservation_status.checked_in:
             raise ReservationStatusException
 
         self.reservation_status = ReservationStatus.COMPLETE
         self.room.room_status = RoomStatus.AVAILABLE
+        self.record_event(
+            GuestCheckedOut(reservation_number=self.reservation_number.value, room_number=self.room.number)
+        )
 
     def change_guest(self, guest: Guest):
         self.guest = guest
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
+from typing import Iterable
 
-from reception.domain.exception.room import RoomStatusException
+from reception.domain.exception.room import RoomNotAvailableException
+from reception.domain.value_object.reservation import StayPeriod
 from shared_kernel.domain.entity import Entity
 from shared_kernel.domain.value_object import RoomStatus
 
@@ -10,8 +12,7 @@ class Room(Entity):
     number: str
     room_status: RoomStatus
 
-    def reserve(self):
-        if not self.room_status.is_available:
-            raise RoomStatusException
-
-        self.room_status = RoomStatus.RESERVED
+    def reserve(self, stay: StayPeriod, booked_stays: Iterable[StayPeriod] = ()):
+        # room_status is the room's state right now; a booking only claims its own dates
+        if any(stay.overlaps(booked_stay) for booked_stay in booked_stays):
+            raise RoomNotAvailableException
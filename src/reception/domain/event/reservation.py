@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from shared_kernel.domain.event import DomainEvent
+
+
+@dataclass(frozen=True, kw_only=True)
+class ReservationMade(DomainEvent):
+    reservation_number: str
+    room_number: str
+    date_in: datetime
+    date_out: datetime
+    guest_mobile: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class ReservationCancelled(DomainEvent):
+    reservation_number: str
+    room_number: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class GuestCheckedIn(DomainEvent):
+    reservation_number: str
+    room_number: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class GuestCheckedOut(DomainEvent):
+    reservation_number: str
+    room_number: str
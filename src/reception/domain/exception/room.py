@@ -7,3 +7,11 @@ class RoomNotFoundException(BaseMsgException):
 
 class RoomStatusException(BaseMsgException):
     message = "Invalid request for current room status."
+
+
+class RoomNotAvailableException(RoomStatusException):
+    message = "The room is already booked for the requested dates."
+
+
+class RoomBlockUnavailableException(BaseMsgException):
+    message = "Not enough rooms are available for the block."
@@ -9,7 +9,7 @@ from shared_kernel.domain.value_object import ValueObject
 mobile_type = constr(regex=r"\+[0-9]{2,3}-[0-9]{2}-[0-9]{4}-[0-9]{4}")
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Guest(ValueObject):
     mobile: mobile_type
     name: str | None = None
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import random
-import string
+import os
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import ClassVar
@@ -9,17 +10,102 @@ from typing import ClassVar
 from shared_kernel.domain.value_object import ValueObject
 
 
-@dataclass(slots=True)
+class SnowflakeGenerator:
+    """
+    64-bit ids: 41 bits of milliseconds since `EPOCH_MS`, 10 bits of worker id and a 12-bit sequence,
+    rendered as 13 Crockford base32 characters so the strings sort in generation order.
+
+    Ids are unique as long as no two live processes share a worker id. When a millisecond's sequence runs
+    out, or the clock steps back, the generator borrows the next millisecond instead of sleeping.
+    """
+
+    EPOCH_MS: ClassVar[int] = 1672531200000  # 2023-01-01T00:00:00Z
+    WORKER_ID_BITS: ClassVar[int] = 10
+    SEQUENCE_BITS: ClassVar[int] = 12
+    MAX_WORKER_ID: ClassVar[int] = (1 << WORKER_ID_BITS) - 1
+    ALPHABET: ClassVar[str] = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+    LENGTH: ClassVar[int] = 13
+
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= self.MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {self.MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        now_ms = time.time_ns() // 1_000_000 - self.EPOCH_MS
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms, self._sequence = now_ms, 0
+            else:
+                self._sequence += 1
+                if self._sequence >> self.SEQUENCE_BITS:
+                    self._last_ms, self._sequence = self._last_ms + 1, 0
+            return (
+                (self._last_ms << (self.WORKER_ID_BITS + self.SEQUENCE_BITS))
+                | (self.worker_id << self.SEQUENCE_BITS)
+                | self._sequence
+            )
+
+    @classmethod
+    def encode(cls, value: int) -> str:
+        chars = []
+        for _ in range(cls.LENGTH):
+            value, digit = divmod(value, 32)
+            chars.append(cls.ALPHABET[digit])
+        return "".join(reversed(chars))
+
+
+@dataclass(frozen=True, slots=True)
 class ReservationNumber(ValueObject):
-    _DATETIME_FORMAT: ClassVar[str] = "%y%m%d%H%M%S"
-    _RANDOM_STR_LENGTH: ClassVar[int] = 7
+    # the generator belongs to the process that configured it: a forked child must configure its own worker id,
+    # so it neither continues its parent's sequence nor shares its parent's worker id
+    _generator: ClassVar[SnowflakeGenerator | None] = None
+    _generator_pid: ClassVar[int | None] = None
+    _valid_until: ClassVar[float | None] = None  # time.monotonic() deadline of a leased worker id
+    _generator_lock: ClassVar[threading.Lock] = threading.Lock()
 
     value: str
 
+    @classmethod
+    def configure(cls, worker_id: int, valid_until: float | None = None) -> None:
+        """
+        Generate with `worker_id` in this process; no other live process may use it. A leased worker id
+        stops generating at `valid_until` (a `time.monotonic()` value) unless the lease is renewed before.
+        Configuring the same worker id again keeps the generator's sequence.
+        """
+        pid = os.getpid()
+        with cls._generator_lock:
+            if cls._generator is None or cls._generator.worker_id != worker_id or cls._generator_pid != pid:
+                cls._generator, cls._generator_pid = SnowflakeGenerator(worker_id=worker_id), pid
+            cls._valid_until = valid_until
+
+    @classmethod
+    def release(cls) -> None:
+        with cls._generator_lock:
+            cls._generator, cls._generator_pid, cls._valid_until = None, None, None
+
+    @classmethod
+    def _get_generator(cls) -> SnowflakeGenerator:
+        generator, valid_until = cls._generator, cls._valid_until
+        if generator is None or cls._generator_pid != os.getpid():
+            raise RuntimeError("No reservation number worker id is configured in this process")
+        if valid_until is not None and time.monotonic() >= valid_until:
+            raise RuntimeError(f"The lease of reservation number worker id {generator.worker_id} has run out")
+        return generator
+
     @classmethod
     def generate(cls) -> ReservationNumber:
-        time_part: str = datetime.utcnow().strftime(cls._DATETIME_FORMAT)
-        random_strings: str = ''.join(
-            random.choice(string.ascii_uppercase + string.digits) for _ in range(cls._RANDOM_STR_LENGTH)
-        )
-        return cls(value=time_part + ":" + random_strings)
+        return cls(value=SnowflakeGenerator.encode(cls._get_generator().next_id()))
+
+
+@dataclass(frozen=True, slots=True)
+class StayPeriod:
+    date_in: datetime
+    date_out: datetime
+
+    def overlaps(self, other: StayPeriod) -> bool:
+        # back-to-back stays share the changeover day without overlapping
+        return self.date_in < other.date_out and other.date_in < self.date_out
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, DefaultDict, Dict, Set, Tuple
+
+from sqlalchemy.engine import Row
+
+from reception.domain.entity.reservation import Reservation
+from reception.domain.value_object.guest import Guest
+from reception.domain.value_object.reservation import ReservationNumber
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.cache import LRUCache
+
+
+@dataclass(frozen=True, slots=True)
+class RoomSnapshot:
+    number: str
+    room_status: RoomStatus
+
+
+@dataclass(frozen=True, slots=True)
+class ReservationSnapshot:
+    """
+    Read-only copy of a Reservation aggregate with the same attributes, detached from any session.
+    `version` is (reservation row version, room row version) as of the read or the commit it was taken from.
+    """
+
+    room: RoomSnapshot
+    reservation_number: ReservationNumber
+    reservation_status: ReservationStatus
+    date_in: datetime
+    date_out: datetime
+    guest: Guest
+    version: Tuple[int, int]
+
+    @classmethod
+    def from_entity(cls, reservation: Reservation) -> ReservationSnapshot:
+        return cls(
+            room=RoomSnapshot(number=reservation.room.number, room_status=reservation.room.room_status),
+            reservation_number=reservation.reservation_number,
+            reservation_status=reservation.reservation_status,
+            date_in=reservation.date_in,
+            date_out=reservation.date_out,
+            guest=reservation.guest,
+            # rows inserted by bulk_add are transient, so the reservation has no version attribute loaded yet
+            version=(reservation.version or 1, reservation.room.version),
+        )
+
+    @classmethod
+    def from_view(cls, row: Row) -> ReservationSnapshot:
+        """
+        From a reservation_view row, so the query side needs neither the join nor the ORM mapping.
+        """
+        return cls(
+            room=RoomSnapshot(number=row.room_number, room_status=RoomStatus(row.room_status)),
+            reservation_number=ReservationNumber.from_value(value=row.number),
+            reservation_status=ReservationStatus(row.status),
+            date_in=row.date_in,
+            date_out=row.date_out,
+            guest=Guest(mobile=row.guest_mobile, name=row.guest_name),
+            version=(row.reservation_version, row.room_version),
+        )
+
+    def with_newer_room(self, other: ReservationSnapshot) -> ReservationSnapshot:
+        if other.version[1] <= self.version[1]:
+            return self
+        return replace(self, room=other.room, version=(self.version[0], other.version[1]))
+
+    def newest(self, other: ReservationSnapshot) -> ReservationSnapshot:
+        """
+        The newer reservation of the two, with the newer room of the two.
+        """
+        if self.version[0] >= other.version[0]:
+            return self.with_newer_room(other)
+        return other.with_newer_room(self)
+
+
+class ReservationCache(LRUCache[ReservationSnapshot]):
+    """
+    Reservations by number. Both the query side (after a read) and the command side (after a commit) put
+    snapshots in; a snapshot never replaces newer data, so a slow replica read can't undo a commit.
+    A room's status is shown on all of its reservations, as in reservation_view, so a snapshot with a newer
+    room brings every cached reservation of that room up to it. Other processes' commits are only seen
+    once the entry expires.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        super().__init__(max_size=max_size, ttl=ttl, clock=clock)
+        self._numbers_by_room: DefaultDict[str, Set[str]] = defaultdict(set)
+
+    def put(self, reservation: Reservation | ReservationSnapshot) -> ReservationSnapshot:
+        snapshot = reservation
+        if not isinstance(snapshot, ReservationSnapshot):
+            snapshot = ReservationSnapshot.from_entity(reservation)
+        if not self.enabled:
+            return snapshot
+        number: str = snapshot.reservation_number.value
+        if (cached := self.peek(number)) is not None:
+            snapshot = snapshot.newest(cached)
+        room_mates: Dict[str, ReservationSnapshot] = {
+            other_number: other
+            for other_number in self._numbers_by_room[snapshot.room.number] - {number}
+            if (other := self.peek(other_number)) is not None
+        }
+        for other in room_mates.values():
+            snapshot = snapshot.with_newer_room(other)
+        self.set(number, snapshot)
+        self._numbers_by_room[snapshot.room.number].add(number)
+
+        for other_number, other in room_mates.items():
+            refreshed = other.with_newer_room(snapshot)
+            if refreshed is not other and self.peek(other_number) is other:
+                # the room is newer, the reservation is not: it keeps its own expiry
+                self.set(other_number, refreshed, expires_at=self.expires_at(other_number))
+        return snapshot
+
+    def _removed(self, key: str, value: ReservationSnapshot) -> None:
+        numbers: Set[str] = self._numbers_by_room[value.room.number]
+        numbers.discard(key)
+        if not numbers:
+            del self._numbers_by_room[value.room.number]
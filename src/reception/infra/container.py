@@ -3,8 +3,16 @@ from dependency_injector import containers, providers
 from reception.application.use_case.command import ReservationCommandUseCase
 from reception.application.use_case.query import ReservationQueryUseCase
 from reception.domain.service.check_in import CheckInService
+from reception.infra.cache import ReservationCache
 from reception.infra.repository import ReservationRDBRepository
-from shared_kernel.infra.database.connection import get_db_session
+from reception.infra.worker_id import WorkerIdLease
+from shared_kernel.infra.database.connection import (
+    get_async_db_session,
+    get_async_replica_db_session,
+    get_async_session_factory,
+)
+from shared_kernel.infra.database.uow import RDBUnitOfWork
+from shared_kernel.infra.fastapi.config import settings
 
 
 class ReceptionContainer(containers.DeclarativeContainer):
@@ -12,15 +20,28 @@ class ReceptionContainer(containers.DeclarativeContainer):
 
     check_in_service = providers.Factory(CheckInService)
 
+    unit_of_work = providers.Factory(RDBUnitOfWork, db_session=get_async_db_session)
+
+    reservation_cache = providers.Singleton(
+        ReservationCache, max_size=settings.RESERVATION_CACHE_SIZE, ttl=settings.RESERVATION_CACHE_TTL
+    )
+
     reservation_query = providers.Factory(
         ReservationQueryUseCase,
         reservation_repo=reservation_repo,
-        db_session=get_db_session,
+        db_session=get_async_replica_db_session,
+        reservation_cache=reservation_cache,
     )
     reservation_command = providers.Factory(
         ReservationCommandUseCase,
         reservation_repo=reservation_repo,
-        reservation_query=reservation_query,
         check_in_service=check_in_service,
-        db_session=get_db_session,
+        unit_of_work=unit_of_work.provider,
+        lock_rows=settings.DB_ROW_LOCKING,
+        conflict_retries=settings.DB_CONFLICT_RETRIES,
+        reservation_cache=reservation_cache,
+    )
+
+    worker_id_lease = providers.Singleton(
+        WorkerIdLease, session_factory=get_async_session_factory, lease=settings.RESERVATION_NUMBER_WORKER_LEASE
     )
@@ -1,14 +1,271 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from reception.domain.entity.reservation import Reservation
 from reception.domain.entity.room import Room
-from reception.domain.value_object.reservation import ReservationNumber
+from reception.domain.value_object.reservation import ReservationNumber, StayPeriod
+from shared_kernel.domain.exception import ConcurrentUpdateException
+from shared_kernel.domain.value_object import HOLDING_STATUSES
+from shared_kernel.infra.database.orm import reservation_table, reservation_view_table, room_table
 from shared_kernel.infra.database.repository import RDBRepository
+from shared_kernel.infra.outbox import save_events
+
+
+def overlaps_stay(stay: StayPeriod) -> ColumnElement:
+    # served by ix_room_reservation_room_id_stay once room_id is fixed
+    return (
+        reservation_table.c.status.in_([status.value for status in HOLDING_STATUSES])
+        & (reservation_table.c.date_in < stay.date_out)
+        & (reservation_table.c.date_out > stay.date_in)
+    )
+
+
+def reservation_view_row(reservation: Reservation) -> Dict[str, Any]:
+    return {
+        "number": reservation.reservation_number.value,
+        "room_number": reservation.room.number,
+        "room_status": reservation.room.room_status.value,
+        "status": reservation.reservation_status.value,
+        "date_in": reservation.date_in,
+        "date_out": reservation.date_out,
+        "guest_mobile": reservation.guest.mobile,
+        "guest_name": reservation.guest.name,
+        # rows inserted by bulk_add are transient, so the reservation has no version attribute loaded yet
+        "reservation_version": reservation.version or 1,
+        "room_version": reservation.room.version,
+    }
 
 
 class ReservationRDBRepository(RDBRepository):
     @staticmethod
-    def get_reservation_by_reservation_number(session, reservation_number: ReservationNumber) -> Reservation | None:
-        return session.query(Reservation).filter_by(reservation_number=reservation_number).first()
+    async def get_reservation_by_reservation_number(
+        session: AsyncSession, reservation_number: ReservationNumber, for_update: bool = False
+    ) -> Reservation | None:
+        query = select(Reservation).filter_by(reservation_number=reservation_number)
+        if for_update:
+            # the joined room row is locked together with the reservation
+            query = query.with_for_update()
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_room_by_room_number(session: AsyncSession, room_number: str, for_update: bool = False) -> Room | None:
+        query = select(Room).filter_by(number=room_number)
+        if for_update:
+            query = query.with_for_update()
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_rooms_by_room_numbers(
+        session: AsyncSession, room_numbers: List[str], for_update: bool = False
+    ) -> Dict[str, Room]:
+        query = select(Room).filter(Room.number.in_(set(room_numbers)))
+        if for_update:
+            query = query.with_for_update()
+        result = await session.execute(query)
+        return {room.number: room for room in result.scalars()}
+
+    @staticmethod
+    async def get_booked_stays(
+        session: AsyncSession, room_ids: Iterable[int], stay: StayPeriod, for_share: bool = False
+    ) -> Dict[int, List[StayPeriod]]:
+        """
+        In-progress stays of the given rooms that overlap `stay`, by room id.
+        `for_share` makes it a locking read, which sees the latest committed rows even where a consistent read
+        would reuse the transaction's snapshot, e.g. one MySQL took before the rooms were locked.
+        """
+        query = select(
+            reservation_table.c.room_id, reservation_table.c.date_in, reservation_table.c.date_out
+        ).where(reservation_table.c.room_id.in_(set(room_ids)), overlaps_stay(stay))
+        if for_share:
+            query = query.with_for_update(read=True)
+        result = await session.execute(query)
+        booked_stays: Dict[int, List[StayPeriod]] = defaultdict(list)
+        for room_id, date_in, date_out in result:
+            booked_stays[room_id].append(StayPeriod(date_in=date_in, date_out=date_out))
+        return booked_stays
 
     @staticmethod
-    def get_room_by_room_number(session, room_number: str) -> Room | None:
-        return session.query(Room).filter_by(number=room_number).first()
+    async def get_available_rooms_for_update(session: AsyncSession, stay: StayPeriod, limit: int) -> List[Room]:
+        """
+        Lock up to `limit` rooms that are free for `stay`, skipping rows other transactions already hold,
+        so parallel callers end up with disjoint rooms instead of queueing on the same ones.
+        The NOT EXISTS only narrows the candidates: it may read a snapshot from before the rooms were locked,
+        so callers check the locked rooms' stays again with get_booked_stays(for_share=True).
+        """
+        booked = select(reservation_table.c.id).where(
+            reservation_table.c.room_id == room_table.c.id, overlaps_stay(stay)
+        )
+        result = await session.execute(
+            select(Room)
+            .where(~booked.exists())
+            .order_by(Room.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def bulk_add(session: AsyncSession, reservations: List[Reservation]) -> None:
+        """
+        Insert new reservations and write their rooms with one executemany each,
+        instead of a flush that emits an INSERT and an UPDATE per reservation.
+        Every room's version is bumped, so two transactions booking the same room can't both commit.
+        The instances are expunged, so they stay as the caller left them apart from the rooms' new versions,
+        and their domain events are saved to the outbox here instead of by the unit of work.
+        """
+        rooms: List[Room] = list({reservation.room.id: reservation.room for reservation in reservations}.values())
+        room_versions: Dict[int, int] = {room.id: room.version for room in rooms}
+        session.expunge_all()
+
+        await session.execute(
+            insert(reservation_table),
+            [
+                {
+                    "room_id": reservation.room.id,
+                    "number": reservation.reservation_number.value,
+                    "status": reservation.reservation_status.value,
+                    "date_in": reservation.date_in,
+                    "date_out": reservation.date_out,
+                    "guest_mobile": reservation.guest.mobile,
+                    "guest_name": reservation.guest.name,
+                    "version": 1,
+                }
+                for reservation in reservations
+            ],
+        )
+        result = await session.execute(
+            update(room_table)
+            .where(room_table.c.id == bindparam("room_id"), room_table.c.version == bindparam("room_version"))
+            .values(status=bindparam("room_status"), version=room_table.c.version + 1),
+            [
+                {"room_id": room.id, "room_version": room_versions[room.id], "room_status": room.room_status.value}
+                for room in rooms
+            ],
+        )
+        if result.rowcount != len(rooms):
+            raise ConcurrentUpdateException
+        for room in rooms:
+            # the rows are detached, so this only tells the caller which version it committed
+            room.version = room_versions[room.id] + 1
+        await session.execute(
+            insert(reservation_view_table),
+            [reservation_view_row(reservation) for reservation in reservations],
+        )
+        await ReservationRDBRepository._update_room_views(
+            session=session,
+            rooms=[
+                {
+                    "view_room_number": room.number,
+                    "view_room_status": room.room_status.value,
+                    "view_room_version": room.version,
+                }
+                for room in rooms
+            ],
+        )
+        await save_events(session=session, aggregates=reservations)
+
+    @staticmethod
+    async def _update_room_views(session: AsyncSession, rooms: List[Dict[str, Any]]) -> None:
+        # a room's status is shown on all of its reservations, so it is rewritten on every row of the room
+        await session.execute(
+            update(reservation_view_table)
+            .where(reservation_view_table.c.room_number == bindparam("view_room_number"))
+            .values(room_status=bindparam("view_room_status"), room_version=bindparam("view_room_version")),
+            rooms,
+        )
+
+    @staticmethod
+    async def update_reservation_views(session: AsyncSession, reservations: List[Reservation]) -> None:
+        """
+        Bring the read model up to date with the flushed changes of existing reservations and their rooms.
+        """
+        await session.execute(
+            update(reservation_view_table)
+            .where(reservation_view_table.c.number == bindparam("view_number"))
+            .values(
+                status=bindparam("view_status"),
+                guest_mobile=bindparam("view_guest_mobile"),
+                guest_name=bindparam("view_guest_name"),
+                reservation_version=bindparam("view_reservation_version"),
+            ),
+            [
+                {
+                    "view_number": reservation.reservation_number.value,
+                    "view_status": reservation.reservation_status.value,
+                    "view_guest_mobile": reservation.guest.mobile,
+                    "view_guest_name": reservation.guest.name,
+                    "view_reservation_version": reservation.version,
+                }
+                for reservation in reservations
+            ],
+        )
+        rooms: Dict[str, Room] = {reservation.room.number: reservation.room for reservation in reservations}
+        await ReservationRDBRepository._update_room_views(
+            session=session,
+            rooms=[
+                {
+                    "view_room_number": room.number,
+                    "view_room_status": room.room_status.value,
+                    "view_room_version": room.version,
+                }
+                for room in rooms.values()
+            ],
+        )
+
+    @staticmethod
+    async def get_reservation_view(session: AsyncSession, reservation_number: str) -> Row | None:
+        result = await session.execute(
+            select(reservation_view_table).where(reservation_view_table.c.number == reservation_number)
+        )
+        return result.first()
+
+    @staticmethod
+    async def rebuild_reservation_views(session: AsyncSession, after_id: int, batch_size: int) -> int | None:
+        """
+        Regenerate the read model rows of the next `batch_size` reservations after id `after_id`
+        from room_reservation and hotel_room. Returns the last id rebuilt, or None past the end.
+        """
+        batch_ids = (
+            select(reservation_table.c.id)
+            .where(reservation_table.c.id > after_id)
+            .order_by(reservation_table.c.id)
+            .limit(batch_size)
+            .subquery()
+        )
+        last_id: int | None = (await session.execute(select(func.max(batch_ids.c.id)))).scalar()
+        if last_id is None:
+            return None
+
+        batch = reservation_table.c.id.between(after_id + 1, last_id)
+        await session.execute(
+            delete(reservation_view_table).where(
+                reservation_view_table.c.number.in_(select(reservation_table.c.number).where(batch))
+            )
+        )
+        await session.execute(
+            insert(reservation_view_table).from_select(
+                [column.name for column in reservation_view_table.c],
+                select(
+                    reservation_table.c.number,
+                    room_table.c.number,
+                    room_table.c.status,
+                    reservation_table.c.status,
+                    reservation_table.c.date_in,
+                    reservation_table.c.date_out,
+                    reservation_table.c.guest_mobile,
+                    reservation_table.c.guest_name,
+                    reservation_table.c.version,
+                    room_table.c.version,
+                )
+                .join_from(reservation_table, room_table, reservation_table.c.room_id == room_table.c.id)
+                .where(batch),
+            )
+        )
+        return last_id
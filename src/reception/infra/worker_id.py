@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+from reception.domain.value_object.reservation import ReservationNumber, SnowflakeGenerator
+from shared_kernel.infra.database.orm import reservation_number_worker_table
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerIdLease:
+    """
+    Leases this process a reservation number worker id from the `reservation_number_worker` table, the lowest
+    one no live process holds, and renews it every third of `lease` seconds.
+
+    The process generates numbers only for half a lease after each renewal, so a process that stops renewing
+    (hung, or cut off from the database) has stopped generating well before another one takes its id over.
+    A renewal that finds the id taken leases a new one.
+    """
+
+    # every transaction here writes, so on SQLite take the write lock at BEGIN like RDBUnitOfWork does
+    EXECUTION_OPTIONS = {"sqlite_begin_immediate": True}
+
+    def __init__(self, session_factory: Callable[[], sessionmaker], lease: float):
+        # a getter, so the engine is only created when the lease is first acquired
+        self.session_factory = session_factory
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self.worker_id: int | None = None
+
+    async def _try_lease(self) -> int | None:
+        """
+        Lease the lowest worker id that is free or whose lease ran out; None when another process leased it
+        between our read and write. Plain reads and single-row writes only: locking reads of missing or
+        expired rows take gap locks on InnoDB, and two processes starting together would deadlock on them.
+        """
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.lease)
+            table = reservation_number_worker_table
+            leases = dict((await session.execute(select(table.c.worker_id, table.c.expires_at))).all())
+            worker_id = next(
+                (i for i in range(SnowflakeGenerator.MAX_WORKER_ID + 1) if i not in leases or leases[i] <= now), None
+            )
+            if worker_id is None:
+                raise RuntimeError("Every reservation number worker id is leased")
+
+            if worker_id in leases:
+                statement = (
+                    update(table)
+                    .where(table.c.worker_id == worker_id, table.c.expires_at <= now)
+                    .values(owner=self.owner, expires_at=expires_at)
+                )
+            else:
+                statement = (
+                    insert(table)
+                    .prefix_with("IGNORE", dialect="mysql")
+                    .prefix_with("OR IGNORE", dialect="sqlite")
+                    .values(worker_id=worker_id, owner=self.owner, expires_at=expires_at)
+                )
+            result = await session.execute(statement)
+            await session.commit()
+        return worker_id if result.rowcount == 1 else None
+
+    async def acquire(self) -> int:
+        while True:
+            started = time.monotonic()
+            if (worker_id := await self._try_lease()) is not None:
+                break
+        self.worker_id = worker_id
+        ReservationNumber.configure(worker_id=worker_id, valid_until=started + self.lease / 2)
+        logger.info("Leased reservation number worker id %s", worker_id)
+        return worker_id
+
+    async def renew(self) -> None:
+        started = time.monotonic()
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            result = await session.execute(
+                update(reservation_number_worker_table)
+                .where(
+                    reservation_number_worker_table.c.worker_id == self.worker_id,
+                    reservation_number_worker_table.c.owner == self.owner,
+                )
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=self.lease))
+            )
+            await session.commit()
+        if result.rowcount == 1:
+            ReservationNumber.configure(worker_id=self.worker_id, valid_until=started + self.lease / 2)
+            return
+
+        logger.error("Reservation number worker id %s was taken over, leasing another", self.worker_id)
+        ReservationNumber.release()
+        await self.acquire()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await self.renew()
+            except Exception:
+                # the lease is retried on the next tick; numbers stop once it runs out
+                logger.exception("Renewing reservation number worker id %s failed", self.worker_id)
+
+    async def release(self) -> None:
+        ReservationNumber.release()
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            await session.execute(
+                delete(reservation_number_worker_table).where(
+                    reservation_number_worker_table.c.worker_id == self.worker_id,
+                    reservation_number_worker_table.c.owner == self.owner,
+                )
+            )
+            await session.commit()
+        self.worker_id = None
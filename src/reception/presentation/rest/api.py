@@ -1,20 +1,40 @@
+from typing import List
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException
 from starlette import status
 
 from reception.application.use_case.command import ReservationCommandUseCase
 from reception.application.use_case.query import ReservationQueryUseCase
+from reception.domain.entity.reservation import Reservation
 from reception.domain.exception.check_in import CheckInAuthenticationException, CheckInDateException
 from reception.domain.exception.reservation import ReservationNotFoundException, ReservationStatusException
-from reception.domain.exception.room import RoomNotFoundException, RoomStatusException
-from reception.domain.entity.reservation import Reservation
-from reception.presentation.rest.request import CheckInRequest, CreateReservationRequest, UpdateGuestRequest
-from reception.presentation.rest.response import ReservationSchema, ReservationResponse
-from shared_kernel.presentation.response import BaseResponse
+from reception.domain.exception.room import RoomBlockUnavailableException, RoomNotFoundException, RoomStatusException
+from reception.infra.cache import ReservationSnapshot
+from reception.presentation.rest.request import (
+    CheckInRequest,
+    CreateReservationRequest,
+    CreateReservationsRequest,
+    CreateRoomBlockRequest,
+    UpdateGuestRequest,
+)
+from reception.presentation.rest.response import (
+    ReservationBatchItemSchema,
+    ReservationBatchResponse,
+    ReservationResponse,
+    ReservationSchema,
+    RoomBlockResponse,
+)
+from shared_kernel.domain.exception import BaseMsgException, ConcurrentUpdateException
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.presentation.etag import is_not_modified, not_modified, version_etag
+from shared_kernel.presentation.response import BaseResponse, ModelResponse
 
 router = APIRouter(prefix="/reception")
 
+# guest details: shared caches must not keep them, and clients revalidate on every use
+RESERVATION_CACHE_CONTROL = "private, no-cache"
+
 
 @router.post(
     "/reservations",
@@ -25,26 +45,103 @@ router = APIRouter(prefix="/reception")
     }
 )
 @inject
-def post_reservations(
+async def post_reservations(
     create_reservation_request: CreateReservationRequest = Body(),
     reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_command.make_reservation(request=create_reservation_request)
+        reservation: Reservation = await reservation_command.make_reservation(request=create_reservation_request)
     except RoomNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    except (RoomStatusException, ReservationStatusException) as e:
+    except (RoomStatusException, ReservationStatusException, ConcurrentUpdateException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        )
+
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation)),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/reservations/batch",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": ReservationBatchResponse},
+        status.HTTP_409_CONFLICT: {"model": BaseResponse},
+    }
+)
+@inject
+async def post_reservations_batch(
+    create_reservations_request: CreateReservationsRequest = Body(),
+    reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
+) -> ReservationBatchResponse:
+    try:
+        results: List[Reservation | BaseMsgException] = await reservation_command.make_reservations(
+            requests=create_reservations_request.reservations
+        )
+    except ConcurrentUpdateException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=e.message,
+        )
+
+    items: List[ReservationBatchItemSchema] = []
+    for result in results:
+        if isinstance(result, Reservation):
+            items.append(
+                ReservationBatchItemSchema.construct(
+                    status_code=status.HTTP_201_CREATED,
+                    detail="ok",
+                    result=ReservationSchema.build(reservation=result),
+                )
+            )
+        elif isinstance(result, RoomNotFoundException):
+            items.append(
+                ReservationBatchItemSchema.construct(status_code=status.HTTP_404_NOT_FOUND, detail=result.message)
+            )
+        else:
+            items.append(
+                ReservationBatchItemSchema.construct(status_code=status.HTTP_409_CONFLICT, detail=result.message)
+            )
+
+    return ModelResponse(ReservationBatchResponse.construct(detail="ok", result=items))
+
+
+@router.post(
+    "/room-blocks",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_201_CREATED: {"model": RoomBlockResponse},
+        status.HTTP_409_CONFLICT: {"model": BaseResponse},
+    }
+)
+@inject
+async def post_room_blocks(
+    create_room_block_request: CreateRoomBlockRequest = Body(),
+    reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
+) -> RoomBlockResponse:
+    try:
+        reservations: List[Reservation] = await reservation_command.allocate_room_block(
+            request=create_room_block_request
+        )
+    except (RoomBlockUnavailableException, RoomStatusException, ConcurrentUpdateException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    return ModelResponse(
+        RoomBlockResponse.construct(
+            detail="ok",
+            result=[ReservationSchema.build(reservation=reservation) for reservation in reservations],
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
@@ -53,25 +150,34 @@ def post_reservations(
     status_code=status.HTTP_200_OK,
     responses={
         status.HTTP_200_OK: {"model": ReservationResponse},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
         status.HTTP_404_NOT_FOUND: {"model": BaseResponse},
     }
 )
 @inject
-def get_reservation(
+async def get_reservation(
     reservation_number: str,
+    if_none_match: str | None = Header(default=None),
     reservation_query: ReservationQueryUseCase = Depends(Provide[AppContainer.reception.reservation_query]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_query.get_reservation(reservation_number=reservation_number)
+        reservation: ReservationSnapshot = await reservation_query.get_reservation(
+            reservation_number=reservation_number
+        )
     except ReservationNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    # every change bumps the reservation's or its room's version, so they identify the representation
+    etag: str = version_etag(reservation.reservation_number.value, *reservation.version)
+    if is_not_modified(if_none_match=if_none_match, etag=etag):
+        return not_modified(etag=etag, cache_control=RESERVATION_CACHE_CONTROL)
+
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation)),
+        headers={"ETag": etag, "Cache-Control": RESERVATION_CACHE_CONTROL},
     )
 
 
@@ -85,13 +191,13 @@ def get_reservation(
     }
 )
 @inject
-def patch_reservation(
+async def patch_reservation(
     reservation_number: str,
     update_quest_request: UpdateGuestRequest = Body(),
     reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_command.update_guest_info(
+        reservation: Reservation = await reservation_command.update_guest_info(
             reservation_number=reservation_number, request=update_quest_request
         )
     except ReservationNotFoundException as e:
@@ -99,15 +205,14 @@ def patch_reservation(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    except (RoomStatusException, ReservationStatusException) as e:
+    except (RoomStatusException, ReservationStatusException, ConcurrentUpdateException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation))
     )
 
 
@@ -122,13 +227,13 @@ def patch_reservation(
     }
 )
 @inject
-def post_reservation_check_in(
+async def post_reservation_check_in(
     reservation_number: str,
     check_in_request: CheckInRequest = Body(),
     reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_command.check_in(
+        reservation: Reservation = await reservation_command.check_in(
             reservation_number=reservation_number, mobile=check_in_request.mobile
         )
     except (CheckInDateException, CheckInAuthenticationException) as e:
@@ -141,15 +246,14 @@ def post_reservation_check_in(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    except (RoomStatusException, ReservationStatusException) as e:
+    except (RoomStatusException, ReservationStatusException, ConcurrentUpdateException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation))
     )
 
 
@@ -163,49 +267,47 @@ def post_reservation_check_in(
     }
 )
 @inject
-def post_reservation_check_out(
+async def post_reservation_check_out(
     reservation_number: str,
     reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_command.check_out(reservation_number=reservation_number)
+        reservation: Reservation = await reservation_command.check_out(reservation_number=reservation_number)
     except ReservationNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    except (RoomStatusException, ReservationStatusException) as e:
+    except (RoomStatusException, ReservationStatusException, ConcurrentUpdateException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation))
     )
 
 
 @router.post("/reservations/{reservation_number}/cancel")
 @inject
-def post_reservation_cancel(
+async def post_reservation_cancel(
     reservation_number: str,
     reservation_command: ReservationCommandUseCase = Depends(Provide[AppContainer.reception.reservation_command]),
 ) -> ReservationResponse:
     try:
-        reservation: Reservation = reservation_command.cancel(reservation_number=reservation_number)
+        reservation: Reservation = await reservation_command.cancel(reservation_number=reservation_number)
     except ReservationNotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    except (RoomStatusException, ReservationStatusException) as e:
+    except (RoomStatusException, ReservationStatusException, ConcurrentUpdateException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.message,
         )
 
-    return ReservationResponse(
-        detail="ok",
-        result=ReservationSchema.build(reservation=reservation),
+    return ModelResponse(
+        ReservationResponse.construct(detail="ok", result=ReservationSchema.build(reservation=reservation))
     )
@@ -1,10 +1,16 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conint, conlist, validator
 
 from reception.domain.value_object.guest import mobile_type
 
 
+def check_date_out(date_out: datetime, values: dict) -> datetime:
+    if "date_in" in values and date_out <= values["date_in"]:
+        raise ValueError("date_out must be later than date_in")
+    return date_out
+
+
 class CreateReservationRequest(BaseModel):
     room_number: str
     date_in: datetime
@@ -12,6 +18,22 @@ class CreateReservationRequest(BaseModel):
     guest_mobile: mobile_type
     guest_name: str | None = None
 
+    _check_date_out = validator("date_out", allow_reuse=True)(check_date_out)
+
+
+class CreateReservationsRequest(BaseModel):
+    reservations: conlist(CreateReservationRequest, min_items=1, max_items=1000)
+
+
+class CreateRoomBlockRequest(BaseModel):
+    room_count: conint(ge=1, le=200)
+    date_in: datetime
+    date_out: datetime
+    guest_mobile: mobile_type
+    guest_name: str | None = None
+
+    _check_date_out = validator("date_out", allow_reuse=True)(check_date_out)
+
 
 class UpdateGuestRequest(BaseModel):
     guest_mobile: mobile_type
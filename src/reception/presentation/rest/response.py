@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import List
 
 from pydantic import BaseModel
 
 from reception.domain.entity.reservation import Reservation
 from reception.domain.entity.room import Room
 from reception.domain.value_object.guest import Guest, mobile_type
-from shared_kernel.presentation.response import BaseResponse
+from reception.infra.cache import ReservationSnapshot, RoomSnapshot
 from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.presentation.response import BaseResponse
+
+
+# the builders below use construct(): entities and snapshots are valid already, so nothing is validated again
 
 
 class RoomSchema(BaseModel):
@@ -16,8 +21,8 @@ class RoomSchema(BaseModel):
     status: RoomStatus
 
     @classmethod
-    def from_entity(cls, room: Room) -> RoomSchema:
-        return cls(
+    def from_entity(cls, room: Room | RoomSnapshot) -> RoomSchema:
+        return cls.construct(
             number=room.number,
             status=room.room_status,
         )
@@ -29,7 +34,7 @@ class GuestSchema(BaseModel):
 
     @classmethod
     def from_entity(cls, guest: Guest) -> GuestSchema:
-        return cls(
+        return cls.construct(
             mobile=guest.mobile,
             name=guest.name,
         )
@@ -44,11 +49,11 @@ class ReservationSchema(BaseModel):
     guest: GuestSchema
 
     @classmethod
-    def build(cls, reservation: Reservation) -> ReservationSchema:
-        return cls(
+    def build(cls, reservation: Reservation | ReservationSnapshot) -> ReservationSchema:
+        return cls.construct(
             room=RoomSchema.from_entity(reservation.room),
             reservation_number=reservation.reservation_number.value,
-            status=reservation.reservation_status.value,
+            status=reservation.reservation_status,
             date_in=reservation.date_in,
             date_out=reservation.date_out,
             guest=GuestSchema.from_entity(reservation.guest),
@@ -57,3 +62,17 @@ class ReservationSchema(BaseModel):
 
 class ReservationResponse(BaseResponse):
     result: ReservationSchema
+
+
+class ReservationBatchItemSchema(BaseModel):
+    status_code: int
+    detail: str
+    result: ReservationSchema | None = None
+
+
+class ReservationBatchResponse(BaseResponse):
+    result: List[ReservationBatchItemSchema]
+
+
+class RoomBlockResponse(BaseResponse):
+    result: List[ReservationSchema]
@@ -1,5 +1,7 @@
 from dataclasses import field
-from typing import Any, TypeVar
+from typing import Any, List, TypeVar
+
+from shared_kernel.domain.event import DomainEvent
 
 EntityType = TypeVar("EntityType", bound="Entity")
 
@@ -19,5 +21,12 @@ class Entity:
 class AggregateRoot(Entity):
     """
     An entry point of aggregate.
+    It records a domain event for each change, until the unit of work saving it pulls them.
     """
-    pass
+
+    def record_event(self, event: DomainEvent) -> None:
+        # instances loaded by the ORM skip __init__, so the list is created on first use
+        self.__dict__.setdefault("_pending_events", []).append(event)
+
+    def pull_events(self) -> List[DomainEvent]:
+        return self.__dict__.pop("_pending_events", [])
@@ -0,0 +1,24 @@
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict
+
+
+@dataclass(frozen=True, kw_only=True)
+class DomainEvent:
+    """
+    Something that happened to an aggregate. Aggregates record events as they change;
+    the events are saved with the aggregate and delivered to handlers after the commit.
+    """
+
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def event_type(self) -> str:
+        return type(self).__name__
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in asdict(self).items()
+            if name != "occurred_at"
+        }
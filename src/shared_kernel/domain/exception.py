@@ -8,3 +8,19 @@ class BaseMsgException(Exception):
 
     def __str__(self):
         return self.message
+
+
+class ConcurrentUpdateException(BaseMsgException):
+    message = "The resource was changed by another request. Please try again."
+
+
+class IdempotencyKeyInProgressException(BaseMsgException):
+    message = "A request with this Idempotency-Key is still being processed. Please try again."
+
+
+class IdempotencyKeyMismatchException(BaseMsgException):
+    message = "This Idempotency-Key was already used for a different request."
+
+
+class ServiceOverloadedException(BaseMsgException):
+    message = "The server is too busy to take this request. Please retry later."
@@ -13,38 +13,48 @@ class ValueObject:
     @classmethod
     def from_value(cls, value: Any) -> ValueObjectType:
         if isinstance(cls, EnumMeta):
-            for item in cls:
-                if item.value == value:
-                    return item
-            raise ValueObjectEnumError
+            # Enum keeps a value -> member map, which beats scanning the members for every loaded row
+            try:
+                return cls._value2member_map_[value]
+            except (KeyError, TypeError):
+                raise ValueObjectEnumError from None
 
         instance = cls(value=value)
         return instance
 
 
 class RoomStatus(ValueObject, str, Enum):
+    # the room's state right now; bookings are the date ranges of reservations that hold the room
     AVAILABLE = "AVAILABLE"
-    RESERVED = "RESERVED"
     OCCUPIED = "OCCUPIED"
 
     @property
     def is_available(self) -> bool:
         return self == RoomStatus.AVAILABLE
 
-    @property
-    def is_reserved(self) -> bool:
-        return self == RoomStatus.RESERVED
-
     @property
     def is_occupied(self) -> bool:
         return self == RoomStatus.OCCUPIED
 
 
 class ReservationStatus(ValueObject, str, Enum):
-    IN_PROGRESS = "IN-PROGRESS"
+    IN_PROGRESS = "IN-PROGRESS"  # booked, the guest has not checked in yet
+    CHECKED_IN = "CHECKED-IN"
     CANCELLED = "CANCELLED"
     COMPLETE = "COMPLETE"
 
     @property
     def in_progress(self) -> bool:
         return self == ReservationStatus.IN_PROGRESS
+
+    @property
+    def checked_in(self) -> bool:
+        return self == ReservationStatus.CHECKED_IN
+
+    @property
+    def holds_room(self) -> bool:
+        # the stay's nights are taken until the reservation is cancelled or checked out
+        return self in HOLDING_STATUSES
+
+
+HOLDING_STATUSES = (ReservationStatus.IN_PROGRESS, ReservationStatus.CHECKED_IN)
@@ -0,0 +1,77 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+from shared_kernel.domain.exception import ServiceOverloadedException
+
+
+class AdmissionLimiter:
+    """
+    Lets at most `max_concurrency` requests run at once (0 lifts the limit). Up to `max_queue` more wait
+    for a slot, first come first served, for at most `queue_timeout` seconds. Anyone beyond that gets
+    ServiceOverloadedException straight away, so a slow database sheds load instead of queueing work for
+    clients that will have given up by the time it runs.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.queued = 0  # admitted after waiting
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_queue_depth = 0
+
+    async def acquire(self) -> None:
+        if self.max_concurrency <= 0 or (self.active < self.max_concurrency and not self._waiters):
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise ServiceOverloadedException
+
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the wait ended; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected_timeout += 1
+                raise ServiceOverloadedException from None
+            raise
+        self.admitted += 1
+        self.queued += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot goes straight to the next in line, so a newcomer can't overtake the queue
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
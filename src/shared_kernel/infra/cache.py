@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class LRUCache(Generic[ValueType]):
+    """
+    Per-process cache of at most `max_size` entries, each served for `ttl` seconds after it was set.
+    The least recently used entry is evicted first. Values should be immutable, as every hit shares them.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, ValueType]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def expires_at(self, key: Hashable) -> float | None:
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def peek(self, key: Hashable) -> ValueType | None:
+        """
+        The live value for `key`, without counting a hit or a miss or refreshing its recency.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return None
+        return entry[1]
+
+    def get(self, key: Hashable) -> ValueType | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            del self._entries[key]
+            self._removed(key, entry[1])
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: ValueType, expires_at: float | None = None) -> None:
+        """
+        `expires_at`, on the cache's clock, keeps the expiry of an entry the value only adds to.
+        """
+        if not self.enabled:
+            return
+        self._entries[key] = (expires_at if expires_at is not None else self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, (_, evicted) = self._entries.popitem(last=False)
+            self._removed(evicted_key, evicted)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._removed(key, entry[1])
+
+    def clear(self) -> None:
+        for key, (_, value) in self._entries.items():
+            self._removed(key, value)
+        self._entries.clear()
+
+    def _removed(self, key: Hashable, value: ValueType) -> None:
+        """
+        Called for every entry that leaves the cache, so subclasses can keep their own indexes in step.
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
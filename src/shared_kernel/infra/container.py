@@ -2,15 +2,43 @@ from dependency_injector import containers, providers
 
 from display.infra.container import DisplayContainer
 from reception.infra.container import ReceptionContainer
+from shared_kernel.infra.admission import AdmissionLimiter
+from shared_kernel.infra.database.connection import get_async_session_factory
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.outbox import OutboxDispatcher
 
 
 class AppContainer(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=[
             "display.presentation.rest.api",
-            "reception.presentation.rest.api"
+            "reception.presentation.rest.api",
+            "shared_kernel.presentation.rest.api",
         ]
     )
 
     display = providers.Container(DisplayContainer)
     reception = providers.Container(ReceptionContainer)
+
+    outbox_dispatcher = providers.Singleton(
+        OutboxDispatcher,
+        session_factory=get_async_session_factory,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_interval=settings.OUTBOX_POLL_INTERVAL,
+        lease=settings.OUTBOX_LEASE,
+        retry_backoff=settings.OUTBOX_RETRY_BACKOFF,
+        max_retry_backoff=settings.OUTBOX_MAX_RETRY_BACKOFF,
+    )
+
+    command_admission = providers.Singleton(
+        AdmissionLimiter,
+        max_concurrency=settings.ADMISSION_COMMAND_CONCURRENCY,
+        max_queue=settings.ADMISSION_QUEUE_SIZE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    )
+    query_admission = providers.Singleton(
+        AdmissionLimiter,
+        max_concurrency=settings.ADMISSION_QUERY_CONCURRENCY,
+        max_queue=settings.ADMISSION_QUEUE_SIZE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    )
@@ -1,29 +1,193 @@
-from contextlib import contextmanager
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy_utils import create_database, database_exists
+from sqlalchemy.pool import Pool, QueuePool, StaticPool
 
+from shared_kernel.infra.database.pool import MonitoredAsyncAdaptedQueuePool
+from shared_kernel.infra.database.query_budget import record_query
+from shared_kernel.infra.database.replica import ReplicaSet, read_from_primary
 from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.metrics import db_operation, db_query_duration
 
+slow_query_logger = logging.getLogger("shared_kernel.infra.database.slow_query")
 
-def get_engine():
-    db_engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
 
-    if not database_exists(db_engine.url):
-        create_database(db_engine.url)
+def get_engine_options(url: str, poolclass: type[Pool]) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # an in-memory database lives and dies with its connection, so every checkout shares one
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
 
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def configure_sqlite(engine: Engine) -> None:
+    """
+    Let SQLAlchemy own the transaction boundaries instead of the sqlite3 driver, which otherwise
+    defers BEGIN and breaks SAVEPOINT, and enforce foreign keys like the other backends do.
+    Connections opened with the `sqlite_begin_immediate` execution option take the write lock up front.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(conn):
+        if conn.get_execution_options().get("sqlite_begin_immediate"):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    What a statement was bound with, without the values, which may be personal data.
+    """
+    if executemany:
+        return f"{len(parameters)} x {parameters_shape(parameters[0])}" if parameters else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(sorted(parameters)) + "}"
+    return f"({len(parameters or ())} positional)"
+
+
+def instrument_engine(engine: Engine, slow_query_threshold: float) -> None:
+    """
+    Time every statement into `db_query_duration_seconds`, labelled with the repository method running it,
+    log the ones slower than `slow_query_threshold` seconds (0 logs none), and count them against query budgets.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None or not hasattr(context, "query_started"):
+            return
+        elapsed = time.perf_counter() - context.query_started
+        record_query(statement)
+        operation = db_operation.get()
+        db_query_duration.observe(elapsed, operation)
+        if 0 < slow_query_threshold <= elapsed:
+            slow_query_logger.warning(
+                "Slow query (%.3fs) in %s: %s; parameters: %s",
+                elapsed,
+                operation,
+                statement,
+                parameters_shape(parameters, executemany=executemany),
+            )
+
+
+def create_db_engine(url: str) -> Engine:
+    db_engine = create_engine(url, **get_engine_options(url, poolclass=QueuePool))
+    if db_engine.dialect.name == "sqlite":
+        configure_sqlite(db_engine)
+    instrument_engine(db_engine, slow_query_threshold=settings.DB_SLOW_QUERY_THRESHOLD)
     return db_engine
 
 
-engine = get_engine()
-SessionFactory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+def create_async_db_engine(url: str) -> AsyncEngine:
+    url = settings.to_async_url(url)
+    db_engine = create_async_engine(url, **get_engine_options(url, poolclass=MonitoredAsyncAdaptedQueuePool))
+    if db_engine.dialect.name == "sqlite":
+        configure_sqlite(db_engine.sync_engine)
+    instrument_engine(db_engine.sync_engine, slow_query_threshold=settings.DB_SLOW_QUERY_THRESHOLD)
+    return db_engine
+
+
+# Engines and session factories are built on first use, so importing this module never touches the database.
+# Creating the database itself is an explicit step: `python -m shared_kernel.infra.database.manage create-database`
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    return create_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    return create_async_db_engine(settings.SQLALCHEMY_DATABASE_URL)
+
+
+@lru_cache(maxsize=None)
+def get_replica_set() -> ReplicaSet:
+    return ReplicaSet(
+        engines=[create_async_db_engine(url) for url in settings.DB_REPLICA_URLS],
+        ejection_period=settings.DB_REPLICA_EJECTION_PERIOD,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=get_engine())
+
+
+@lru_cache(maxsize=None)
+def get_async_session_factory() -> sessionmaker:
+    return sessionmaker(
+        class_=AsyncSession, autocommit=False, autoflush=False, expire_on_commit=False, bind=get_async_engine()
+    )
+
+
+async def dispose_engines() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_replica_set.cache_info().currsize:
+        for replica_engine in get_replica_set().engines:
+            await replica_engine.dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
 
 
 @contextmanager
 def get_db_session():
-    db = SessionFactory()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def get_async_db_session():
+    db = get_async_session_factory()()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+@asynccontextmanager
+async def get_async_replica_db_session():
+    """
+    Session for read-only use cases: a healthy replica, or the primary when there is none
+    or when the current client wrote within the read-your-writes window.
+    """
+    db = None
+    if not read_from_primary.get():
+        db = await get_replica_set().open_session(get_async_session_factory())
+    if db is None:
+        db = get_async_session_factory()()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,80 @@
+"""
+Database management commands.
+
+    $ python -m shared_kernel.infra.database.manage create-database
+    $ python -m shared_kernel.infra.database.manage purge-idempotency-keys
+    $ python -m shared_kernel.infra.database.manage rebuild-reservation-view --batch-size 1000
+"""
+import argparse
+import asyncio
+
+from sqlalchemy_utils import create_database, database_exists
+
+from reception.infra.repository import ReservationRDBRepository
+from shared_kernel.infra.database.connection import dispose_engines, get_async_session_factory
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.idempotency import RDBIdempotencyStore
+
+
+def create_database_if_not_exists() -> bool:
+    if database_exists(settings.SQLALCHEMY_DATABASE_URL):
+        return False
+
+    create_database(settings.SQLALCHEMY_DATABASE_URL)
+    return True
+
+
+async def purge_idempotency_keys() -> int:
+    store = RDBIdempotencyStore(
+        ttl=settings.IDEMPOTENCY_TTL,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        session_factory=get_async_session_factory,
+    )
+    try:
+        return await store.purge_expired()
+    finally:
+        await dispose_engines()
+
+
+async def rebuild_reservation_view(batch_size: int) -> int:
+    """
+    Regenerate reservation_view from room_reservation, one committed batch at a time,
+    so it can run against a live database without holding long locks.
+    """
+    rebuilt, last_id = 0, 0
+    try:
+        while True:
+            async with get_async_session_factory()() as session:
+                next_id = await ReservationRDBRepository.rebuild_reservation_views(
+                    session=session, after_id=last_id, batch_size=batch_size
+                )
+                await session.commit()
+            if next_id is None:
+                return rebuilt
+            rebuilt, last_id = rebuilt + 1, next_id
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Database management commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("create-database", help="create the configured database if it does not exist")
+    subparsers.add_parser("purge-idempotency-keys", help="delete expired rows from the idempotency_key table")
+    rebuild = subparsers.add_parser("rebuild-reservation-view", help="regenerate the reservation_view read model")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == "create-database":
+        if create_database_if_not_exists():
+            print("Database created.")
+        else:
+            print("Database already exists.")
+    elif args.command == "purge-idempotency-keys":
+        print(f"Purged {asyncio.run(purge_idempotency_keys())} expired idempotency keys.")
+    elif args.command == "rebuild-reservation-view":
+        print(f"Rebuilt reservation_view in {asyncio.run(rebuild_reservation_view(args.batch_size))} batches.")
+
+
+if __name__ == "__main__":
+    main()
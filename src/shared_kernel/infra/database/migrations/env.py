@@ -47,6 +47,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=database_url.startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -70,7 +71,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most constraints in place, batch mode recreates the table instead
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
@@ -0,0 +1,43 @@
+"""add checked-in status
+
+Revision ID: 0d9c4e2b7a61
+Revises: f1b6d3a8e925
+Create Date: 2026-10-18 21:26:37.840519
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0d9c4e2b7a61'
+down_revision = 'f1b6d3a8e925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # check-in used to mark only the room; its guest's stay is the earliest one still in progress there.
+    # the derived table lets MySQL update the table it selects from
+    op.execute(sa.text(
+        "UPDATE room_reservation SET status = 'CHECKED-IN', version = version + 1 WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT stay.id FROM room_reservation stay JOIN hotel_room ON hotel_room.id = stay.room_id "
+        "WHERE hotel_room.status = 'OCCUPIED' AND stay.status = 'IN-PROGRESS' AND stay.date_in = ("
+        "SELECT MIN(earlier.date_in) FROM room_reservation earlier "
+        "WHERE earlier.room_id = stay.room_id AND earlier.status = 'IN-PROGRESS')"
+        ") AS checked_in)"
+    ))
+    op.execute(sa.text(
+        "UPDATE reservation_view SET status = 'CHECKED-IN', reservation_version = reservation_version + 1 "
+        "WHERE number IN (SELECT number FROM room_reservation WHERE status = 'CHECKED-IN')"
+    ))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "UPDATE reservation_view SET status = 'IN-PROGRESS', reservation_version = reservation_version + 1 "
+        "WHERE status = 'CHECKED-IN'"
+    ))
+    op.execute(sa.text(
+        "UPDATE room_reservation SET status = 'IN-PROGRESS', version = version + 1 WHERE status = 'CHECKED-IN'"
+    ))
@@ -0,0 +1,27 @@
+"""add version columns
+
+Revision ID: 3f2a1c9d8e4b
+Revises: 6b595c7689ad
+Create Date: 2026-10-18 09:12:41.204816
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f2a1c9d8e4b'
+down_revision = '6b595c7689ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('hotel_room', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('room_reservation', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('room_reservation') as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('hotel_room') as batch_op:
+        batch_op.drop_column('version')
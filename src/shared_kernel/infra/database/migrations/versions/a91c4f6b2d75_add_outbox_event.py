@@ -0,0 +1,34 @@
+"""add outbox event
+
+Revision ID: a91c4f6b2d75
+Revises: e2f7a9c4d618
+Create Date: 2026-10-18 18:03:27.481950
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a91c4f6b2d75'
+down_revision = 'e2f7a9c4d618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_event',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_event_next_attempt_at'), 'outbox_event', ['next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_outbox_event_next_attempt_at'), table_name='outbox_event')
+    op.drop_table('outbox_event')
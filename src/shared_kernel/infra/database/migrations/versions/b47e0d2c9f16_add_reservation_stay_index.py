@@ -0,0 +1,30 @@
+"""add reservation stay index
+
+Revision ID: b47e0d2c9f16
+Revises: 8c1d5e7f2a93
+Create Date: 2026-10-18 13:27:05.914372
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b47e0d2c9f16'
+down_revision = '8c1d5e7f2a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_room_reservation_room_id_stay',
+        'room_reservation',
+        ['room_id', 'date_out', 'date_in', 'status'],
+        unique=False,
+    )
+    # availability now comes from reservation dates; the room status only tracks occupancy
+    op.execute(sa.text("UPDATE hotel_room SET status = 'AVAILABLE' WHERE status = 'RESERVED'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_room_reservation_room_id_stay', table_name='room_reservation')
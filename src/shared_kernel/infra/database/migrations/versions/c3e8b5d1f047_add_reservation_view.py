@@ -0,0 +1,47 @@
+"""add reservation view
+
+Revision ID: c3e8b5d1f047
+Revises: a91c4f6b2d75
+Create Date: 2026-10-18 19:12:40.236118
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8b5d1f047'
+down_revision = 'a91c4f6b2d75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reservation_view',
+        sa.Column('number', sa.String(length=20), nullable=False),
+        sa.Column('room_number', sa.String(length=20), nullable=False),
+        sa.Column('room_status', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('date_in', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('date_out', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('guest_mobile', sa.String(length=20), nullable=False),
+        sa.Column('guest_name', sa.String(length=50), nullable=True),
+        sa.Column('reservation_version', sa.Integer(), nullable=False),
+        sa.Column('room_version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('number')
+    )
+    op.create_index(op.f('ix_reservation_view_room_number'), 'reservation_view', ['room_number'], unique=False)
+    # backfill; for large tables, run `manage rebuild-reservation-view` instead, which works in batches
+    op.execute(
+        'INSERT INTO reservation_view (number, room_number, room_status, status, date_in, date_out, '
+        'guest_mobile, guest_name, reservation_version, room_version) '
+        'SELECT room_reservation.number, hotel_room.number, hotel_room.status, room_reservation.status, '
+        'room_reservation.date_in, room_reservation.date_out, room_reservation.guest_mobile, '
+        'room_reservation.guest_name, room_reservation.version, hotel_room.version '
+        'FROM room_reservation JOIN hotel_room ON room_reservation.room_id = hotel_room.id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reservation_view_room_number'), table_name='reservation_view')
+    op.drop_table('reservation_view')
@@ -0,0 +1,23 @@
+"""add reservation number index
+
+Revision ID: d5a8e31c7b40
+Revises: b47e0d2c9f16
+Create Date: 2026-10-18 16:04:51.207336
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd5a8e31c7b40'
+down_revision = 'b47e0d2c9f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # fails if the old timestamp + random numbers ever collided; resolve those rows by hand before upgrading
+    op.create_index('uix_room_reservation_number', 'room_reservation', ['number'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uix_room_reservation_number', table_name='room_reservation')
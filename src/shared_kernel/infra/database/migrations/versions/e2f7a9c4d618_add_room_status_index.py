@@ -0,0 +1,22 @@
+"""add room status index
+
+Revision ID: e2f7a9c4d618
+Revises: d5a8e31c7b40
+Create Date: 2026-10-18 17:12:38.640192
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e2f7a9c4d618'
+down_revision = 'd5a8e31c7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_hotel_room_status_id', 'hotel_room', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hotel_room_status_id', table_name='hotel_room')
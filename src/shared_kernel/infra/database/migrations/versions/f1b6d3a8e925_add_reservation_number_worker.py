@@ -0,0 +1,33 @@
+"""add reservation number worker
+
+Revision ID: f1b6d3a8e925
+Revises: c3e8b5d1f047
+Create Date: 2026-10-18 20:03:51.617402
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6d3a8e925'
+down_revision = 'c3e8b5d1f047'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reservation_number_worker',
+        sa.Column('worker_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('owner', sa.String(length=32), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('worker_id')
+    )
+    op.create_index(
+        op.f('ix_reservation_number_worker_expires_at'), 'reservation_number_worker', ['expires_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reservation_number_worker_expires_at'), table_name='reservation_number_worker')
+    op.drop_table('reservation_number_worker')
@@ -1,10 +1,25 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text, UniqueConstraint
+from dataclasses import fields
+from typing import Any, Callable, Type
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import composite, registry, relationship
 
 from reception.domain.entity.room import Room
 from reception.domain.value_object.guest import Guest
 from reception.domain.value_object.reservation import ReservationNumber
-from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus, ValueObjectType
 
 metadata = MetaData()
 mapper_registry = registry()
@@ -18,7 +33,10 @@ room_table = Table(
     Column("status", String(20), nullable=False),
     Column("image_url", String(200), nullable=False),
     Column("description", Text, nullable=True),
+    Column("version", Integer, nullable=False, server_default="1"),
     UniqueConstraint("number", name="uix_hotel_room_number"),
+    # keyset pages of one status: WHERE status = ? AND id > ? ORDER BY id
+    Index("ix_hotel_room_status_id", "status", "id"),
 )
 
 reservation_table = Table(
@@ -32,8 +50,91 @@ reservation_table = Table(
     Column("date_out", DateTime(timezone=True)),
     Column("guest_mobile", String(20), nullable=False),
     Column("guest_name", String(50), nullable=True),
+    Column("version", Integer, nullable=False, server_default="1"),
+    # availability search: overlapping stays of a room, without touching the table rows.
+    # date_out leads date_in, so `date_out > :date_in` skips a room's past stays instead of scanning them
+    Index("ix_room_reservation_room_id_stay", "room_id", "date_out", "date_in", "status"),
+    Index("uix_room_reservation_number", "number", unique=True),
+)
+
+# read model of GET /reception/reservations/{number}: one flat row per reservation, written with it
+reservation_view_table = Table(
+    "reservation_view",
+    metadata,
+    Column("number", String(20), primary_key=True),
+    Column("room_number", String(20), nullable=False, index=True),
+    Column("room_status", String(20), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("date_in", DateTime(timezone=True)),
+    Column("date_out", DateTime(timezone=True)),
+    Column("guest_mobile", String(20), nullable=False),
+    Column("guest_name", String(50), nullable=True),
+    Column("reservation_version", Integer, nullable=False),
+    Column("room_version", Integer, nullable=False),
+)
+
+idempotency_key_table = Table(
+    "idempotency_key",
+    metadata,
+    Column("key", String(255), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("status_code", Integer, nullable=True),  # NULL while the first request is in flight
+    Column("headers", Text, nullable=True),
+    Column("body", LargeBinary, nullable=True),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
+
+reservation_number_worker_table = Table(
+    "reservation_number_worker",
+    metadata,
+    Column("worker_id", Integer, primary_key=True, autoincrement=False),
+    Column("owner", String(32), nullable=False),  # a random token of the holding process
+    Column("expires_at", DateTime, nullable=False, index=True),  # the holder renews it while it runs
 )
 
+outbox_event_table = Table(
+    "outbox_event",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("event_type", String(100), nullable=False),
+    Column("payload", Text, nullable=False),  # JSON
+    Column("occurred_at", DateTime, nullable=False),
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    # due for (re)delivery from then on; a dispatcher that claims a batch pushes it back by its lease
+    Column("next_attempt_at", DateTime, nullable=False, index=True),
+)
+
+
+def restore_value_object(cls: Type[ValueObjectType]) -> Callable[..., ValueObjectType]:
+    """
+    Composite factory for a frozen, slotted dataclass value object: fills the slots straight from the column
+    values, skipping __init__ and its frozen setattr for every loaded row. The columns are trusted as they are.
+    Unrolled for one and two fields, which is all our composites have; a loop over the slots costs more than
+    __init__ saves.
+    """
+    new = object.__new__
+    setters = [cls.__dict__[field.name].__set__ for field in fields(cls)]
+    if len(setters) == 1:
+        (set_value,) = setters
+
+        def restore(value: Any) -> ValueObjectType:
+            instance = new(cls)
+            set_value(instance, value)
+            return instance
+
+    elif len(setters) == 2:
+        set_first, set_second = setters
+
+        def restore(first: Any, second: Any) -> ValueObjectType:
+            instance = new(cls)
+            set_first(instance, first)
+            set_second(instance, second)
+            return instance
+
+    else:
+        return cls
+    return restore
+
 
 def init_orm_mappers():
     """
@@ -47,17 +148,21 @@ def init_orm_mappers():
         room_table,
         properties={
             "room_status": composite(RoomStatus.from_value, room_table.c.status),
-        }
+        },
+        version_id_col=room_table.c.version,
     )
     mapper_registry.map_imperatively(
         ReceptionReservationEntity,
         reservation_table,
         properties={
             "room": relationship(Room, backref="reservations", order_by=reservation_table.c.id.desc, lazy="joined"),
-            "reservation_number": composite(ReservationNumber.from_value, reservation_table.c.number),
+            "reservation_number": composite(restore_value_object(ReservationNumber), reservation_table.c.number),
             "reservation_status": composite(ReservationStatus.from_value, reservation_table.c.status),
-            "guest": composite(Guest, reservation_table.c.guest_mobile, reservation_table.c.guest_name),
-        }
+            "guest": composite(
+                restore_value_object(Guest), reservation_table.c.guest_mobile, reservation_table.c.guest_name
+            ),
+        },
+        version_id_col=reservation_table.c.version,
     )
 
     from display.domain.entity.room import Room as DisplayRoomEntity
@@ -67,5 +172,6 @@ def init_orm_mappers():
         room_table,
         properties={
             "room_status": composite(RoomStatus.from_value, room_table.c.status),
-        }
+        },
+        version_id_col=room_table.c.version,
     )
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class MonitoredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_count: int = 0
+        self.wait_time_total: float = 0.0
+        self.wait_time_max: float = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkout_count += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkout_count,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_avg": self.wait_time_total / self.checkout_count if self.checkout_count else 0.0,
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+def get_pool_stats(pool: Pool) -> dict:
+    if isinstance(pool, MonitoredAsyncAdaptedQueuePool):
+        return pool.stats()
+    # e.g. the StaticPool of an in-memory SQLite database, which has nothing to size
+    return {"status": pool.status()}
+
+
+async def ping_idle_connections(engine: AsyncEngine) -> int:
+    """
+    Round-trip every idle connection once, so dead ones are invalidated here instead of on a request.
+    The queue is FIFO, so checking out one connection at a time walks through all idle connections.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+
+    pinged = 0
+    for _ in range(pool.checkedin()):
+        try:
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+        except DBAPIError:
+            # disconnect errors invalidate the connection, the pool reconnects on the next checkout
+            logger.warning("Discarded a dead idle connection", exc_info=True)
+        pinged += 1
+    return pinged
+
+
+async def run_liveness_check(engines: Iterable[AsyncEngine], interval: float) -> None:
+    engines = list(engines)
+    while True:
+        await asyncio.sleep(interval)
+        for engine in engines:
+            try:
+                await ping_idle_connections(engine)
+            except Exception:
+                logger.exception("Pool liveness check failed for %s", engine.url)
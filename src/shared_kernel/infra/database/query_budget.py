@@ -0,0 +1,112 @@
+import functools
+import inspect
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.metrics import query_budget_exceeded
+
+logger = logging.getLogger(__name__)
+
+# transaction control is issued by the driver or the dialect, and differs between them, so it is not counted
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+class QueryCount:
+    """
+    The statements run on this task, and the tasks it started, while counting.
+    An executemany is one statement: it is one round trip.
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __str__(self) -> str:
+        return "\n".join(f"{i}. {statement}" for i, statement in enumerate(self.statements, start=1))
+
+
+# every count open on this task, innermost last
+_active_counts: ContextVar[Tuple[QueryCount, ...]] = ContextVar("active_query_counts", default=())
+
+
+@contextmanager
+def count_queries(count: QueryCount | None = None) -> Iterator[QueryCount]:
+    """
+    Count the statements run inside the block, into `count` if given, e.g. to add up several blocks.
+    """
+    count = count if count is not None else QueryCount()
+    token = _active_counts.set((*_active_counts.get(), count))
+    try:
+        yield count
+    finally:
+        _active_counts.reset(token)
+
+
+def record_query(statement: str) -> None:
+    """
+    Called by the engine listeners for every statement.
+    """
+    counts = _active_counts.get()
+    if counts and not statement.lstrip().upper().startswith(TRANSACTION_CONTROL):
+        for count in counts:
+            count.statements.append(statement)
+
+
+def check_budget(operation: str, max_queries: int, count: QueryCount) -> None:
+    if len(count) <= max_queries or settings.QUERY_BUDGET_MODE == "off":
+        return
+    query_budget_exceeded.inc(operation)
+    message = f"{operation} ran {len(count)} queries, over its budget of {max_queries}"
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceededError(f"{message}:\n{count}")
+    logger.warning("%s", message)
+
+
+def query_budget(max_queries: int):
+    """
+    Declare the most statements one call of a use case may run; a call that runs more is logged,
+    or fails with QueryBudgetExceededError when QUERY_BUDGET_MODE is "raise", as it is in tests.
+    Under `retry_on_conflict`, every attempt has the whole budget.
+    """
+    def decorator(function):
+        operation = function.__qualname__
+
+        if inspect.isasyncgenfunction(function):
+            @functools.wraps(function)
+            async def generator_wrapper(*args, **kwargs):
+                # count only while the generator runs, not while its consumer does between items
+                count, generator = QueryCount(), function(*args, **kwargs)
+                try:
+                    while True:
+                        with count_queries(count):
+                            try:
+                                item = await generator.__anext__()
+                            except StopAsyncIteration:
+                                break
+                        yield item
+                finally:
+                    await generator.aclose()
+                check_budget(operation=operation, max_queries=max_queries, count=count)
+
+            wrapper = generator_wrapper
+        else:
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with count_queries() as count:
+                    result = await function(*args, **kwargs)
+                check_budget(operation=operation, max_queries=max_queries, count=count)
+                return result
+
+        wrapper.max_queries = max_queries
+        return wrapper
+
+    return decorator
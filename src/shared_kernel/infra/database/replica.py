@@ -0,0 +1,66 @@
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from typing import List
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from shared_kernel.infra.database.pool import get_pool_stats
+
+logger = logging.getLogger(__name__)
+
+# set per request when the caller wrote recently and must read from the primary
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas. A replica that fails to hand out a connection is ejected for
+    `ejection_period` seconds, after which the next request through it acts as the health probe.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], ejection_period: float):
+        self.engines = engines
+        self.ejection_period = ejection_period
+        self._ejected_until: List[float] = [0.0] * len(engines)
+        self._cursor = itertools.count()
+
+    def is_healthy(self, index: int) -> bool:
+        return self._ejected_until[index] <= time.monotonic()
+
+    def eject(self, index: int) -> None:
+        self._ejected_until[index] = time.monotonic() + self.ejection_period
+
+    async def open_session(self, session_factory: sessionmaker) -> AsyncSession | None:
+        """
+        Open a session on the next healthy replica with its connection already checked out,
+        or return None when every replica is ejected or unreachable.
+        """
+        for _ in range(len(self.engines)):
+            index = next(self._cursor) % len(self.engines)
+            if not self.is_healthy(index):
+                continue
+
+            session: AsyncSession = session_factory(bind=self.engines[index])
+            try:
+                await session.connection()
+            except DBAPIError:
+                logger.warning("Ejected read replica %s", self.engines[index].url, exc_info=True)
+                self.eject(index)
+                await session.close()
+                continue
+            return session
+        return None
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "healthy": self.is_healthy(index),
+                **get_pool_stats(engine.sync_engine.pool),
+            }
+            for index, engine in enumerate(self.engines)
+        ]
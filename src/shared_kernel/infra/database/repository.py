@@ -1,15 +1,35 @@
+import inspect
+
 from shared_kernel.domain.entity import EntityType
+from shared_kernel.infra.metrics import labels_db_queries
+
+
+class LabelledQueries:
+    """
+    Attributes the statements of every public async staticmethod of a subclass to `Class.method`
+    in the database latency metrics.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if (
+                not name.startswith("_")
+                and isinstance(attribute, staticmethod)
+                and inspect.iscoroutinefunction(attribute.__func__)
+            ):
+                setattr(cls, name, staticmethod(labels_db_queries(f"{cls.__name__}.{name}")(attribute.__func__)))
 
 
-class RDBRepository:
+class RDBRepository(LabelledQueries):
     @staticmethod
     def add(session, instance: EntityType):
         return session.add(instance)
 
     @staticmethod
-    def commit(session):
-        return session.commit()
+    async def commit(session):
+        return await session.commit()
 
 
-class RDBReadRepository:
+class RDBReadRepository(LabelledQueries):
     pass
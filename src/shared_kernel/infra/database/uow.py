@@ -0,0 +1,76 @@
+import functools
+import itertools
+from typing import AsyncContextManager, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from shared_kernel.domain.entity import AggregateRoot
+from shared_kernel.domain.exception import ConcurrentUpdateException
+from shared_kernel.infra.metrics import labels_db_queries
+from shared_kernel.infra.outbox import save_events
+
+
+class RDBUnitOfWork:
+    """
+    One session and one transaction per command: load the aggregate with row locks,
+    change it, commit once. Leaving the block without commit() rolls everything back.
+    The domain events of the aggregates in the session are saved to the outbox in the same transaction.
+    """
+
+    def __init__(self, db_session: Callable[[], AsyncContextManager[AsyncSession]]):
+        self.db_session = db_session
+        self.session: AsyncSession | None = None
+
+    async def __aenter__(self) -> "RDBUnitOfWork":
+        self._session_context = self.db_session()
+        self.session = await self._session_context.__aenter__()
+        # SQLite has no SELECT ... FOR UPDATE, so take its write lock when the transaction begins instead
+        await self.session.connection(execution_options={"sqlite_begin_immediate": True})
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self._session_context.__aexit__(exc_type, exc_value, traceback)
+        self.session = None
+
+    @labels_db_queries("RDBUnitOfWork.flush")
+    async def flush(self) -> None:
+        """
+        Write pending changes without committing, e.g. to read the versions they were given.
+        """
+        try:
+            await self.session.flush()
+        except StaleDataError as e:
+            raise ConcurrentUpdateException from e
+
+    @labels_db_queries("RDBUnitOfWork.commit")
+    async def commit(self) -> None:
+        # flush first, so a lost version check fails before anything reaches the outbox
+        await self.flush()
+        await save_events(
+            session=self.session,
+            aggregates=[
+                instance for instance in self.session.identity_map.values() if isinstance(instance, AggregateRoot)
+            ],
+        )
+        try:
+            await self.session.commit()
+        except StaleDataError as e:
+            # a versioned row was changed by someone else since it was loaded
+            raise ConcurrentUpdateException from e
+
+
+def retry_on_conflict(method):
+    """
+    Re-run a unit-of-work method from the start when its commit lost an optimistic
+    concurrency check, at most `self.conflict_retries` more times.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        for attempt in itertools.count():
+            try:
+                return await method(self, *args, **kwargs)
+            except ConcurrentUpdateException:
+                if attempt >= self.conflict_retries:
+                    raise
+    return wrapper
@@ -1,9 +1,32 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from display.presentation.rest import api as display_api
+from reception.application.event_handler import register_handlers
+from reception.domain.value_object.reservation import ReservationNumber
 from reception.presentation.rest import api as reception_api
 from shared_kernel.infra.container import AppContainer
+from shared_kernel.infra.database.connection import (
+    dispose_engines,
+    get_async_engine,
+    get_async_session_factory,
+    get_replica_set,
+)
 from shared_kernel.infra.database.orm import init_orm_mappers
+from shared_kernel.infra.database.pool import run_liveness_check
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.fastapi.middleware import (
+    AdmissionControlMiddleware,
+    IdempotencyMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from shared_kernel.infra.idempotency import IdempotencyStore, InMemoryIdempotencyStore, RDBIdempotencyStore
+from shared_kernel.infra.metrics import registry
+from shared_kernel.infra.signal import reservation_changed
+from shared_kernel.presentation.rest import api as internal_api
 
 app_container = AppContainer()
 
@@ -13,15 +36,108 @@ app = FastAPI(
         "name": "qu3vipon",
         "email": "qu3vipon@gmail.com",
     },
+    default_response_class=ORJSONResponse,
 )
 
 app.container = app_container
 app.include_router(reception_api.router)
 app.include_router(display_api.router)
+app.include_router(internal_api.router)
+
+if settings.DB_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.DB_READ_YOUR_WRITES_WINDOW)
+
+if settings.IDEMPOTENCY_STORE == "database":
+    idempotency_store: IdempotencyStore = RDBIdempotencyStore(
+        ttl=settings.IDEMPOTENCY_TTL,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        session_factory=get_async_session_factory,
+    )
+else:
+    idempotency_store = InMemoryIdempotencyStore(
+        ttl=settings.IDEMPOTENCY_TTL,
+        lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+    )
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    path_prefixes=(reception_api.router.prefix,),
+    client_header=settings.IDEMPOTENCY_CLIENT_HEADER,
+)
+# added after the others, so it runs before them: a request that is turned away costs nothing further
+app.add_middleware(
+    AdmissionControlMiddleware,
+    command_limiter=app_container.command_admission(),
+    query_limiter=app_container.query_admission(),
+    path_prefixes=(reception_api.router.prefix, display_api.router.prefix),
+    retry_after=settings.ADMISSION_RETRY_AFTER,
+)
+app.add_middleware(MetricsMiddleware)
 
 init_orm_mappers()
 
 
+@app.on_event("startup")
+async def configure_reservation_numbers():
+    # here rather than at import, so that every worker process of a preforking server configures its own
+    if settings.RESERVATION_NUMBER_WORKER_ID is not None:
+        ReservationNumber.configure(worker_id=settings.RESERVATION_NUMBER_WORKER_ID)
+    else:
+        worker_id_lease = app_container.reception.worker_id_lease()
+        await worker_id_lease.acquire()
+        app.state.worker_id_renewal = asyncio.create_task(worker_id_lease.run())
+
+
+@app.on_event("startup")
+async def start_pool_liveness_check():
+    if settings.DB_POOL_LIVENESS_CHECK_INTERVAL > 0:
+        app.state.pool_liveness_check = asyncio.create_task(
+            run_liveness_check(
+                [get_async_engine(), *get_replica_set().engines],
+                interval=settings.DB_POOL_LIVENESS_CHECK_INTERVAL,
+            )
+        )
+
+
+@app.on_event("startup")
+async def connect_room_listing_cache():
+    reservation_changed.connect(app_container.display.room_listing_cache().apply)
+
+
+@app.on_event("startup")
+async def start_availability_index():
+    if settings.AVAILABILITY_INDEX_NIGHTS > 0:
+        availability_engine = app_container.display.availability_engine()
+        reservation_changed.connect(availability_engine.apply)
+        app.state.availability_index_rebuild = asyncio.create_task(
+            availability_engine.run(interval=settings.AVAILABILITY_INDEX_REBUILD_INTERVAL)
+        )
+
+
+@app.on_event("startup")
+async def start_outbox_dispatcher():
+    if settings.OUTBOX_POLL_INTERVAL > 0:
+        outbox_dispatcher = app_container.outbox_dispatcher()
+        register_handlers(outbox_dispatcher)
+        app.state.outbox_dispatch = asyncio.create_task(outbox_dispatcher.run())
+
+
+@app.on_event("shutdown")
+async def close_db_connections():
+    for task_name in ("pool_liveness_check", "availability_index_rebuild", "outbox_dispatch", "worker_id_renewal"):
+        if task := getattr(app.state, task_name, None):
+            task.cancel()
+    if getattr(app.state, "worker_id_renewal", None):
+        await app_container.reception.worker_id_lease().release()
+    await dispose_engines()
+
+
 @app.get("/")
-def health_check():
+async def health_check():
     return {"ping": "pong"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
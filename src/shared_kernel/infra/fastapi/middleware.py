@@ -0,0 +1,273 @@
+import hashlib
+import json
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared_kernel.domain.exception import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyMismatchException,
+    ServiceOverloadedException,
+)
+from shared_kernel.infra.admission import AdmissionLimiter
+from shared_kernel.infra.database.replica import read_from_primary
+from shared_kernel.infra.idempotency import IdempotencyStore, StoredResponse
+from shared_kernel.infra.metrics import http_request_duration
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def send_error(send: Send, status_code: int, detail: str, headers: Sequence[Tuple[bytes, bytes]] = ()) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a successful write, hand the client a short-lived cookie; while it is valid,
+    replica sessions opened for that client's requests fall back to the primary.
+    """
+
+    COOKIE_NAME = "db-primary-until"
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        try:
+            primary_until = float(HTTPConnection(scope).cookies.get(self.COOKIE_NAME, 0))
+        except ValueError:
+            primary_until = 0.0
+        is_write = scope["method"] not in READ_ONLY_METHODS
+
+        async def send_with_cookie(message: Message) -> None:
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.COOKIE_NAME}={now + self.window:.3f}; Max-Age={int(self.window) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = read_from_primary.set(primary_until > now)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            read_from_primary.reset(token)
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the first response to a write request carrying an `Idempotency-Key` header instead of running it again.
+    Keys are scoped to the client, so two clients can't see each other's responses: by the `client_header` an
+    authenticating proxy sets, when given, otherwise by the client address. Behind a proxy that does not pass
+    the client address on (see uvicorn's --proxy-headers), every client has the proxy's address.
+    Responses with a 5xx status, or requests that raise, release the key so the client can retry for real.
+    """
+
+    HEADER_NAME = "idempotency-key"
+    REPLAYED_HEADER_NAME = "idempotent-replayed"
+    MAX_KEY_LENGTH = 200
+    STATUS_CODES = {
+        IdempotencyKeyInProgressException: 409,
+        IdempotencyKeyMismatchException: 422,
+    }
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        path_prefixes: Tuple[str, ...],
+        client_header: str | None = None,
+    ):
+        self.app = app
+        self.store = store
+        self.path_prefixes = path_prefixes
+        self.client_header = client_header
+
+    def get_client_scope(self, scope: Scope, headers: Headers) -> str | None:
+        if self.client_header is None:
+            return scope["client"][0] if scope.get("client") else ""
+        if client_id := headers.get(self.client_header):
+            # hashed: the identifier may be a credential, and the scoped key has to fit the store's column
+            return hashlib.sha256(client_id.encode()).hexdigest()[:40]
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_ONLY_METHODS
+            or not scope["path"].startswith(self.path_prefixes)
+            or not (idempotency_key := (headers := Headers(scope=scope)).get(self.HEADER_NAME))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > self.MAX_KEY_LENGTH:
+            await send_error(send, 400, f"Idempotency-Key must be at most {self.MAX_KEY_LENGTH} characters.")
+            return
+        if (client_scope := self.get_client_scope(scope=scope, headers=headers)) is None:
+            await send_error(send, 400, f"Idempotency-Key requires the {self.client_header} header.")
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        key = f"{client_scope}:{idempotency_key}"
+        fingerprint = hashlib.sha256(
+            b"%s %s\n%s" % (scope["method"].encode(), scope["path"].encode(), body)
+        ).hexdigest()
+
+        try:
+            stored_response = await self.store.claim(key=key, fingerprint=fingerprint)
+        except (IdempotencyKeyInProgressException, IdempotencyKeyMismatchException) as e:
+            await send_error(send, self.STATUS_CODES[type(e)], e.message)
+            return
+
+        if stored_response is not None:
+            await self.send_replay(send, stored_response)
+            return
+
+        async def receive_body() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status_code = 500
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+
+        async def send_and_record(message: Message) -> None:
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"set-cookie"
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_and_record)
+        except BaseException:
+            await self.store.release(key)
+            raise
+
+        if status_code >= 500:
+            await self.store.release(key)
+        else:
+            await self.store.complete(
+                key=key, response=StoredResponse(status_code=status_code, headers=headers, body=b"".join(chunks))
+            )
+
+    async def send_replay(self, send: Send, response: StoredResponse) -> None:
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response.headers]
+        headers.append((self.REPLAYED_HEADER_NAME.encode(), b"true"))
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": response.body})
+
+
+class AdmissionControlMiddleware:
+    """
+    Caps the requests in flight under `path_prefixes`: writes go through `command_limiter` and reads through
+    `query_limiter`, so a flood of polling reads can't take the slots check-ins need. A request that isn't
+    admitted gets a 503 with Retry-After at once. Other paths, like health checks, are never limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        command_limiter: AdmissionLimiter,
+        query_limiter: AdmissionLimiter,
+        path_prefixes: Tuple[str, ...],
+        retry_after: int,
+    ):
+        self.app = app
+        self.command_limiter = command_limiter
+        self.query_limiter = query_limiter
+        self.path_prefixes = path_prefixes
+        self.retry_after = str(retry_after).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.query_limiter if scope["method"] in READ_ONLY_METHODS else self.command_limiter
+        try:
+            await limiter.acquire()
+        except ServiceOverloadedException as e:
+            await send_error(send, 503, e.message, headers=[(b"retry-after", self.retry_after)])
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+class MetricsMiddleware:
+    """
+    Observe every request's latency in `http_request_duration_seconds`, labelled with the template of the route
+    that served it rather than the path, so reservation numbers don't each make a series.
+    Requests answered before routing, like shed ones, are labelled "other".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_paths: Dict[Callable, str] = {}
+
+    def route_of(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "other"
+        if endpoint not in self._route_paths:
+            for route in scope["router"].routes:
+                if getattr(route, "endpoint", None) is not None:
+                    self._route_paths[route.endpoint] = route.path
+        return self._route_paths.get(endpoint, "other")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], self.route_of(scope), str(status_code)
+            )
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+from shared_kernel.domain.exception import IdempotencyKeyInProgressException, IdempotencyKeyMismatchException
+from shared_kernel.infra.database.orm import idempotency_key_table
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+class IdempotencyStore(ABC):
+    """
+    Remembers the first response sent for an idempotency key.
+
+    `claim` returns the stored response when the key was already answered, or None when the caller now
+    owns the key and must `complete` or `release` it. A duplicate that arrives while the key is owned
+    waits for the owner; it raises IdempotencyKeyInProgressException after `lock_timeout` seconds,
+    which is also how long an unfinished claim survives a crashed owner.
+    """
+
+    def __init__(self, ttl: float, lock_timeout: float):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    @abstractmethod
+    async def claim(self, key: str, fingerprint: str) -> StoredResponse | None:
+        ...
+
+    @abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        ...
+
+
+@dataclass
+class _MemoryRecord:
+    fingerprint: str
+    expires_at: float
+    response: StoredResponse | None = None
+    done: asyncio.Event | None = None
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Per-process store for single-node deployments: an LRU of at most `max_keys` records.
+    """
+
+    def __init__(self, ttl: float, lock_timeout: float, max_keys: int):
+        super().__init__(ttl=ttl, lock_timeout=lock_timeout)
+        self.max_keys = max_keys
+        self._records: OrderedDict[str, _MemoryRecord] = OrderedDict()
+
+    async def claim(self, key: str, fingerprint: str) -> StoredResponse | None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            record = self._records.get(key)
+            if record is None or record.expires_at <= time.monotonic():
+                self._records[key] = _MemoryRecord(
+                    fingerprint=fingerprint, expires_at=time.monotonic() + self.lock_timeout, done=asyncio.Event()
+                )
+                self._records.move_to_end(key)
+                self._evict()
+                return None
+
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchException
+            if record.response is not None:
+                self._records.move_to_end(key)
+                return record.response
+
+            try:
+                await asyncio.wait_for(record.done.wait(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                raise IdempotencyKeyInProgressException
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        if record := self._records.get(key):
+            record.response = response
+            record.expires_at = time.monotonic() + self.ttl
+            record.done.set()
+
+    async def release(self, key: str) -> None:
+        if record := self._records.pop(key, None):
+            record.done.set()
+
+    def _evict(self) -> None:
+        while len(self._records) > self.max_keys:
+            _, record = self._records.popitem(last=False)
+            record.done.set()
+
+
+class RDBIdempotencyStore(IdempotencyStore):
+    """
+    Store shared by every worker through the `idempotency_key` table. Claiming is an INSERT, made atomic
+    by the primary key; duplicates poll the row until its owner writes the response.
+    """
+
+    POLL_INTERVAL: float = 0.05
+    # on SQLite take the write lock at BEGIN like RDBUnitOfWork does, reads included: a reader's shared lock
+    # would hold up a committing writer
+    EXECUTION_OPTIONS = {"sqlite_begin_immediate": True}
+
+    def __init__(self, ttl: float, lock_timeout: float, session_factory: Callable[[], sessionmaker]):
+        super().__init__(ttl=ttl, lock_timeout=lock_timeout)
+        # a getter, so the engine is only created on the first request
+        self.session_factory = session_factory
+
+    async def _insert(self, key: str, fingerprint: str) -> bool:
+        # INSERT IGNORE / INSERT OR IGNORE: losing the race is an expected outcome, not an IntegrityError,
+        # so the transaction never fails holding SQLite's write lock
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            result = await session.execute(
+                insert(idempotency_key_table)
+                .prefix_with("IGNORE", dialect="mysql")
+                .prefix_with("OR IGNORE", dialect="sqlite")
+                .values(
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.lock_timeout),
+                )
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def _delete_expired(self, key: str) -> None:
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            await session.execute(
+                delete(idempotency_key_table).where(
+                    idempotency_key_table.c.key == key, idempotency_key_table.c.expires_at <= datetime.utcnow()
+                )
+            )
+            await session.commit()
+
+    async def claim(self, key: str, fingerprint: str) -> StoredResponse | None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            # insert first: a locking read of a key that doesn't exist yet takes gap locks on InnoDB, and two
+            # duplicates holding them deadlock on their inserts
+            if await self._insert(key=key, fingerprint=fingerprint):
+                return None
+
+            async with self.session_factory()() as session:
+                await session.connection(execution_options=self.EXECUTION_OPTIONS)
+                row = (await session.execute(select(idempotency_key_table).filter_by(key=key))).one_or_none()
+            if row is None:
+                continue  # released since our insert failed
+            if row.expires_at <= datetime.utcnow():
+                # a crashed owner's claim or a stale response; a fresh claim made meanwhile is not deleted
+                await self._delete_expired(key=key)
+                continue
+
+            if row.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchException
+            if row.status_code is not None:
+                return StoredResponse(
+                    status_code=row.status_code,
+                    headers=[tuple(header) for header in json.loads(row.headers)],
+                    body=row.body,
+                )
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgressException
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            await session.execute(
+                update(idempotency_key_table)
+                .where(idempotency_key_table.c.key == key)
+                .values(
+                    status_code=response.status_code,
+                    headers=json.dumps(response.headers),
+                    body=response.body,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+                )
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            await session.execute(delete(idempotency_key_table).where(idempotency_key_table.c.key == key))
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        async with self.session_factory()() as session:
+            result = await session.execute(
+                delete(idempotency_key_table).where(idempotency_key_table.c.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from shared_kernel.domain.entity import AggregateRoot
+from shared_kernel.infra.database.orm import outbox_event_table
+
+logger = logging.getLogger(__name__)
+
+
+async def save_events(session: AsyncSession, aggregates: Iterable[AggregateRoot]) -> int:
+    """
+    Move the aggregates' pending events into the outbox, inside the caller's transaction.
+    """
+    rows = [
+        {
+            "event_type": event.event_type,
+            "payload": json.dumps(event.to_payload()),
+            "occurred_at": event.occurred_at,
+            "next_attempt_at": event.occurred_at,
+        }
+        for aggregate in aggregates
+        for event in aggregate.pull_events()
+    ]
+    if rows:
+        await session.execute(insert(outbox_event_table), rows)
+    return len(rows)
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    id: int
+    event_type: str
+    payload: Dict[str, Any]
+    occurred_at: datetime
+    attempts: int
+
+
+OutboxHandler = Callable[[OutboxMessage], Awaitable[None]]
+
+
+class OutboxDispatcher:
+    """
+    Delivers outbox events to the handlers registered for their type, oldest first, `batch_size` at a time.
+
+    A batch is claimed in a short transaction (SKIP LOCKED, so several workers share the work) by pushing
+    its `next_attempt_at` back by `lease` seconds, and delivered outside of it. Delivered events are deleted.
+    An event whose handler raised is retried after an exponential backoff, and one whose dispatcher died
+    mid-batch once the lease runs out. Delivery is therefore at least once: handlers must be idempotent.
+    """
+
+    # claiming writes, so on SQLite take the write lock at BEGIN like RDBUnitOfWork does
+    EXECUTION_OPTIONS = {"sqlite_begin_immediate": True}
+    THROUGHPUT_WINDOW: float = 60.0  # seconds
+
+    def __init__(
+        self,
+        session_factory: Callable[[], sessionmaker],
+        batch_size: int,
+        poll_interval: float,
+        lease: float,
+        retry_backoff: float,
+        max_retry_backoff: float,
+    ):
+        # a getter, so the engine is only created when the dispatcher first runs
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._handlers: Dict[str, List[OutboxHandler]] = defaultdict(list)
+
+        self.delivered = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_lag: float | None = None  # seconds from the event to its delivery, for the last batch's newest event
+        self.max_lag: float | None = None  # the same, for the last batch's oldest event
+        self._deliveries: Deque[Tuple[float, int]] = deque()
+
+    def register(self, event_type: str, handler: OutboxHandler) -> None:
+        if handler not in self._handlers[event_type]:
+            self._handlers[event_type].append(handler)
+
+    async def _claim(self) -> List[OutboxMessage]:
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            now = datetime.utcnow()
+            rows = (
+                await session.execute(
+                    select(outbox_event_table)
+                    .where(outbox_event_table.c.next_attempt_at <= now)
+                    .order_by(outbox_event_table.c.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if rows:
+                await session.execute(
+                    update(outbox_event_table)
+                    .where(outbox_event_table.c.id.in_([row.id for row in rows]))
+                    .values(next_attempt_at=now + timedelta(seconds=self.lease))
+                )
+            await session.commit()
+        return [
+            OutboxMessage(
+                id=row.id,
+                event_type=row.event_type,
+                payload=json.loads(row.payload),
+                occurred_at=row.occurred_at,
+                attempts=row.attempts,
+            )
+            for row in rows
+        ]
+
+    async def _deliver(self, message: OutboxMessage) -> bool:
+        try:
+            for handler in self._handlers.get(message.event_type, ()):
+                await handler(message)
+        except Exception:
+            logger.exception("Handler of outbox event %s (%s) failed", message.id, message.event_type)
+            return False
+        return True
+
+    async def _settle(self, delivered: List[OutboxMessage], failed: List[OutboxMessage]) -> None:
+        async with self.session_factory()() as session:
+            await session.connection(execution_options=self.EXECUTION_OPTIONS)
+            if delivered:
+                await session.execute(
+                    delete(outbox_event_table).where(outbox_event_table.c.id.in_([message.id for message in delivered]))
+                )
+            if failed:
+                now = datetime.utcnow()
+                await session.execute(
+                    update(outbox_event_table)
+                    .where(outbox_event_table.c.id == bindparam("message_id"))
+                    .values(attempts=outbox_event_table.c.attempts + 1, next_attempt_at=bindparam("retry_at")),
+                    [
+                        {
+                            "message_id": message.id,
+                            "retry_at": now + timedelta(
+                                seconds=min(self.retry_backoff * 2 ** message.attempts, self.max_retry_backoff)
+                            ),
+                        }
+                        for message in failed
+                    ],
+                )
+            await session.commit()
+
+    async def dispatch_batch(self) -> int:
+        """
+        Deliver one batch of due events; returns how many were claimed.
+        """
+        messages: List[OutboxMessage] = await self._claim()
+        if not messages:
+            return 0
+
+        delivered, failed = [], []
+        for message in messages:
+            (delivered if await self._deliver(message) else failed).append(message)
+        await self._settle(delivered=delivered, failed=failed)
+
+        self.batches += 1
+        self.delivered += len(delivered)
+        self.failed += len(failed)
+        if delivered:
+            now = datetime.utcnow()
+            self.last_lag = (now - delivered[-1].occurred_at).total_seconds()
+            self.max_lag = max((now - message.occurred_at).total_seconds() for message in delivered)
+            self._deliveries.append((time.monotonic(), len(delivered)))
+        return len(messages)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                claimed = await self.dispatch_batch()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                claimed = 0
+            # a full batch means more are probably waiting
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def count_pending(self) -> int:
+        async with self.session_factory()() as session:
+            return (await session.execute(select(func.count()).select_from(outbox_event_table))).scalar_one()
+
+    def stats(self) -> Dict[str, Any]:
+        horizon = time.monotonic() - self.THROUGHPUT_WINDOW
+        while self._deliveries and self._deliveries[0][0] < horizon:
+            self._deliveries.popleft()
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "batches": self.batches,
+            "throughput_per_second": sum(count for _, count in self._deliveries) / self.THROUGHPUT_WINDOW,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+        }
@@ -0,0 +1,49 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+
+logger = logging.getLogger(__name__)
+
+
+class Signal:
+    """
+    In-process publish/subscribe between bounded contexts. Receivers run synchronously, in the order
+    they connected, when the publisher calls `send`; a failing receiver is logged and never reaches the sender.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._receivers: List[Callable[..., None]] = []
+
+    def connect(self, receiver: Callable[..., None]) -> Callable[..., None]:
+        if receiver not in self._receivers:
+            self._receivers.append(receiver)
+        return receiver
+
+    def disconnect(self, receiver: Callable[..., None]) -> None:
+        if receiver in self._receivers:
+            self._receivers.remove(receiver)
+
+    def send(self, **kwargs) -> None:
+        for receiver in list(self._receivers):
+            try:
+                receiver(**kwargs)
+            except Exception:
+                logger.exception("Receiver %r of signal %s failed", receiver, self.name)
+
+
+@dataclass(frozen=True, slots=True)
+class ReservationChange:
+    reservation_number: str
+    reservation_status: ReservationStatus
+    room_id: int
+    room_status: RoomStatus
+    date_in: datetime
+    date_out: datetime
+
+
+# sent by reception after a command commits: changes=List[ReservationChange]
+reservation_changed = Signal("reservation_changed")
@@ -0,0 +1,34 @@
+import hashlib
+from typing import Any
+
+from fastapi import Response
+from starlette import status
+
+
+def version_etag(*versions: Any) -> str:
+    """
+    Strong ETag from values that change whenever the representation does, e.g. row versions.
+    """
+    return '"' + "-".join(str(version) for version in versions) + '"'
+
+
+def content_etag(*parts: Any) -> str:
+    """
+    Strong ETag hashed from the data a representation is built from; `repr` must be stable across processes.
+    """
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match is compared weakly (RFC 9110 13.1.2), so a W/ prefix doesn't prevent a match
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
@@ -1,8 +1,29 @@
-from typing import Any
+from typing import Any, Dict
 
+import orjson
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 
 class BaseResponse(BaseModel):
     detail: str = Field(...)
     result: Any
+
+
+def model_fields(obj: Any) -> Dict[str, Any]:
+    # pydantic keeps a model's field values in its __dict__; orjson encodes them, and any nested model, natively
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ModelResponse(ORJSONResponse):
+    """
+    A response model rendered with orjson. Returned from a route, it also skips FastAPI's jsonable_encoder,
+    which would walk the whole model once more before the standard json module encodes it.
+    Build the model with `construct()` from data that is already valid, so it isn't validated either.
+    Models with field aliases or custom encoders would need `.dict()` instead; ours have none.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return orjson.dumps(content, default=model_fields, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,53 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+
+from display.infra.cache import RoomListingCache
+from reception.infra.cache import ReservationCache
+from shared_kernel.infra.admission import AdmissionLimiter
+from shared_kernel.infra.container import AppContainer
+from shared_kernel.infra.database.connection import get_async_engine, get_replica_set
+from shared_kernel.infra.database.pool import get_pool_stats
+from shared_kernel.infra.outbox import OutboxDispatcher
+from shared_kernel.presentation.response import BaseResponse
+
+router = APIRouter(prefix="/internal", include_in_schema=False)
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats() -> BaseResponse:
+    return BaseResponse(detail="ok", result=get_pool_stats(get_async_engine().sync_engine.pool))
+
+
+@router.get("/db-replicas")
+async def get_db_replica_stats() -> BaseResponse:
+    return BaseResponse(detail="ok", result=get_replica_set().stats())
+
+
+@router.get("/caches")
+@inject
+async def get_cache_stats(
+    reservation_cache: ReservationCache = Depends(Provide[AppContainer.reception.reservation_cache]),
+    room_listing_cache: RoomListingCache = Depends(Provide[AppContainer.display.room_listing_cache]),
+) -> BaseResponse:
+    return BaseResponse(
+        detail="ok", result={"reservation": reservation_cache.stats(), "room_listing": room_listing_cache.stats()}
+    )
+
+
+@router.get("/outbox")
+@inject
+async def get_outbox_stats(
+    outbox_dispatcher: OutboxDispatcher = Depends(Provide[AppContainer.outbox_dispatcher]),
+) -> BaseResponse:
+    return BaseResponse(
+        detail="ok", result={**outbox_dispatcher.stats(), "pending": await outbox_dispatcher.count_pending()}
+    )
+
+
+@router.get("/admission")
+@inject
+async def get_admission_stats(
+    command_admission: AdmissionLimiter = Depends(Provide[AppContainer.command_admission]),
+    query_admission: AdmissionLimiter = Depends(Provide[AppContainer.query_admission]),
+) -> BaseResponse:
+    return BaseResponse(detail="ok", result={"command": command_admission.stats(), "query": query_admission.stats()})
@@ -1,11 +1,42 @@
+import os
+import tempfile
 from datetime import datetime, date
 
+# the app under test runs on a throwaway SQLite file unless a database is configured explicitly
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'ddd-hotel-test.db')}"
+)
+
 import pytest
 from fastapi.testclient import TestClient
 from schema import And, Use
 
+from reception.domain.value_object.reservation import ReservationNumber
+from shared_kernel.infra.database.query_budget import QueryCount, count_queries
+from shared_kernel.infra.fastapi.config import settings
 from shared_kernel.infra.fastapi.main import app
 
+# the app's startup, which leases a worker id, does not run under an unentered TestClient
+ReservationNumber.configure(worker_id=0)
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(monkeypatch):
+    """
+    A use case running more statements than its `query_budget` fails the test instead of logging a warning.
+    """
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "raise")
+
+
+@pytest.fixture
+def query_count() -> QueryCount:
+    """
+    Every statement the test runs from here on, counted the way query budgets count them:
+    take `len(query_count)` before and after the part under test.
+    """
+    with count_queries() as count:
+        yield count
+
 
 @pytest.fixture
 def client():
@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared_kernel.infra.admission import AdmissionLimiter
+from shared_kernel.infra.fastapi.middleware import AdmissionControlMiddleware
+
+
+def test_saturated_reads_do_not_block_writes():
+    # given
+    command_limiter = AdmissionLimiter(max_concurrency=1, max_queue=0, queue_timeout=1)
+    query_limiter = AdmissionLimiter(max_concurrency=1, max_queue=0, queue_timeout=1)
+    app = FastAPI()
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        command_limiter=command_limiter,
+        query_limiter=query_limiter,
+        path_prefixes=("/reception",),
+        retry_after=3,
+    )
+
+    @app.get("/reception/reservations")
+    async def read():
+        return {}
+
+    @app.post("/reception/reservations")
+    async def write():
+        return {}
+
+    @app.get("/")
+    async def health_check():
+        return {}
+
+    client = TestClient(app)
+
+    # when: a slow read holds the only query slot
+    asyncio.run(query_limiter.acquire())
+    rejected = client.get("/reception/reservations")
+    write_response = client.post("/reception/reservations")
+    health = client.get("/")
+
+    # then
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "3"
+    assert write_response.status_code == 200
+    assert health.status_code == 200
+    assert query_limiter.rejected_queue_full == 1
+    assert command_limiter.admitted == 1
+    assert command_limiter.active == 0
@@ -1,23 +1,29 @@
+import json
+from datetime import datetime
+
 from schema import Schema, Or
 
-from display.domain.entity.room import Room
+from display.application.use_case.query import RoomPage
+from display.infra.repository import RoomRow
 from shared_kernel.domain.value_object import RoomStatus
 
 
 def test_get_rooms(client, mocker):
     # given
-    room_available = Room(number="A", room_status=RoomStatus.AVAILABLE, image_url="img1")
-    room_available.id = 1  # Assume that it is allocated from db
+    room_available = RoomRow(id=1, number="A", status=RoomStatus.AVAILABLE.value, image_url="img1", description=None)
 
-    display_query = mocker.MagicMock()
-    display_query.get_rooms.return_value = [room_available]
+    display_query = mocker.AsyncMock()
+    display_query.get_rooms.return_value = RoomPage(rooms=[room_available], next_cursor=1)
 
     with client.app.container.display.query.override(display_query):
         # when
-        response = client.get("/display/rooms", params={"status": RoomStatus.AVAILABLE})
+        response = client.get("/display/rooms", params={"status": RoomStatus.AVAILABLE, "limit": 1})
+        invalid_response = client.get("/display/rooms", params={"status": RoomStatus.AVAILABLE, "limit": 0})
+        # bookings are reservation dates, not a room status
+        reserved_response = client.get("/display/rooms", params={"status": "RESERVED"})
 
         # then
-        display_query.get_rooms.assert_called_once_with(room_status=RoomStatus.AVAILABLE)
+        display_query.get_rooms.assert_called_once_with(room_status=RoomStatus.AVAILABLE, limit=1, cursor=None)
 
         schema = Schema(
             {
@@ -30,8 +36,84 @@ def test_get_rooms(client, mocker):
                         "image_url": "img1",
                         "description": Or(str, None),
                     }
-                ]
+                ],
+                "next_cursor": 1,
             }
         )
 
         assert schema.is_valid(response.json())
+        assert invalid_response.status_code == 422
+        assert reserved_response.status_code == 422
+
+
+def test_get_rooms_is_revalidated_by_etag(client, mocker):
+    # given
+    room = RoomRow(id=1, number="A", status=RoomStatus.AVAILABLE.value, image_url="img1", description=None)
+
+    display_query = mocker.AsyncMock()
+    display_query.get_rooms.return_value = RoomPage(rooms=[room], next_cursor=None)
+
+    with client.app.container.display.query.override(display_query):
+        # when
+        params = {"status": RoomStatus.AVAILABLE}
+        response = client.get("/display/rooms", params=params)
+        etag = response.headers["ETag"]
+        revalidated = client.get("/display/rooms", params=params, headers={"If-None-Match": f"W/{etag}"})
+        display_query.get_rooms.return_value = RoomPage(rooms=[room._replace(description="sea view")], next_cursor=None)
+        changed = client.get("/display/rooms", params=params, headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_get_available_rooms(client, mocker):
+    # given
+    room_available = RoomRow(id=1, number="A", status=RoomStatus.AVAILABLE.value, image_url="img1", description=None)
+
+    display_query = mocker.AsyncMock()
+    display_query.get_available_rooms.return_value = [room_available]
+
+    with client.app.container.display.query.override(display_query):
+        # when
+        response = client.get(
+            "/display/rooms/available", params={"date_in": "2023-04-01T00:00:00", "date_out": "2023-04-03T00:00:00"}
+        )
+        invalid_response = client.get(
+            "/display/rooms/available", params={"date_in": "2023-04-03T00:00:00", "date_out": "2023-04-01T00:00:00"}
+        )
+
+        # then
+        display_query.get_available_rooms.assert_called_once_with(
+            date_in=datetime(2023, 4, 1), date_out=datetime(2023, 4, 3)
+        )
+        assert [room["number"] for room in response.json()["result"]] == ["A"]
+        assert invalid_response.status_code == 422
+
+
+def test_export_rooms(client, mocker):
+    # given
+    rooms = [
+        RoomRow(id=i, number=f"R-{i}", status=RoomStatus.AVAILABLE.value, image_url="img", description=None)
+        for i in range(1, 4)
+    ]
+
+    async def stream_rooms(room_status, batch_size):
+        yield rooms[:2]
+        yield rooms[2:]
+
+    display_query = mocker.Mock()
+    display_query.stream_rooms = stream_rooms
+
+    with client.app.container.display.query.override(display_query):
+        # when
+        response = client.get("/display/rooms/export", params={"status": RoomStatus.AVAILABLE})
+
+        # then
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["number"] for line in response.text.splitlines()] == ["R-1", "R-2", "R-3"]
@@ -0,0 +1,91 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from shared_kernel.infra.fastapi.middleware import IdempotencyMiddleware
+from shared_kernel.infra.idempotency import InMemoryIdempotencyStore
+
+
+def build_client(client_header: str | None = None) -> tuple[TestClient, list]:
+    app = FastAPI()
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=InMemoryIdempotencyStore(ttl=60, lock_timeout=1, max_keys=100),
+        path_prefixes=("/reception",),
+        client_header=client_header,
+    )
+    calls = []
+
+    @app.post("/reception/reservations", status_code=201)
+    async def post_reservation(body: dict):
+        calls.append(body)
+        return {"call": len(calls)}
+
+    @app.post("/reception/failing")
+    async def post_failing():
+        calls.append(None)
+        raise HTTPException(status_code=503)
+
+    return TestClient(app), calls
+
+
+def test_retry_with_same_key_is_replayed():
+    # given
+    client, calls = build_client()
+    headers = {"Idempotency-Key": "key-1"}
+
+    # when
+    first = client.post("/reception/reservations", json={"room_number": "ROOM-A"}, headers=headers)
+    retry = client.post("/reception/reservations", json={"room_number": "ROOM-A"}, headers=headers)
+    other = client.post("/reception/reservations", json={"room_number": "ROOM-A"}, headers={"Idempotency-Key": "key-2"})
+
+    # then
+    assert len(calls) == 2
+    assert (first.status_code, first.json()) == (201, {"call": 1})
+    assert (retry.status_code, retry.json()) == (201, {"call": 1})
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert other.json() == {"call": 2}
+
+
+def test_key_reused_for_different_request_is_rejected():
+    # given
+    client, calls = build_client()
+    headers = {"Idempotency-Key": "key-1"}
+    client.post("/reception/reservations", json={"room_number": "ROOM-A"}, headers=headers)
+
+    # when
+    response = client.post("/reception/reservations", json={"room_number": "ROOM-B"}, headers=headers)
+
+    # then
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+
+def test_server_error_is_not_replayed():
+    # given
+    client, calls = build_client()
+    headers = {"Idempotency-Key": "key-1"}
+
+    # when
+    client.post("/reception/failing", headers=headers)
+    client.post("/reception/failing", headers=headers)
+
+    # then
+    assert len(calls) == 2
+
+
+def test_keys_are_scoped_by_the_client_header_behind_a_proxy():
+    # given: every request comes from the proxy's address
+    client, calls = build_client(client_header="X-Client-Id")
+
+    def post(client_id: str | None):
+        headers = {"Idempotency-Key": "key-1"} | ({"X-Client-Id": client_id} if client_id else {})
+        return client.post("/reception/reservations", json={"room_number": "ROOM-A"}, headers=headers)
+
+    # when
+    first, retry, other_client, anonymous = post("client-1"), post("client-1"), post("client-2"), post(None)
+
+    # then
+    assert [response.json() for response in (first, retry, other_client)] == [{"call": 1}, {"call": 1}, {"call": 2}]
+    assert "idempotent-replayed" not in other_client.headers
+    assert anonymous.status_code == 400
+    assert len(calls) == 2
@@ -0,0 +1,48 @@
+from schema import Schema
+
+
+def test_get_db_pool_stats(client):
+    # when
+    response = client.get("/internal/db-pool")
+
+    # then
+    schema = Schema(
+        {
+            "detail": "ok",
+            "result": {
+                "size": int,
+                "checked_out": int,
+                "idle": int,
+                "overflow": int,
+                "checkouts": int,
+                "wait_time_total": float,
+                "wait_time_avg": float,
+                "wait_time_max": float,
+            }
+        }
+    )
+    assert response.status_code == 200
+    assert schema.is_valid(response.json())
+
+
+def test_get_admission_stats(client):
+    # when
+    response = client.get("/internal/admission")
+
+    # then
+    limiter_schema = {
+        "max_concurrency": int,
+        "max_queue": int,
+        "queue_timeout": float,
+        "active": int,
+        "queue_depth": int,
+        "max_queue_depth": int,
+        "admitted": int,
+        "queued": int,
+        "rejected_queue_full": int,
+        "rejected_timeout": int,
+    }
+    assert response.status_code == 200
+    assert Schema({"detail": "ok", "result": {"command": limiter_schema, "query": limiter_schema}}).is_valid(
+        response.json()
+    )
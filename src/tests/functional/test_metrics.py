@@ -0,0 +1,26 @@
+from reception.domain.exception.reservation import ReservationNotFoundException
+
+
+def test_requests_are_measured_by_route_template(client, mocker):
+    # given
+    reservation_query = mocker.AsyncMock()
+    reservation_query.get_reservation.side_effect = ReservationNotFoundException
+    with client.app.container.reception.reservation_query.override(reservation_query):
+        client.get("/reception/reservations/RESERVATION-A")
+        client.get("/reception/reservations/RESERVATION-B")
+
+    # when
+    response = client.get("/metrics")
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/reception/reservations/{reservation_number}",'
+        'status="404"}'
+    ) in body
+    assert "RESERVATION-A" not in body
+    assert "# TYPE db_query_duration_seconds histogram" in body
+    assert "# TYPE reservation_events_total counter" in body
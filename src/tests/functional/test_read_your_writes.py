@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared_kernel.infra.database.replica import read_from_primary
+from shared_kernel.infra.fastapi.middleware import ReadYourWritesMiddleware
+
+
+def test_reads_after_write_go_to_primary():
+    # given
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    @app.get("/read")
+    async def read():
+        return {"primary": read_from_primary.get()}
+
+    @app.post("/write")
+    async def write():
+        return {}
+
+    client = TestClient(app)
+
+    # when
+    before_write = client.get("/read").json()
+    client.post("/write")
+    after_write = client.get("/read").json()
+
+    # then
+    assert before_write == {"primary": False}
+    assert after_write == {"primary": True}
@@ -4,8 +4,11 @@ from schema import Schema
 
 from reception.domain.entity.reservation import Reservation
 from reception.domain.entity.room import Room
+from reception.domain.exception.room import RoomBlockUnavailableException, RoomNotFoundException, RoomStatusException
 from reception.domain.value_object.guest import Guest
 from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.cache import ReservationSnapshot, RoomSnapshot
+from shared_kernel.domain.exception import ConcurrentUpdateException
 from shared_kernel.domain.value_object import RoomStatus, ReservationStatus
 
 
@@ -30,7 +33,7 @@ def test_create_reservation(client, mocker):
         ),
     )
 
-    reservation_cmd = mocker.MagicMock()
+    reservation_cmd = mocker.AsyncMock()
     reservation_cmd.make_reservation.return_value = new_reservation
     with client.app.container.reception.reservation_command.override(reservation_cmd):
         # when
@@ -69,6 +72,69 @@ def test_create_reservation(client, mocker):
         assert schema.validate(response.json())
 
 
+def test_create_reservations_batch(client, mocker):
+    # given
+    new_reservation = Reservation(
+        room=Room(number="ROOM-A", room_status=RoomStatus.AVAILABLE),
+        reservation_number=ReservationNumber.generate(),
+        reservation_status=ReservationStatus.IN_PROGRESS,
+        date_in=datetime(2023, 4, 1),
+        date_out=datetime(2023, 4, 2),
+        guest=Guest(mobile="+82-10-1111-2222"),
+    )
+
+    reservation_cmd = mocker.AsyncMock()
+    reservation_cmd.make_reservations.return_value = [
+        new_reservation, RoomNotFoundException(), RoomStatusException()
+    ]
+    with client.app.container.reception.reservation_command.override(reservation_cmd):
+        # when
+        response = client.post(
+            "/reception/reservations/batch",
+            json={
+                "reservations": [
+                    {
+                        "room_number": room_number,
+                        "date_in": "2023-04-01T00:00:00",
+                        "date_out": "2023-04-02T00:00:00",
+                        "guest_mobile": "+82-10-1111-2222",
+                    }
+                    for room_number in ("ROOM-A", "ROOM-X", "ROOM-A")
+                ]
+            }
+        )
+
+        # then
+        assert response.status_code == 200
+        assert [item["status_code"] for item in response.json()["result"]] == [201, 404, 409]
+        assert response.json()["result"][0]["result"]["reservation_number"] == new_reservation.reservation_number.value
+        assert response.json()["result"][1] == {
+            "status_code": 404, "detail": RoomNotFoundException.message, "result": None
+        }
+
+
+def test_create_room_block_unavailable(client, mocker):
+    # given
+    reservation_cmd = mocker.AsyncMock()
+    reservation_cmd.allocate_room_block.side_effect = RoomBlockUnavailableException
+
+    with client.app.container.reception.reservation_command.override(reservation_cmd):
+        # when
+        response = client.post(
+            "/reception/room-blocks",
+            json={
+                "room_count": 3,
+                "date_in": "2023-04-01T00:00:00",
+                "date_out": "2023-04-02T00:00:00",
+                "guest_mobile": "+82-10-1111-2222",
+            }
+        )
+
+        # then
+        assert response.status_code == 409
+        assert response.json() == {"detail": RoomBlockUnavailableException.message}
+
+
 # get reservation
 
 # update guest info
@@ -77,4 +143,53 @@ def test_create_reservation(client, mocker):
 
 # check out
 
-# cancel
\ No newline at end of file
+# cancel
+
+
+def test_cancel_reservation_conflict(client, mocker):
+    # given
+    reservation_cmd = mocker.AsyncMock()
+    reservation_cmd.cancel.side_effect = ConcurrentUpdateException
+
+    with client.app.container.reception.reservation_command.override(reservation_cmd):
+        # when
+        response = client.post("/reception/reservations/221105091627:ABCDEFG/cancel")
+
+        # then
+        assert response.status_code == 409
+        assert response.json() == {"detail": ConcurrentUpdateException.message}
+
+
+def test_get_reservation_is_revalidated_by_etag(client, mocker):
+    # given
+    snapshot = ReservationSnapshot(
+        room=RoomSnapshot(number="ROOM-A", room_status=RoomStatus.AVAILABLE),
+        reservation_number=ReservationNumber.from_value(value="RESERVATION-A"),
+        reservation_status=ReservationStatus.IN_PROGRESS,
+        date_in=datetime(2023, 4, 1),
+        date_out=datetime(2023, 4, 2),
+        guest=Guest(mobile="+82-10-1111-2222", name="Guido"),
+        version=(2, 5),
+    )
+
+    reservation_query = mocker.AsyncMock()
+    reservation_query.get_reservation.return_value = snapshot
+    with client.app.container.reception.reservation_query.override(reservation_query):
+        # when
+        response = client.get("/reception/reservations/RESERVATION-A")
+        etag = response.headers["ETag"]
+        revalidated = client.get("/reception/reservations/RESERVATION-A", headers={"If-None-Match": f'"x", {etag}'})
+        reservation_query.get_reservation.return_value = ReservationSnapshot(
+            **{**{field: getattr(snapshot, field) for field in ReservationSnapshot.__slots__}, "version": (3, 5)}
+        )
+        changed = client.get("/reception/reservations/RESERVATION-A", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["result"]["reservation_number"] == "RESERVATION-A"
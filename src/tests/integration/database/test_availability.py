@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from display.infra.availability import AvailabilityEngine
+from display.infra.repository import RoomRDBRepository
+from reception.domain.exception.room import RoomNotAvailableException
+from reception.presentation.rest.request import CreateReservationRequest
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.orm import reservation_table, room_table
+from shared_kernel.infra.signal import ReservationChange, reservation_changed
+
+
+def test_reservations_only_block_their_own_dates(database, reservation_request):
+    # given
+    command = database.command()
+
+    def stay(day_in: int, day_out: int) -> CreateReservationRequest:
+        return reservation_request.copy(
+            update={"date_in": datetime(2023, 4, day_in), "date_out": datetime(2023, 4, day_out)}
+        )
+
+    async def reserve():
+        await command.make_reservation(request=stay(10, 12))
+        await command.make_reservation(request=stay(1, 2))
+        back_to_back = await command.make_reservation(request=stay(2, 3))
+        with pytest.raises(RoomNotAvailableException):
+            await command.make_reservation(request=stay(11, 13))
+
+        await command.cancel(reservation_number=back_to_back.reservation_number.value)
+        return await command.make_reservation(request=stay(2, 4))
+
+    # when
+    rebooked = database.run(reserve())
+
+    # then
+    assert rebooked.reservation_status == ReservationStatus.IN_PROGRESS
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(room_table.c.status)).scalar_one() == RoomStatus.AVAILABLE
+        assert conn.execute(
+            select(func.count()).where(reservation_table.c.status == ReservationStatus.IN_PROGRESS.value)
+        ).scalar_one() == 3
+
+
+def test_get_available_rooms_excludes_overlapping_stays(database):
+    # given
+    database.insert(
+        room_table,
+        [{"id": i, "number": f"ROOM-{i}", "status": "AVAILABLE", "image_url": "image_url"} for i in range(1, 5)],
+    )
+    database.insert(
+        reservation_table,
+        [
+            {
+                "room_id": room_id,
+                "number": f"R-{room_id}",
+                "status": status,
+                "date_in": datetime(2023, 4, day_in),
+                "date_out": datetime(2023, 4, day_out),
+                "guest_mobile": "+82-10-1111-2222",
+            }
+            for room_id, status, day_in, day_out in [
+                (1, ReservationStatus.IN_PROGRESS.value, 1, 3),  # overlaps
+                (2, ReservationStatus.IN_PROGRESS.value, 3, 5),  # starts on check-out day
+                (3, ReservationStatus.CANCELLED.value, 1, 3),  # cancelled
+                (4, ReservationStatus.IN_PROGRESS.value, 2, 10),  # overlaps
+            ]
+        ],
+    )
+
+    async def get_available_rooms():
+        async with database.db_session() as session:
+            return await RoomRDBRepository.get_available_rooms(
+                session=session, date_in=datetime(2023, 4, 2), date_out=datetime(2023, 4, 3)
+            )
+
+    # when
+    rooms = database.run(get_available_rooms())
+
+    # then
+    assert [room.number for room in rooms] == ["ROOM-2", "ROOM-3"]
+
+
+def test_availability_engine_matches_sql_and_follows_signal(database):
+    # given
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    database.insert(
+        room_table,
+        [{"id": i, "number": f"ROOM-{i}", "status": "AVAILABLE", "image_url": "image_url"} for i in range(1, 21)],
+    )
+    database.insert(
+        reservation_table,
+        [
+            {
+                "room_id": i,
+                "number": f"R-{i}",
+                "status": ReservationStatus.IN_PROGRESS.value,
+                "date_in": today + timedelta(days=i % 7),
+                "date_out": today + timedelta(days=i % 7 + i % 3 + 1),
+                "guest_mobile": "+82-10-1111-2222",
+            }
+            for i in range(1, 21, 2)
+        ],
+    )
+    availability_engine = AvailabilityEngine(
+        room_repo=RoomRDBRepository(), db_session=database.db_session, nights=30
+    )
+    windows = [
+        (today + timedelta(days=day), today + timedelta(days=day + length)) for day in range(8) for length in (1, 3)
+    ]
+
+    async def compare():
+        index = await availability_engine.rebuild()
+        async with database.db_session() as session:
+            from_sql = [
+                [room.id for room in await RoomRDBRepository.get_available_rooms(session, date_in, date_out)]
+                for date_in, date_out in windows
+            ]
+        return from_sql, [index.free_room_ids(date_in, date_out) for date_in, date_out in windows]
+
+    # when
+    from_sql, from_index = database.run(compare())
+    reservation_changed.connect(availability_engine.apply)
+    try:
+        reservation_changed.send(
+            changes=[
+                ReservationChange(
+                    reservation_number="R-1",
+                    reservation_status=ReservationStatus.CANCELLED,
+                    room_id=1,
+                    room_status=RoomStatus.AVAILABLE,
+                    date_in=today + timedelta(days=1),
+                    date_out=today + timedelta(days=3),
+                )
+            ]
+        )
+    finally:
+        reservation_changed.disconnect(availability_engine.apply)
+
+    # then
+    assert from_index == from_sql
+    assert 1 in availability_engine.index.free_room_ids(today + timedelta(days=1), today + timedelta(days=3))
+
+
+def test_stays_and_searches_at_a_time_of_day_match_sql(database, room_a, reservation_request):
+    # given: a stay from 14:00 to 11:00 two days later, taking part of its check-out day
+    today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    command = database.command()
+    availability_engine = AvailabilityEngine(room_repo=RoomRDBRepository(), db_session=database.db_session, nights=30)
+    query = database.display_query(availability_engine=availability_engine)
+    stay = {"date_in": today + timedelta(days=1, hours=14), "date_out": today + timedelta(days=3, hours=11)}
+    searches = [
+        (today + timedelta(days=3, hours=10), today + timedelta(days=4)),  # SQL: before the check-out
+        (today + timedelta(days=3), today + timedelta(days=4)),  # the index: the night of the check-out
+        (today + timedelta(days=3, hours=12), today + timedelta(days=4)),  # SQL: after the check-out
+        (today + timedelta(days=4), today + timedelta(days=5)),  # the index
+    ]
+
+    async def book_and_search():
+        await availability_engine.rebuild()
+        reservation_changed.connect(availability_engine.apply)
+        try:
+            await command.make_reservation(request=reservation_request.copy(update=stay))
+        finally:
+            reservation_changed.disconnect(availability_engine.apply)
+        free = [
+            [room.number for room in await query.get_available_rooms(date_in=date_in, date_out=date_out)]
+            for date_in, date_out in searches
+        ]
+        with pytest.raises(RoomNotAvailableException):
+            date_in, date_out = searches[0]
+            await command.make_reservation(
+                request=reservation_request.copy(update={"date_in": date_in, "date_out": date_out})
+            )
+        return free
+
+    # when
+    free = database.run(book_and_search())
+
+    # then: only a search that starts after the check-out finds the room
+    assert free == [[], [], [room_a], [room_a]]
+
+
+def test_checked_in_stay_still_blocks_its_dates(database, room_a, reservation_request):
+    # given
+    today = datetime.utcnow().replace(microsecond=0)
+    stay = {"date_in": today, "date_out": today + timedelta(days=1)}
+    command = database.command()
+    availability_engine = AvailabilityEngine(
+        room_repo=RoomRDBRepository(), db_session=database.db_session, nights=30
+    )
+
+    async def book_and_check_in():
+        await availability_engine.rebuild()
+        reservation = await command.make_reservation(request=reservation_request.copy(update=stay))
+        await command.check_in(
+            reservation_number=reservation.reservation_number.value, mobile=reservation_request.guest_mobile
+        )
+        async with database.db_session() as session:
+            return await RoomRDBRepository.get_available_rooms(session, **stay)
+
+    # when
+    reservation_changed.connect(availability_engine.apply)
+    try:
+        from_sql = database.run(book_and_check_in())
+    finally:
+        reservation_changed.disconnect(availability_engine.apply)
+
+    # then
+    assert from_sql == []
+    assert availability_engine.index.free_room_ids(**stay) == []
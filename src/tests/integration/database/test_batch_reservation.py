@@ -0,0 +1,38 @@
+from sqlalchemy import event, func, select
+
+from reception.domain.entity.reservation import Reservation
+from reception.domain.exception.room import RoomNotAvailableException, RoomNotFoundException
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.orm import reservation_table, room_table
+
+
+def test_batch_reservation_isolates_bad_items(database, reservation_request):
+    # given
+    database.insert(room_table, {"number": "ROOM-B", "status": "AVAILABLE", "image_url": "image_url"})
+    command = database.command()
+    requests = [
+        reservation_request.copy(update={"room_number": room_number})
+        for room_number in ("ROOM-A", "ROOM-B", "ROOM-X", "ROOM-A")
+    ]
+    statements = []
+    event.listen(
+        database.engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0]),
+    )
+
+    # when
+    results = database.run(command.make_reservations(requests=requests))
+
+    # then
+    assert [type(result) for result in results] == [
+        Reservation, Reservation, RoomNotFoundException, RoomNotAvailableException
+    ]
+    # reservations, rooms, the read model (rows, then their rooms') and the outbox are each written with one executemany
+    assert statements == ["BEGIN", "SELECT", "SELECT", "INSERT", "UPDATE", "INSERT", "UPDATE", "INSERT"]
+
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(reservation_table)).scalar_one() == 2
+        assert conn.execute(select(room_table.c.status, room_table.c.version)).all() == [
+            (RoomStatus.AVAILABLE, 2), (RoomStatus.AVAILABLE, 2)
+        ]
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from reception.domain.exception.reservation import ReservationStatusException
+from shared_kernel.infra.database.orm import reservation_table, room_table
+
+
+def make_two_stays_and_check_in_the_first(database, command, request) -> list:
+    today = datetime.utcnow().replace(microsecond=0)
+
+    async def make_and_check_in():
+        numbers = [
+            (await command.make_reservation(request=request.copy(update=stay))).reservation_number.value
+            for stay in (
+                {"date_in": today, "date_out": today + timedelta(days=1)},
+                {"date_in": today + timedelta(days=3), "date_out": today + timedelta(days=4)},
+            )
+        ]
+        await command.check_in(reservation_number=numbers[0], mobile=request.guest_mobile)
+        return numbers
+
+    return database.run(make_and_check_in())
+
+
+def stored_statuses(database) -> tuple:
+    with database.sync_engine.connect() as conn:
+        room_status = conn.execute(select(room_table.c.status)).scalar_one()
+        statuses = conn.execute(select(reservation_table.c.status).order_by(reservation_table.c.date_in)).scalars()
+        return room_status, list(statuses)
+
+
+def test_only_the_checked_in_reservation_checks_out(database, room_a, reservation_request):
+    # given: the room's guest checked in on the first of its two stays
+    command = database.command()
+    checked_in, booked = make_two_stays_and_check_in_the_first(database, command, reservation_request)
+
+    # when / then: the other stay cannot free the room under the guest
+    with pytest.raises(ReservationStatusException):
+        database.run(command.check_out(reservation_number=booked))
+    assert stored_statuses(database) == ("OCCUPIED", ["CHECKED-IN", "IN-PROGRESS"])
+
+    database.run(command.check_out(reservation_number=checked_in))
+    assert stored_statuses(database) == ("AVAILABLE", ["COMPLETE", "IN-PROGRESS"])
+
+
+def test_checked_in_reservation_is_not_cancelled(database, room_a, reservation_request):
+    # given
+    command = database.command()
+    checked_in, _ = make_two_stays_and_check_in_the_first(database, command, reservation_request)
+
+    # when / then: cancelling would leave the room occupied with nobody to check out
+    with pytest.raises(ReservationStatusException):
+        database.run(command.cancel(reservation_number=checked_in))
+    assert stored_statuses(database) == ("OCCUPIED", ["CHECKED-IN", "IN-PROGRESS"])
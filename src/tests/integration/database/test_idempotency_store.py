@@ -0,0 +1,76 @@
+import asyncio
+
+from shared_kernel.infra.idempotency import InMemoryIdempotencyStore, RDBIdempotencyStore, StoredResponse
+
+RESPONSE = StoredResponse(status_code=201, headers=[("content-type", "application/json")], body=b'{"call":1}')
+
+
+async def claim_concurrently(store, duplicates: int) -> list:
+    async def first_request():
+        assert await store.claim(key="client:key-1", fingerprint="fingerprint") is None
+        await asyncio.sleep(0.2)
+        await store.complete(key="client:key-1", response=RESPONSE)
+        return None
+
+    async def duplicate_request():
+        await asyncio.sleep(0.05)
+        return await store.claim(key="client:key-1", fingerprint="fingerprint")
+
+    return await asyncio.gather(first_request(), *(duplicate_request() for _ in range(duplicates)))
+
+
+def test_in_memory_store_makes_duplicates_wait():
+    # given
+    store = InMemoryIdempotencyStore(ttl=60, lock_timeout=5, max_keys=100)
+
+    # when
+    results = asyncio.run(claim_concurrently(store, duplicates=3))
+
+    # then
+    assert results == [None, RESPONSE, RESPONSE, RESPONSE]
+
+
+def test_rdb_store_makes_duplicates_wait(database):
+    # given
+    store = RDBIdempotencyStore(ttl=60, lock_timeout=5, session_factory=lambda: database.session_factory)
+
+    # when
+    results = database.run(claim_concurrently(store, duplicates=3))
+
+    # then
+    assert results == [None, RESPONSE, RESPONSE, RESPONSE]
+
+
+def test_rdb_store_claims_a_new_key_once_when_duplicates_arrive_together(database, query_count):
+    # given
+    store = RDBIdempotencyStore(ttl=60, lock_timeout=5, session_factory=lambda: database.session_factory)
+
+    async def claim_and_complete():
+        if (response := await store.claim(key="client:key-1", fingerprint="fingerprint")) is None:
+            await asyncio.sleep(0.1)
+            await store.complete(key="client:key-1", response=RESPONSE)
+        return response
+
+    async def claim_together():
+        return await asyncio.gather(claim_and_complete(), claim_and_complete())
+
+    # when: both claims start before either has written the key
+    results = database.run(claim_together())
+
+    # then: the claim inserts before it reads, so no duplicate locks a key that isn't there yet
+    assert sorted(results, key=bool) == [None, RESPONSE]
+    assert query_count.statements[0].startswith("INSERT OR IGNORE INTO idempotency_key")
+    assert not any("FOR UPDATE" in statement for statement in query_count.statements)
+
+
+def test_rdb_store_takes_over_an_expired_claim(database):
+    # given: an owner that crashed before completing its claim
+    store = RDBIdempotencyStore(ttl=60, lock_timeout=0.1, session_factory=lambda: database.session_factory)
+
+    async def claim_after_the_owner_crashed():
+        await store.claim(key="client:key-1", fingerprint="fingerprint")
+        await asyncio.sleep(0.2)
+        return await store.claim(key="client:key-1", fingerprint="fingerprint")
+
+    # when / then
+    assert database.run(claim_after_the_owner_crashed()) is None
@@ -0,0 +1,42 @@
+import logging
+
+import pytest
+
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.metrics import db_query_duration, reservation_events
+
+
+@pytest.fixture
+def every_statement_is_slow(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD", 1e-9)
+
+
+@pytest.fixture
+def database(every_statement_is_slow, database):
+    # the engine reads the threshold when it is created
+    return database
+
+
+def test_statements_are_timed_by_repository_method(database, reservation_request, caplog):
+    # given
+    command = database.command()
+    operations = (
+        "ReservationRDBRepository.get_room_by_room_number",
+        "ReservationRDBRepository.get_booked_stays",
+        "ReservationRDBRepository.bulk_add",
+    )
+    before = {operation: db_query_duration.count(operation) for operation in operations}
+    made_before = reservation_events.value("made")
+
+    # when
+    with caplog.at_level(logging.WARNING, logger="shared_kernel.infra.database.slow_query"):
+        database.run(command.make_reservation(request=reservation_request))
+
+    # then
+    assert all(db_query_duration.count(operation) > before[operation] for operation in operations)
+    assert reservation_events.value("made") == made_before + 1
+    slow_inserts = [record.message for record in caplog.records if "INSERT INTO room_reservation " in record.message]
+    assert slow_inserts
+    # parameter names only: the guest's details stay out of the log
+    assert all(reservation_request.guest_mobile not in message for message in slow_inserts)
+    assert all("in ReservationRDBRepository.bulk_add" in message for message in slow_inserts)
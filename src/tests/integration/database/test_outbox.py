@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from reception.domain.entity.reservation import Reservation
+from reception.domain.entity.room import Room
+from reception.domain.value_object.guest import Guest
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.database.orm import outbox_event_table
+from shared_kernel.infra.outbox import OutboxDispatcher, OutboxMessage, save_events
+
+
+def make_reservations(count: int):
+    return [
+        Reservation.make(
+            room=Room(number=f"ROOM-{i}", room_status=RoomStatus.AVAILABLE),
+            date_in=datetime(2023, 4, 1),
+            date_out=datetime(2023, 4, 2),
+            guest=Guest(mobile="+82-10-1111-2222"),
+        )
+        for i in range(count)
+    ]
+
+
+def build_dispatcher(database, **kwargs) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        session_factory=lambda: database.session_factory,
+        **{"batch_size": 2, "poll_interval": 0, "lease": 30, "retry_backoff": 0, "max_retry_backoff": 0, **kwargs},
+    )
+
+
+async def pending(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(outbox_event_table))).scalar_one()
+
+
+def test_failed_delivery_is_retried(database):
+    # given
+    dispatcher = build_dispatcher(database)
+    received, failures = [], [True]
+
+    async def flaky_handler(message: OutboxMessage):
+        if message.payload["room_number"] == "ROOM-1" and failures:
+            failures.pop()
+            raise RuntimeError("channel manager is down")
+        received.append((message.payload["room_number"], message.attempts))
+
+    dispatcher.register("ReservationMade", flaky_handler)
+
+    async def dispatch():
+        async with database.db_session() as session:
+            await save_events(session=session, aggregates=make_reservations(3))
+            await session.commit()
+        claimed = [await dispatcher.dispatch_batch() for _ in range(3)]
+        return claimed, await pending(database.session_factory)
+
+    # when
+    claimed, left = database.run(dispatch())
+
+    # then
+    assert claimed == [2, 2, 0]
+    assert received == [("ROOM-0", 0), ("ROOM-1", 1), ("ROOM-2", 0)]
+    assert left == 0
+    assert dispatcher.stats() | {"throughput_per_second": 0, "last_lag_seconds": 0, "max_lag_seconds": 0} == {
+        "delivered": 3,
+        "failed": 1,
+        "batches": 2,
+        "throughput_per_second": 0,
+        "last_lag_seconds": 0,
+        "max_lag_seconds": 0,
+    }
+    assert dispatcher.stats()["max_lag_seconds"] >= dispatcher.stats()["last_lag_seconds"] >= 0
+
+
+def test_batch_of_a_dead_dispatcher_is_delivered_after_its_lease(database):
+    # given
+    dispatcher = build_dispatcher(database, lease=0)
+    received = []
+
+    async def handler(message: OutboxMessage):
+        received.append(message.id)
+
+    dispatcher.register("ReservationMade", handler)
+
+    async def crash_and_recover():
+        async with database.db_session() as session:
+            await save_events(session=session, aggregates=make_reservations(2))
+            await session.commit()
+        await dispatcher._claim()  # claimed, then the process died before delivering
+        return await dispatcher.dispatch_batch()
+
+    # when
+    claimed = database.run(crash_and_recover())
+
+    # then
+    assert claimed == 2
+    assert received == [1, 2]
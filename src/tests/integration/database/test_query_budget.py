@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from display.infra.availability import AvailabilityEngine
+from display.infra.repository import RoomRDBRepository
+from reception.presentation.rest.request import CreateRoomBlockRequest, UpdateGuestRequest
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.orm import room_table
+from shared_kernel.infra.database.query_budget import QueryBudgetExceededError, query_budget
+from shared_kernel.infra.fastapi.config import settings
+from shared_kernel.infra.metrics import query_budget_exceeded
+
+
+@pytest.fixture
+def rooms(database, room_a):
+    database.insert(
+        room_table,
+        [
+            {"number": f"ROOM-{name}", "status": RoomStatus.AVAILABLE.value, "image_url": "image_url"}
+            for name in "BCDEF"
+        ],
+    )
+
+
+def test_use_cases_stay_within_their_query_budgets(database, rooms, reservation_request, query_count):
+    # given
+    command = database.command()
+    reservation_query = database.reservation_query()
+    display_query = database.display_query()
+    availability_engine = AvailabilityEngine(room_repo=RoomRDBRepository(), db_session=database.db_session, nights=30)
+    indexed_display_query = database.display_query(availability_engine=availability_engine)
+    now = datetime.utcnow().replace(microsecond=0)
+    stay = {"date_in": now, "date_out": now + timedelta(days=2)}
+
+    async def run_every_use_case():
+        before = len(query_count)
+        made = await command.make_reservation(request=reservation_request.copy(update=stay))
+        single = len(query_count) - before
+        batch = await command.make_reservations(
+            requests=[reservation_request.copy(update={"room_number": f"ROOM-{name}", **stay}) for name in "BCD"]
+        )
+        batched = len(query_count) - before - single
+        block = await command.allocate_room_block(
+            request=CreateRoomBlockRequest(room_count=2, guest_mobile="+82-10-3333-4444", guest_name="Tim", **stay)
+        )
+        number = made.reservation_number.value
+        await command.update_guest_info(
+            reservation_number=number,
+            request=UpdateGuestRequest(guest_mobile="+82-10-3333-4444", guest_name="Tim"),
+        )
+        await command.check_in(reservation_number=number, mobile="+82-10-3333-4444")
+        await command.check_out(reservation_number=number)
+        await command.cancel(reservation_number=batch[0].reservation_number.value)
+
+        snapshot = await reservation_query.get_reservation(reservation_number=number)
+        await display_query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=2)
+        [rooms async for rooms in display_query.stream_rooms(room_status=RoomStatus.AVAILABLE, batch_size=1)]
+        await availability_engine.rebuild()
+        for query in (display_query, indexed_display_query):
+            await query.get_available_rooms(date_in=stay["date_in"], date_out=stay["date_out"])
+            await query.get_available_room_counts(date_in=stay["date_in"], date_out=stay["date_out"])
+        return snapshot, block, single, batched
+
+    # when
+    snapshot, block, single, batched = database.run(run_every_use_case())
+
+    # then: any use case over its budget raised QueryBudgetExceededError
+    assert snapshot.reservation_status == ReservationStatus.COMPLETE
+    assert len(block) == 2
+    # a batch runs as many statements as a single reservation, whatever its size
+    assert batched == single
+
+
+def test_exceeding_a_budget_fails_in_tests_and_warns_otherwise(database, monkeypatch, caplog):
+    # given
+    @query_budget(1)
+    async def count_rooms_twice():
+        async with database.db_session() as session:
+            await session.execute(text("SELECT count(*) FROM hotel_room"))
+            await session.execute(text("SELECT count(*) FROM hotel_room WHERE status = 'AVAILABLE'"))
+
+    exceeded_before = query_budget_exceeded.value(count_rooms_twice.__qualname__)
+
+    async def run():
+        with pytest.raises(QueryBudgetExceededError) as raised:
+            await count_rooms_twice()
+        monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "warn")
+        with caplog.at_level(logging.WARNING, logger="shared_kernel.infra.database.query_budget"):
+            await count_rooms_twice()
+        return raised.value
+
+    # when
+    error = database.run(run())
+
+    # then: both statements are listed, the driver's BEGIN is not counted
+    assert "ran 2 queries, over its budget of 1" in str(error)
+    assert "1. SELECT count(*) FROM hotel_room\n2. SELECT count(*)" in str(error)
+    assert [record.message for record in caplog.records] == [
+        f"{count_rooms_twice.__qualname__} ran 2 queries, over its budget of 1"
+    ]
+    assert query_budget_exceeded.value(count_rooms_twice.__qualname__) == exceeded_before + 2
+
+
+def test_streams_are_counted_only_while_they_run(database, rooms, query_count):
+    # given
+    @query_budget(1)
+    async def stream_room_numbers():
+        async with database.db_session() as session:
+            for row in await session.execute(text("SELECT number FROM hotel_room")):
+                yield row.number
+
+    async def consume():
+        before = len(query_count)
+        async with database.db_session() as session:
+            # the consumer's own statements between items are not the stream's
+            async for _ in stream_room_numbers():
+                await session.execute(text("SELECT 1"))
+        return len(query_count) - before
+
+    # when
+    statements = database.run(consume())
+
+    # then: every statement was counted by the enclosing count, but only the stream's one against its budget
+    assert statements == 7
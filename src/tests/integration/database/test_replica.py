@@ -0,0 +1,71 @@
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from shared_kernel.infra.database.replica import ReplicaSet
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    urls = []
+    for name in ("replica-1", "replica-2"):
+        path = tmp_path / f"{name}.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE whoami (name TEXT)")
+            conn.execute("INSERT INTO whoami VALUES (?)", (name,))
+        urls.append(f"sqlite+aiosqlite:///{path}")
+    return urls
+
+
+async def open_and_identify(replica_set: ReplicaSet) -> str | None:
+    session = await replica_set.open_session(sessionmaker(class_=AsyncSession))
+    if session is None:
+        return None
+    try:
+        return (await session.execute(text("SELECT name FROM whoami"))).scalar_one()
+    finally:
+        await session.close()
+
+
+def test_replicas_are_balanced_round_robin(replica_urls):
+    # given
+    replica_set = ReplicaSet(engines=[create_async_engine(url) for url in replica_urls], ejection_period=30)
+
+    async def open_sessions():
+        return await asyncio.gather(*(open_and_identify(replica_set) for _ in range(4)))
+
+    # when
+    served_by = asyncio.run(open_sessions())
+
+    # then
+    assert sorted(served_by) == ["replica-1", "replica-1", "replica-2", "replica-2"]
+
+
+def test_unreachable_replica_is_ejected(replica_urls, tmp_path):
+    # given
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    replica_set = ReplicaSet(engines=[unreachable, create_async_engine(replica_urls[0])], ejection_period=30)
+
+    # when
+    served_by = [asyncio.run(open_and_identify(replica_set)) for _ in range(3)]
+
+    # then
+    assert served_by == ["replica-1", "replica-1", "replica-1"]
+    assert not replica_set.is_healthy(0)
+    assert replica_set.is_healthy(1)
+
+
+def test_no_healthy_replica_falls_back(tmp_path):
+    # given
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    replica_set = ReplicaSet(engines=[unreachable], ejection_period=30)
+
+    # when
+    served_by = asyncio.run(open_and_identify(replica_set))
+
+    # then
+    assert served_by is None
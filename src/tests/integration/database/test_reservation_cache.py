@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from reception.infra.cache import ReservationCache
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+
+
+def test_reservation_cache_is_written_through_by_commands(database, reservation_request, query_count):
+    # given
+    cache = ReservationCache(max_size=10, ttl=60)
+    command = database.command(reservation_cache=cache)
+    query = database.reservation_query(reservation_cache=cache)
+
+    async def make_cancel_and_read():
+        made = await command.make_reservation(request=reservation_request)
+        number = made.reservation_number.value
+        await command.cancel(reservation_number=number)
+        # a read that raced with the cancel, e.g. from a lagging replica, doesn't undo it
+        cache.put(made)
+        before = len(query_count)
+        return await query.get_reservation(reservation_number=number), len(query_count) - before
+
+    # when
+    reservation, statements = database.run(make_cancel_and_read())
+
+    # then
+    assert reservation.reservation_status == ReservationStatus.CANCELLED
+    assert statements == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_cached_reservations_of_a_room_match_its_view_rows(database, reservation_request):
+    # given: two stays in one room, the first starting today
+    cache = ReservationCache(max_size=10, ttl=60)
+    command = database.command(reservation_cache=cache)
+    uncached = database.reservation_query()
+    today = datetime.utcnow().replace(microsecond=0)
+
+    async def cached_and_viewed(numbers):
+        # what the cache serves next to what a read after the entry expired would get
+        return [(cache.peek(number), await uncached.get_reservation(reservation_number=number)) for number in numbers]
+
+    async def make_two_and_check_in():
+        numbers = [
+            (await command.make_reservation(request=reservation_request.copy(update=stay))).reservation_number.value
+            for stay in (
+                {"date_in": today, "date_out": today + timedelta(days=1)},
+                {"date_in": today + timedelta(days=3), "date_out": today + timedelta(days=4)},
+            )
+        ]
+        made = await cached_and_viewed(numbers)
+        await command.check_in(reservation_number=numbers[0], mobile=reservation_request.guest_mobile)
+        return made, await cached_and_viewed(numbers)
+
+    # when
+    made, checked_in = database.run(make_two_and_check_in())
+
+    # then: the same room status and versions, so the same ETag, before and after the entries expire
+    assert all(cached == viewed for cached, viewed in made + checked_in)
+    assert [cached.room.room_status for cached, _ in checked_in] == [RoomStatus.OCCUPIED, RoomStatus.OCCUPIED]
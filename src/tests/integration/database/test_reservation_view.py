@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from reception.infra.repository import ReservationRDBRepository
+from reception.presentation.rest.request import UpdateGuestRequest
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.orm import reservation_view_table
+
+
+def test_reservation_view_follows_commands_and_can_be_rebuilt(database, reservation_request):
+    # given
+    command = database.command()
+    query = database.reservation_query()
+    now = datetime.utcnow()
+
+    def stay(days_in: int, days_out: int):
+        return reservation_request.copy(
+            update={"date_in": now + timedelta(days=days_in), "date_out": now + timedelta(days=days_out)}
+        )
+
+    async def run_commands_and_rebuild():
+        staying = await command.make_reservation(request=stay(0, 2))
+        later = await command.make_reservation(request=stay(5, 6))
+        cancelled = await command.make_reservation(request=stay(7, 8))
+        await command.check_in(
+            reservation_number=staying.reservation_number.value, mobile=reservation_request.guest_mobile
+        )
+        await command.update_guest_info(
+            reservation_number=later.reservation_number.value,
+            request=UpdateGuestRequest(guest_mobile="+82-10-3333-4444", guest_name="Tim"),
+        )
+        await command.cancel(reservation_number=cancelled.reservation_number.value)
+        numbers = [reservation.reservation_number.value for reservation in (staying, later, cancelled)]
+        projected = [await query.get_reservation(reservation_number=number) for number in numbers]
+
+        async with database.db_session() as session:
+            await session.execute(reservation_view_table.delete())
+            last_ids = [
+                await ReservationRDBRepository.rebuild_reservation_views(
+                    session=session, after_id=after_id, batch_size=2
+                )
+                for after_id in (0, 2, 3)
+            ]
+            await session.commit()
+        rebuilt = [await query.get_reservation(reservation_number=number) for number in numbers]
+        return projected, last_ids, rebuilt
+
+    # when
+    projected, last_ids, rebuilt = database.run(run_commands_and_rebuild())
+
+    # then
+    assert [snapshot.reservation_status for snapshot in projected] == [
+        ReservationStatus.CHECKED_IN, ReservationStatus.IN_PROGRESS, ReservationStatus.CANCELLED
+    ]
+    # the check-in's room status is shown on every reservation of the room
+    assert {snapshot.room.room_status for snapshot in projected} == {RoomStatus.OCCUPIED}
+    assert projected[1].guest.name == "Tim"
+    assert last_ids == [2, 3, None]
+    assert rebuilt == projected
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from reception.domain.entity.room import Room
+from reception.domain.exception.room import RoomBlockUnavailableException, RoomNotAvailableException
+from reception.infra.repository import ReservationRDBRepository
+from reception.presentation.rest.request import CreateRoomBlockRequest
+from shared_kernel.infra.database.orm import reservation_table, room_table
+
+
+class StaleSnapshotRepository(ReservationRDBRepository):
+    """
+    Locks rooms as if the NOT EXISTS guard had read a snapshot from before their stays were committed.
+    """
+
+    @staticmethod
+    async def get_available_rooms_for_update(session, stay, limit):
+        result = await session.execute(select(Room).order_by(Room.id).limit(limit).with_for_update(skip_locked=True))
+        return result.scalars().all()
+
+
+def test_concurrent_room_blocks_get_disjoint_rooms(database, room_a):
+    # given
+    database.insert(
+        room_table, [{"number": f"ROOM-{i}", "status": "AVAILABLE", "image_url": "image_url"} for i in range(1, 6)]
+    )
+    command = database.command()
+    request = CreateRoomBlockRequest(
+        room_count=2,
+        date_in=datetime(2023, 4, 1),
+        date_out=datetime(2023, 4, 2),
+        guest_mobile="+82-10-1111-2222",
+    )
+
+    async def allocate_concurrently():
+        return await asyncio.gather(
+            *(command.allocate_room_block(request=request) for _ in range(4)),
+            return_exceptions=True,
+        )
+
+    # when
+    results = database.run(allocate_concurrently())
+
+    # then
+    blocks = [result for result in results if isinstance(result, list)]
+    assert len(blocks) == 3
+    assert len([result for result in results if isinstance(result, RoomBlockUnavailableException)]) == 1
+
+    room_numbers = [reservation.room.number for block in blocks for reservation in block]
+    assert len(set(room_numbers)) == 6
+
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(
+            select(func.count(reservation_table.c.room_id.distinct()))
+        ).scalar_one() == 6
+
+
+def test_room_booked_after_the_candidates_were_read_is_not_double_booked(database, reservation_request):
+    # given: ROOM-A is booked, but the candidate query missed it
+    command = database.command(reservation_repo=StaleSnapshotRepository())
+    database.run(command.make_reservation(request=reservation_request))
+    request = CreateRoomBlockRequest(
+        room_count=1,
+        date_in=reservation_request.date_in,
+        date_out=reservation_request.date_out,
+        guest_mobile="+82-10-3333-4444",
+    )
+
+    # when / then: the locked room's stays are read again, and Room.reserve rejects it
+    with pytest.raises(RoomNotAvailableException):
+        database.run(command.allocate_room_block(request=request))
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(reservation_table)).scalar_one() == 1
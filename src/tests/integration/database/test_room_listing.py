@@ -0,0 +1,122 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from display.infra.cache import RoomListingCache
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.orm import room_table
+from shared_kernel.infra.signal import ReservationChange, reservation_changed
+
+
+@pytest.fixture
+def rooms(database):
+    # every third room is occupied: 1, 2, 4, 5, 7, 8 and 10 are available
+    database.insert(
+        room_table,
+        [
+            {
+                "id": i,
+                "number": f"ROOM-{i}",
+                "status": RoomStatus.OCCUPIED.value if i % 3 == 0 else RoomStatus.AVAILABLE.value,
+                "image_url": "image_url",
+            }
+            for i in range(1, 11)
+        ],
+    )
+
+
+def test_rooms_are_paged_by_id(database, rooms):
+    # given
+    query = database.display_query()
+
+    async def read_all_pages():
+        pages, cursor = [], None
+        while True:
+            page = await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3, cursor=cursor)
+            pages.append([room.id for room in page.rooms])
+            if (cursor := page.next_cursor) is None:
+                return pages
+
+    # when
+    pages = database.run(read_all_pages())
+
+    # then
+    assert pages == [[1, 2, 4], [5, 7, 8], [10]]
+
+
+def test_rooms_are_streamed_in_batches(database, rooms):
+    # given
+    query = database.display_query()
+
+    async def stream():
+        return [
+            [room.id for room in rooms]
+            async for rooms in query.stream_rooms(room_status=RoomStatus.AVAILABLE, batch_size=4)
+        ]
+
+    # when
+    batches = database.run(stream())
+
+    # then
+    assert batches == [[1, 2, 4, 5], [7, 8, 10]]
+
+
+def test_cached_listing_follows_reception_changes(database, rooms, query_count):
+    # given
+    cache = RoomListingCache(ttl=60)
+    query = database.display_query(room_listing_cache=cache)
+
+    async def read_check_in_read():
+        first = await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3)
+        second = await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3, cursor=first.next_cursor)
+        again = await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3)
+        async with database.engine.begin() as conn:
+            await conn.execute(update(room_table).where(room_table.c.id == 1).values(status=RoomStatus.OCCUPIED))
+        reservation_changed.send(
+            changes=[
+                ReservationChange(
+                    reservation_number="R-1",
+                    reservation_status=ReservationStatus.IN_PROGRESS,
+                    room_id=1,
+                    room_status=RoomStatus.OCCUPIED,
+                    date_in=datetime(2023, 4, 1),
+                    date_out=datetime(2023, 4, 2),
+                )
+            ]
+        )
+        third = await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3)
+        return [[room.id for room in page.rooms] for page in (first, second, again, third)]
+
+    # when
+    reservation_changed.connect(cache.apply)
+    try:
+        pages = database.run(read_check_in_read())
+    finally:
+        reservation_changed.disconnect(cache.apply)
+
+    # then
+    assert pages == [[1, 2, 4], [5, 7, 8], [1, 2, 4], [2, 4, 5]]
+    # a keyset page for each of the first two reads and one after the check-in; the first page, read again,
+    # is sliced from the cached listing
+    selects = [statement for statement in query_count.statements if statement.startswith("SELECT")]
+    assert len(selects) == 3
+    assert all("LIMIT" in statement for statement in selects)
+
+
+def test_zero_ttl_reads_only_keyset_pages(database, rooms, query_count):
+    # given
+    cache = RoomListingCache(ttl=0)
+    query = database.display_query(room_listing_cache=cache)
+
+    async def read_first_page_twice():
+        return [await query.get_rooms(room_status=RoomStatus.AVAILABLE, limit=3) for _ in range(2)]
+
+    # when
+    pages = database.run(read_first_page_twice())
+
+    # then: every read is one LIMITed query, and nothing is cached
+    assert [[room.id for room in page.rooms] for page in pages] == [[1, 2, 4], [1, 2, 4]]
+    assert len(query_count) == 2
+    assert all("LIMIT" in statement for statement in query_count.statements)
+    assert len(cache) == 0
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select, update
+
+from reception.domain.entity.reservation import Reservation
+from reception.domain.exception.room import RoomStatusException
+from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.repository import ReservationRDBRepository
+from shared_kernel.domain.exception import ConcurrentUpdateException
+from shared_kernel.domain.value_object import ReservationStatus
+from shared_kernel.infra.database.orm import outbox_event_table, reservation_table
+
+
+class InterleavedWriteRepository(ReservationRDBRepository):
+    """
+    Lets another writer bump the reservation's version right after each of the first `writes` loads.
+    """
+
+    def __init__(self, writes: int):
+        self.writes = writes
+
+    async def get_reservation_by_reservation_number(
+        self, session, reservation_number: ReservationNumber, for_update: bool = False
+    ) -> Reservation | None:
+        reservation = await super().get_reservation_by_reservation_number(
+            session=session, reservation_number=reservation_number, for_update=for_update
+        )
+        if self.writes:
+            self.writes -= 1
+            await session.execute(
+                update(reservation_table)
+                .where(reservation_table.c.id == reservation.id)
+                .values(version=reservation_table.c.version + 1)
+            )
+        return reservation
+
+
+def test_concurrent_reservations_do_not_double_book(database, reservation_request):
+    # given
+    command = database.command()
+
+    async def reserve_concurrently():
+        return await asyncio.gather(
+            *(command.make_reservation(request=reservation_request) for _ in range(10)),
+            return_exceptions=True,
+        )
+
+    # when
+    results = database.run(reserve_concurrently())
+
+    # then
+    assert len([result for result in results if isinstance(result, Reservation)]) == 1
+    assert len([result for result in results if isinstance(result, RoomStatusException)]) == 9
+
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(reservation_table)).scalar_one() == 1
+
+
+def test_command_runs_in_one_checkout_and_transaction(database, reservation_request):
+    # given
+    command = database.command()
+    engine = database.engine
+    statements = []
+
+    async def make_and_cancel():
+        reservation = await command.make_reservation(request=reservation_request)
+        checkouts = engine.sync_engine.pool.checkout_count
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0]),
+        )
+        await command.cancel(reservation_number=reservation.reservation_number.value)
+        return engine.sync_engine.pool.checkout_count - checkouts
+
+    # when
+    checkouts = database.run(make_and_cancel())
+
+    # then
+    assert checkouts == 1
+    # the reservation update, its read model row and its room's, then its ReservationCancelled event into the outbox
+    assert statements == ["BEGIN", "SELECT", "UPDATE", "UPDATE", "UPDATE", "INSERT"]
+
+
+def test_stale_write_is_a_conflict(database, reservation_request):
+    # given
+    command = database.command(
+        reservation_repo=InterleavedWriteRepository(writes=1), lock_rows=False, conflict_retries=0
+    )
+
+    async def make_and_cancel():
+        reservation = await command.make_reservation(request=reservation_request)
+        with pytest.raises(ConcurrentUpdateException):
+            await command.cancel(reservation_number=reservation.reservation_number.value)
+
+    # when
+    database.run(make_and_cancel())
+
+    # then
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(reservation_table.c.status)).scalar_one() == ReservationStatus.IN_PROGRESS
+
+
+def test_conflict_is_retried(database, reservation_request):
+    # given
+    command = database.command(
+        reservation_repo=InterleavedWriteRepository(writes=1), lock_rows=False, conflict_retries=1
+    )
+
+    async def make_and_cancel():
+        reservation = await command.make_reservation(request=reservation_request)
+        return await command.cancel(reservation_number=reservation.reservation_number.value)
+
+    # when
+    cancelled = database.run(make_and_cancel())
+
+    # then
+    assert cancelled.reservation_status == ReservationStatus.CANCELLED
+    with database.sync_engine.connect() as conn:
+        assert conn.execute(select(reservation_table.c.status)).scalar_one() == ReservationStatus.CANCELLED
+        # the attempt that lost its version check rolled its event back with it
+        assert conn.execute(
+            select(outbox_event_table.c.event_type).order_by(outbox_event_table.c.id)
+        ).scalars().all() == ["ReservationMade", "ReservationCancelled"]
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from reception.domain.value_object.reservation import ReservationNumber
+from reception.infra.worker_id import WorkerIdLease
+from shared_kernel.infra.database.orm import reservation_number_worker_table
+
+
+@pytest.fixture(autouse=True)
+def keep_reservation_number_configuration(monkeypatch):
+    # leases configure the process-wide generator; put the test suite's back afterwards
+    for name in ("_generator", "_generator_pid", "_valid_until"):
+        monkeypatch.setattr(ReservationNumber, name, getattr(ReservationNumber, name))
+
+
+def new_lease(database) -> WorkerIdLease:
+    return WorkerIdLease(session_factory=lambda: database.session_factory, lease=60)
+
+
+def expire(database, worker_id: int) -> None:
+    with database.sync_engine.begin() as connection:
+        connection.execute(
+            update(reservation_number_worker_table)
+            .where(reservation_number_worker_table.c.worker_id == worker_id)
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+
+
+def test_processes_starting_together_lease_distinct_worker_ids(database):
+    # given
+    leases = [new_lease(database) for _ in range(3)]
+
+    async def acquire_together():
+        return await asyncio.gather(*(lease.acquire() for lease in leases))
+
+    # when
+    worker_ids = database.run(acquire_together())
+
+    # then
+    assert sorted(worker_ids) == [0, 1, 2]
+
+
+def test_expired_worker_id_is_leased_again(database):
+    # given: a process that stopped renewing its lease
+    crashed = new_lease(database)
+    database.run(crashed.acquire())
+    expire(database, worker_id=crashed.worker_id)
+
+    # when
+    worker_id = database.run(new_lease(database).acquire())
+
+    # then
+    assert worker_id == crashed.worker_id
+
+
+def test_renewal_leases_another_worker_id_once_taken_over(database):
+    # given: a lease that ran out and went to another process
+    stalled = new_lease(database)
+    database.run(stalled.acquire())
+    expire(database, worker_id=stalled.worker_id)
+    taken_over = database.run(new_lease(database).acquire())
+
+    # when
+    database.run(stalled.renew())
+
+    # then
+    assert stalled.worker_id != taken_over
+    assert ReservationNumber._generator.worker_id == stalled.worker_id
+
+
+def test_released_worker_id_is_free_and_stops_numbers(database):
+    # given
+    lease = new_lease(database)
+    database.run(lease.acquire())
+
+    # when
+    database.run(lease.release())
+
+    # then
+    with database.sync_engine.connect() as connection:
+        assert connection.execute(select(reservation_number_worker_table)).all() == []
+    with pytest.raises(RuntimeError):
+        ReservationNumber.generate()
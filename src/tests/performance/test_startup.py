@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "2.0"))  # seconds
+
+MEASURE_IMPORT = """
+import time
+
+started = time.perf_counter()
+import shared_kernel.infra.fastapi.main
+elapsed = time.perf_counter() - started
+
+from shared_kernel.infra.database.connection import get_async_engine, get_engine
+print(elapsed, get_engine.cache_info().currsize + get_async_engine.cache_info().currsize)
+"""
+
+
+def measure_import() -> tuple[float, int]:
+    completed = subprocess.run(
+        [sys.executable, "-c", MEASURE_IMPORT], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    elapsed, engines = completed.stdout.split()
+    return float(elapsed), int(engines)
+
+
+def test_import_does_not_create_engine():
+    # when
+    _, engines = measure_import()
+
+    # then
+    assert engines == 0
+
+
+def test_import_time_within_budget():
+    # when
+    best = min(measure_import()[0] for _ in range(3))
+
+    # then
+    assert best <= IMPORT_TIME_BUDGET, f"importing the app took {best:.3f}s, budget is {IMPORT_TIME_BUDGET:.3f}s"
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from shared_kernel.domain.exception import ServiceOverloadedException
+from shared_kernel.infra.admission import AdmissionLimiter
+
+
+def test_waiters_are_admitted_in_order_and_overflow_is_rejected():
+    # given
+    limiter = AdmissionLimiter(max_concurrency=1, max_queue=2, queue_timeout=5)
+    admitted = []
+
+    async def request(name: str):
+        await limiter.acquire()
+        admitted.append(name)
+
+    async def run():
+        await request("first")
+        waiting = [asyncio.create_task(request(name)) for name in ("second", "third")]
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloadedException):
+            await request("fourth")
+
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*waiting)
+        limiter.release()
+
+    # when
+    asyncio.run(run())
+
+    # then
+    assert admitted == ["first", "second", "third"]
+    assert limiter.stats() | {"queue_timeout": 0} == {
+        "max_concurrency": 1,
+        "max_queue": 2,
+        "queue_timeout": 0,
+        "active": 0,
+        "queue_depth": 0,
+        "max_queue_depth": 2,
+        "admitted": 3,
+        "queued": 2,
+        "rejected_queue_full": 1,
+        "rejected_timeout": 0,
+    }
+
+
+def test_waiting_past_the_deadline_is_rejected():
+    # given
+    limiter = AdmissionLimiter(max_concurrency=1, max_queue=10, queue_timeout=0.01)
+
+    async def run():
+        await limiter.acquire()
+        with pytest.raises(ServiceOverloadedException):
+            await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        limiter.release()
+        # the slot freed by the release isn't held for the requests that left the queue
+        await limiter.acquire()
+
+    # when
+    asyncio.run(run())
+
+    # then
+    assert limiter.rejected_timeout == 1
+    assert limiter.active == 1
+    assert limiter.stats()["queue_depth"] == 0
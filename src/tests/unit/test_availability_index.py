@@ -0,0 +1,73 @@
+from datetime import date, datetime
+
+from display.infra.availability import AvailabilityIndex
+
+START = date(2023, 4, 1)
+
+
+def build_index() -> AvailabilityIndex:
+    return AvailabilityIndex.build(
+        start=START,
+        nights=30,
+        room_ids=[3, 1, 2],
+        stays=[
+            ("R-1", 1, datetime(2023, 4, 1, 15), datetime(2023, 4, 3, 11)),  # nights of 4/1, 4/2 and, until 11:00, 4/3
+            ("R-2", 2, datetime(2023, 3, 20), datetime(2023, 4, 2)),  # starts before the window
+            ("R-3", 3, datetime(2023, 4, 25), datetime(2023, 6, 1)),  # ends after the window
+            ("R-4", 9, datetime(2023, 4, 1), datetime(2023, 4, 2)),  # unknown room
+        ],
+    )
+
+
+def test_free_room_ids():
+    # given
+    index = build_index()
+
+    # when / then
+    assert index.free_room_ids(datetime(2023, 4, 1), datetime(2023, 4, 2)) == [3]
+    assert index.free_room_ids(datetime(2023, 4, 2), datetime(2023, 4, 3)) == [2, 3]
+    assert index.free_room_ids(datetime(2023, 4, 3), datetime(2023, 4, 10)) == [2, 3]
+    assert index.free_room_ids(datetime(2023, 4, 4), datetime(2023, 4, 10)) == [1, 2, 3]
+    assert index.free_room_ids(datetime(2023, 4, 20), datetime(2023, 4, 30)) == [1, 2]
+
+
+def test_free_room_counts():
+    # given
+    index = build_index()
+
+    # when
+    counts = index.free_room_counts(datetime(2023, 4, 1), datetime(2023, 4, 4))
+
+    # then
+    assert counts == [(date(2023, 4, 1), 1), (date(2023, 4, 2), 2), (date(2023, 4, 3), 2)]
+
+
+def test_book_and_release_are_idempotent():
+    # given
+    index = build_index()
+
+    # when
+    index.book("R-5", 3, datetime(2023, 4, 5), datetime(2023, 4, 7))
+    index.book("R-5", 3, datetime(2023, 4, 5), datetime(2023, 4, 7))
+    booked = index.free_room_ids(datetime(2023, 4, 6), datetime(2023, 4, 7))
+    index.release("R-5")
+    index.release("R-5")
+    released = index.free_room_ids(datetime(2023, 4, 6), datetime(2023, 4, 7))
+
+    # then
+    assert booked == [1, 2]
+    assert released == [1, 2, 3]
+    assert index.booked.min() == 0
+
+
+def test_covers():
+    # given
+    index = build_index()
+
+    # when / then
+    assert index.covers(datetime(2023, 4, 1), datetime(2023, 5, 1))
+    assert not index.covers(datetime(2023, 3, 31), datetime(2023, 4, 2))
+    assert not index.covers(datetime(2023, 4, 29), datetime(2023, 5, 2))
+    # a time of day is left to SQL: the search could fit beside a stay that ends that morning
+    assert not index.covers(datetime(2023, 4, 3, 12), datetime(2023, 4, 4))
+    assert not index.covers(datetime(2023, 4, 3), datetime(2023, 4, 4, 10))
@@ -0,0 +1,109 @@
+from shared_kernel.infra.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    # given
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # when
+    cache.set("c", 3)
+
+    # then
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl():
+    # given
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+
+    # when
+    clock.now = 9.9
+    before = cache.get("a")
+    clock.now = 10
+    after = cache.get("a")
+
+    # then
+    assert (before, after) == (1, None)
+    assert cache.stats() | {"hit_ratio": None} == {
+        "size": 0,
+        "max_size": 2,
+        "ttl": 10,
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": None,
+        "evictions": 0,
+        "expirations": 1,
+    }
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_peek_does_not_count_or_refresh():
+    # given
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # when
+    value = cache.peek("a")
+    cache.set("c", 3)
+
+    # then
+    assert value == 1
+    assert cache.peek("a") is None
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_reservation_cache_keeps_the_newer_reservation_and_room():
+    # given
+    from datetime import datetime
+
+    from reception.domain.value_object.guest import Guest
+    from reception.domain.value_object.reservation import ReservationNumber
+    from reception.infra.cache import ReservationCache, ReservationSnapshot, RoomSnapshot
+    from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+
+    def snapshot(number: str, reservation_status: ReservationStatus, room_status: RoomStatus, version):
+        return ReservationSnapshot(
+            room=RoomSnapshot(number="ROOM-A", room_status=room_status),
+            reservation_number=ReservationNumber(value=number),
+            reservation_status=reservation_status,
+            date_in=datetime(2023, 4, 1),
+            date_out=datetime(2023, 4, 2),
+            guest=Guest(mobile="+82-10-1111-2222"),
+            version=version,
+        )
+
+    cache = ReservationCache(max_size=2, ttl=10)
+    cache.put(snapshot("R-1", ReservationStatus.IN_PROGRESS, RoomStatus.AVAILABLE, (1, 1)))
+    cache.put(snapshot("R-2", ReservationStatus.IN_PROGRESS, RoomStatus.AVAILABLE, (1, 2)))
+
+    # when: R-1 is checked in, then a replica read of it from before the check-in comes back
+    cache.put(snapshot("R-1", ReservationStatus.IN_PROGRESS, RoomStatus.OCCUPIED, (1, 3)))
+    cache.put(snapshot("R-1", ReservationStatus.CANCELLED, RoomStatus.AVAILABLE, (2, 2)))
+    cache.put(snapshot("R-3", ReservationStatus.IN_PROGRESS, RoomStatus.AVAILABLE, (1, 1)))
+
+    # then: the cancel kept the room from the check-in, and so did R-3, read before it
+    assert (cache.peek("R-1").reservation_status, cache.peek("R-1").room.room_status) == (
+        ReservationStatus.CANCELLED,
+        RoomStatus.OCCUPIED,
+    )
+    assert cache.peek("R-1").version == (2, 3)
+    assert cache.peek("R-3").version == (1, 3)
+    assert cache.peek("R-2") is None  # evicted, and dropped from the room's reservations
+    assert cache._numbers_by_room == {"ROOM-A": {"R-1", "R-3"}}
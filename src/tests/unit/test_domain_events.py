@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from reception.application.event_handler import log_reservation_event
+from reception.domain.entity.reservation import Reservation
+from reception.domain.entity.room import Room
+from reception.domain.event.reservation import GuestCheckedIn, GuestCheckedOut, ReservationCancelled, ReservationMade
+from reception.domain.value_object.guest import Guest
+from shared_kernel.domain.value_object import RoomStatus
+from shared_kernel.infra.outbox import OutboxMessage
+
+
+def make_reservation() -> Reservation:
+    return Reservation.make(
+        room=Room(number="ROOM-A", room_status=RoomStatus.AVAILABLE),
+        date_in=datetime(2023, 4, 1),
+        date_out=datetime(2023, 4, 2),
+        guest=Guest(mobile="+82-10-1111-2222", name="Guido"),
+    )
+
+
+def test_reservation_records_its_changes():
+    # given
+    reservation = make_reservation()
+
+    # when
+    made = reservation.pull_events()
+    reservation.check_in()
+    reservation.check_out()
+    finished = reservation.pull_events()
+
+    # then
+    assert made == [
+        ReservationMade(
+            reservation_number=reservation.reservation_number.value,
+            room_number="ROOM-A",
+            date_in=datetime(2023, 4, 1),
+            date_out=datetime(2023, 4, 2),
+            guest_mobile="+82-10-1111-2222",
+            occurred_at=made[0].occurred_at,
+        )
+    ]
+    assert [type(event) for event in finished] == [GuestCheckedIn, GuestCheckedOut]
+    assert reservation.pull_events() == []
+
+
+def test_event_payload_is_json_ready():
+    # given
+    reservation = make_reservation()
+    reservation.pull_events()
+
+    # when
+    reservation.cancel()
+    [event] = reservation.pull_events()
+
+    # then
+    assert isinstance(event, ReservationCancelled)
+    assert event.event_type == "ReservationCancelled"
+    assert event.to_payload() == {
+        "reservation_number": reservation.reservation_number.value,
+        "room_number": "ROOM-A",
+    }
+
+
+def test_logged_events_leave_the_guest_out(caplog):
+    # given
+    reservation = make_reservation()
+    [event] = reservation.pull_events()
+    message = OutboxMessage(
+        id=7, event_type=event.event_type, payload=event.to_payload(), occurred_at=event.occurred_at, attempts=0
+    )
+
+    # when
+    with caplog.at_level(logging.INFO, logger="reception.application.event_handler"):
+        asyncio.run(log_reservation_event(message))
+
+    # then
+    assert [record.message for record in caplog.records] == [
+        f"ReservationMade {reservation.reservation_number.value} (outbox event 7)"
+    ]
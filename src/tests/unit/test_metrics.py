@@ -0,0 +1,38 @@
+from shared_kernel.infra.database.connection import parameters_shape
+from shared_kernel.infra.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_metrics_are_rendered_in_prometheus_text_format():
+    # given
+    registry = MetricsRegistry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    events = registry.register(Counter("events_total", "Events.", ("event",)))
+
+    # when
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, '/a"b')
+    events.inc("made", amount=2)
+
+    # then
+    assert registry.render() == "\n".join(
+        [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2.0',
+            'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3.0',
+            'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4.0',
+            'latency_seconds_sum{route="/a\\"b"} 3.65',
+            'latency_seconds_count{route="/a\\"b"} 4.0',
+            "# HELP events_total Events.",
+            "# TYPE events_total counter",
+            'events_total{event="made"} 2.0',
+            "",
+        ]
+    )
+
+
+def test_parameters_shape_leaves_values_out():
+    # when, then
+    assert parameters_shape({"number": "0ABC", "guest_mobile": "+82-10-1111-2222"}) == "{guest_mobile, number}"
+    assert parameters_shape(("0ABC", 1)) == "(2 positional)"
+    assert parameters_shape([("0ABC", 1), ("0ABD", 2)], executemany=True) == "2 x (2 positional)"
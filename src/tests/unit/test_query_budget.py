@@ -0,0 +1,20 @@
+import inspect
+
+import pytest
+
+from display.application.use_case.query import DisplayQueryUseCase
+from reception.application.use_case.command import ReservationCommandUseCase
+from reception.application.use_case.query import ReservationQueryUseCase
+
+
+@pytest.mark.parametrize("use_case", [ReservationCommandUseCase, ReservationQueryUseCase, DisplayQueryUseCase])
+def test_every_use_case_declares_a_query_budget(use_case):
+    # when
+    without_budget = [
+        name
+        for name, method in inspect.getmembers(use_case, inspect.isfunction)
+        if not name.startswith("_") and not hasattr(method, "max_queries")
+    ]
+
+    # then
+    assert without_budget == []
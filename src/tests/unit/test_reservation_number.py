@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from reception.domain.value_object import reservation
+from reception.domain.value_object.reservation import ReservationNumber, SnowflakeGenerator
+
+NOW_NS = (SnowflakeGenerator.EPOCH_MS + 1000) * 1_000_000
+
+
+def test_ids_are_unique_and_sorted_past_the_sequence(monkeypatch):
+    # given
+    monkeypatch.setattr(reservation.time, "time_ns", lambda: NOW_NS)
+    generator = SnowflakeGenerator(worker_id=1)
+
+    # when: more ids in one millisecond than the sequence holds
+    numbers = [SnowflakeGenerator.encode(generator.next_id()) for _ in range(5000)]
+
+    # then
+    assert len(set(numbers)) == 5000
+    assert numbers == sorted(numbers)
+    assert all(len(number) == SnowflakeGenerator.LENGTH for number in numbers)
+
+
+def test_ids_stay_monotonic_when_the_clock_steps_back(monkeypatch):
+    # given
+    generator = SnowflakeGenerator(worker_id=1)
+    monkeypatch.setattr(reservation.time, "time_ns", lambda: NOW_NS)
+    before = generator.next_id()
+
+    # when
+    monkeypatch.setattr(reservation.time, "time_ns", lambda: NOW_NS - 5_000_000)
+    after = generator.next_id()
+
+    # then
+    assert after > before
+
+
+def test_workers_never_collide(monkeypatch):
+    # given
+    monkeypatch.setattr(reservation.time, "time_ns", lambda: NOW_NS)
+    generators = [SnowflakeGenerator(worker_id=worker_id) for worker_id in (0, 1, SnowflakeGenerator.MAX_WORKER_ID)]
+
+    # when
+    ids = [generator.next_id() for generator in generators for _ in range(100)]
+
+    # then
+    assert len(set(ids)) == len(ids)
+
+
+def test_worker_id_out_of_range():
+    # when / then
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(worker_id=SnowflakeGenerator.MAX_WORKER_ID + 1)
+
+
+def worker_id_of(number: ReservationNumber) -> int:
+    value = 0
+    for char in number.value:
+        value = value * 32 + SnowflakeGenerator.ALPHABET.index(char)
+    return (value >> SnowflakeGenerator.SEQUENCE_BITS) & SnowflakeGenerator.MAX_WORKER_ID
+
+
+@pytest.fixture
+def unconfigured(monkeypatch):
+    monkeypatch.setattr(ReservationNumber, "_generator", None)
+    monkeypatch.setattr(ReservationNumber, "_generator_pid", None)
+    monkeypatch.setattr(ReservationNumber, "_valid_until", None)
+
+
+def test_forked_process_does_not_reuse_the_configured_worker_id(unconfigured):
+    # given: a worker id configured before the server forks its workers
+    ReservationNumber.configure(worker_id=7)
+
+    # when
+    read_end, write_end = os.pipe()
+    if (pid := os.fork()) == 0:  # pragma: no cover - the child
+        try:
+            ReservationNumber.generate()
+            os.write(write_end, b"generated")
+        except RuntimeError:
+            os.write(write_end, b"refused")
+        os._exit(0)
+    os.close(write_end)
+    os.waitpid(pid, 0)
+    with os.fdopen(read_end) as child:
+        in_child = child.read()
+
+    # then: the child must configure its own worker id, the parent keeps the configured one
+    assert in_child == "refused"
+    assert worker_id_of(ReservationNumber.generate()) == 7
+
+
+def test_numbers_stop_when_the_worker_id_lease_runs_out(monkeypatch, unconfigured):
+    # given
+    monkeypatch.setattr(reservation.time, "monotonic", lambda: 100.0)
+    ReservationNumber.configure(worker_id=3, valid_until=110.0)
+    ReservationNumber.generate()
+
+    # when
+    monkeypatch.setattr(reservation.time, "monotonic", lambda: 110.0)
+
+    # then
+    with pytest.raises(RuntimeError):
+        ReservationNumber.generate()
+
+
+def test_renewing_the_worker_id_keeps_the_sequence(monkeypatch, unconfigured):
+    # given
+    monkeypatch.setattr(reservation.time, "time_ns", lambda: NOW_NS)
+    ReservationNumber.configure(worker_id=3, valid_until=float("inf"))
+    before = ReservationNumber.generate()
+
+    # when: renewed within the same millisecond
+    ReservationNumber.configure(worker_id=3, valid_until=float("inf"))
+    after = ReservationNumber.generate()
+
+    # then
+    assert after.value > before.value
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+from display.infra.cache import RoomListing, RoomListingCache
+from display.infra.repository import RoomRow
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.signal import ReservationChange
+
+
+def rooms(*ids: int, room_status: RoomStatus = RoomStatus.AVAILABLE):
+    return [RoomRow(id=i, number=f"R-{i}", status=room_status.value, image_url="img", description=None) for i in ids]
+
+
+def change(room_id: int, room_status: RoomStatus) -> ReservationChange:
+    return ReservationChange(
+        reservation_number="R",
+        reservation_status=ReservationStatus.IN_PROGRESS,
+        room_id=room_id,
+        room_status=room_status,
+        date_in=datetime(2023, 4, 1),
+        date_out=datetime(2023, 4, 2),
+    )
+
+
+def store(cache: RoomListingCache, room_status: RoomStatus, listed) -> None:
+    cache.store_page(room_status, listed, limit=len(listed), after_id=None, generation=cache.generation)
+
+
+def test_listing_pages_like_keyset_query():
+    # given
+    listing = RoomListing(rooms=tuple(rooms(1, 2, 4, 5, 7)))
+
+    # when / then
+    assert [([room.id for room in page], cursor) for page, cursor in (
+        listing.page(limit=2),
+        listing.page(limit=2, after_id=2),
+        listing.page(limit=2, after_id=3),
+        listing.page(limit=2, after_id=5),
+        listing.page(limit=2, after_id=7),
+    )] == [([1, 2], 2), ([4, 5], 5), ([4, 5], 5), ([7], None), ([], None)]
+
+
+def test_change_that_moves_a_room_drops_the_listings():
+    # given
+    cache = RoomListingCache(ttl=60)
+    store(cache, RoomStatus.AVAILABLE, rooms(1, 2))
+    store(cache, RoomStatus.OCCUPIED, rooms(3, room_status=RoomStatus.OCCUPIED))
+
+    # when: a reservation for a room already listed as available
+    cache.apply([change(room_id=1, room_status=RoomStatus.AVAILABLE)])
+    kept = len(cache)
+    # when: a check-in
+    cache.apply([change(room_id=2, room_status=RoomStatus.OCCUPIED)])
+
+    # then
+    assert kept == 2
+    assert len(cache) == 0
+
+
+def test_load_that_raced_an_invalidation_is_not_stored():
+    # given
+    cache = RoomListingCache(ttl=60)
+    store(cache, RoomStatus.OCCUPIED, rooms(3, room_status=RoomStatus.OCCUPIED))
+    generation = cache.generation
+
+    # when: room 3 is checked out while an available listing without it is being read
+    cache.apply([change(room_id=3, room_status=RoomStatus.AVAILABLE)])
+    cache.store_page(RoomStatus.AVAILABLE, rooms(1, 2), limit=10, after_id=None, generation=generation)
+
+    # then
+    assert cache.peek(RoomStatus.AVAILABLE) is None
+
+
+def test_listing_grows_with_the_pages_read_and_keeps_its_expiry():
+    # given
+    now = [0.0]
+    cache = RoomListingCache(ttl=60)
+    cache.clock = lambda: now[0]
+
+    # when: the first page of 2 is read with one row past it, then the next from its cursor 2
+    cache.store_page(RoomStatus.AVAILABLE, rooms(1, 2, 4), limit=2, after_id=None, generation=cache.generation)
+    first = cache.page(RoomStatus.AVAILABLE, limit=2)
+    missed = cache.page(RoomStatus.AVAILABLE, limit=2, after_id=2)
+    now[0] = 30.0
+    cache.store_page(RoomStatus.AVAILABLE, rooms(4, 5), limit=2, after_id=2, generation=cache.generation)
+    # a page past the end of the listing is not stored: it would leave a gap
+    cache.store_page(RoomStatus.AVAILABLE, rooms(9), limit=2, after_id=8, generation=cache.generation)
+    listing = cache.peek(RoomStatus.AVAILABLE)
+
+    # then
+    assert first == (rooms(1, 2), 2)
+    assert missed is None
+    assert (listing.ids, listing.complete) == ((1, 2, 4, 5), True)
+    assert cache.page(RoomStatus.AVAILABLE, limit=2, after_id=2) == (rooms(4, 5), None)
+    assert cache.expires_at(RoomStatus.AVAILABLE) == 60.0
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_zero_ttl_disables_the_cache():
+    # given
+    cache = RoomListingCache(ttl=0)
+
+    # when
+    store(cache, RoomStatus.AVAILABLE, rooms(1, 2))
+
+    # then
+    assert not cache.enabled
+    assert len(cache) == 0
@@ -0,0 +1,34 @@
+import pytest
+
+from reception.domain.value_object.guest import Guest
+from reception.domain.value_object.reservation import ReservationNumber
+from shared_kernel.domain.exception import ValueObjectEnumError
+from shared_kernel.domain.value_object import ReservationStatus, RoomStatus
+from shared_kernel.infra.database.orm import restore_value_object
+
+
+def test_enum_value_objects_are_looked_up_by_value():
+    # when, then
+    assert RoomStatus.from_value("OCCUPIED") is RoomStatus.OCCUPIED
+    assert ReservationStatus.from_value("IN-PROGRESS") is ReservationStatus.IN_PROGRESS
+    with pytest.raises(ValueObjectEnumError):
+        RoomStatus.from_value("IN-PROGRESS")
+    with pytest.raises(ValueObjectEnumError):
+        RoomStatus.from_value(["AVAILABLE"])
+
+
+def test_restored_value_objects_equal_constructed_ones():
+    # given
+    restore_number, restore_guest = restore_value_object(ReservationNumber), restore_value_object(Guest)
+
+    # when
+    number = restore_number("0ABCDEFGHJKMN")
+    guest = restore_guest("+82-10-1111-2222", None)
+
+    # then
+    assert number == ReservationNumber(value="0ABCDEFGHJKMN")
+    assert guest == Guest(mobile="+82-10-1111-2222")
+    assert hash(guest) == hash(Guest(mobile="+82-10-1111-2222"))
+    assert guest.__composite_values__() == ("+82-10-1111-2222", None)
+    with pytest.raises(AttributeError):
+        guest.name = "Guido"